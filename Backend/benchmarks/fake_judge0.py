@@ -0,0 +1,223 @@
+"""
+Minimal stand-in for a Judge0 server, for local development and load
+tests only; it is not part of the application package.
+
+Runs every submission as a Python program in a subprocess (no sandbox, so
+only feed it your own code), or for language 89 the `compile` and `run`
+scripts of its additional_files archive, and implements the parts of the Judge0 API the
+backend uses, including callback_url delivery:
+
+    cd Backend && uvicorn benchmarks.fake_judge0:app --port 2358
+
+then point the backend at it with app_JUDGE0_URL=http://localhost:2358 and,
+to exercise callbacks, app_JUDGE0_CALLBACK_URL=http://localhost:8000.
+
+Latency and errors can be injected to exercise retries, hedging and the
+circuit breaker, at startup through FAKE_JUDGE0_LATENCY, _SLOW_RATE,
+_ERROR_RATE and _ERROR_STATUS or at runtime:
+
+    curl -X PUT localhost:2358/faults -d '{"slow_rate": 0.05, "latency": 2}'
+"""
+import asyncio
+import base64
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import uuid
+import zipfile
+from typing import Dict, Optional
+
+import httpx
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="Fake Judge0")
+
+LANGUAGES = [{"id": 71, "name": "Python (3.8.1)"}, {"id": 89, "name": "Multi-file program"}]
+MULTI_FILE_LANGUAGE_ID = 89
+IN_QUEUE = {"id": 1, "description": "In Queue"}
+RESULT_FIELDS = ("token", "status", "stdout", "stderr", "compile_output", "time", "memory", "message")
+
+submissions: Dict[str, dict] = {}
+stats = {"created": 0, "callbacks": 0, "callback_errors": 0, "slowed": 0, "faults": 0}
+# Keeps background judging tasks referenced until they finish
+_tasks = set()
+
+
+# A `slow_rate` share of requests is delayed by `latency` seconds and an
+# `error_rate` share is answered with `error_status` instead of being handled
+faults = {
+    "latency": float(os.environ.get("FAKE_JUDGE0_LATENCY", 0)),
+    "slow_rate": float(os.environ.get("FAKE_JUDGE0_SLOW_RATE", 0)),
+    "error_rate": float(os.environ.get("FAKE_JUDGE0_ERROR_RATE", 0)),
+    "error_status": int(os.environ.get("FAKE_JUDGE0_ERROR_STATUS", 503)),
+}
+FAULT_FREE_PATHS = ("/faults", "/stats")
+
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    if request.url.path not in FAULT_FREE_PATHS:
+        if faults["slow_rate"] and random.random() < faults["slow_rate"]:
+            stats["slowed"] += 1
+            await asyncio.sleep(faults["latency"])
+        if faults["error_rate"] and random.random() < faults["error_rate"]:
+            stats["faults"] += 1
+            return JSONResponse({"error": "Injected fault"}, status_code=faults["error_status"])
+    return await call_next(request)
+
+
+def _execute_multi_file(payload: dict) -> dict:
+    # Language 89: unpack additional_files, run `compile` then `run`
+    with tempfile.TemporaryDirectory() as workdir:
+        with zipfile.ZipFile(io.BytesIO(base64.b64decode(payload["additional_files"]))) as archive:
+            archive.extractall(workdir)
+        if os.path.exists(os.path.join(workdir, "compile")):
+            build = subprocess.run(["bash", "compile"], cwd=workdir, capture_output=True, text=True)
+            if build.returncode != 0:
+                return {
+                    "status": {"id": 6, "description": "Compilation Error"},
+                    "stdout": None,
+                    "stderr": None,
+                    "compile_output": build.stderr or build.stdout,
+                }
+        try:
+            proc = subprocess.run(
+                ["bash", "run"], cwd=workdir, capture_output=True, text=True,
+                timeout=float(payload.get("wall_time_limit") or 20),
+            )
+        except subprocess.TimeoutExpired as e:
+            out = e.stdout.decode() if isinstance(e.stdout, bytes) else e.stdout
+            return {"status": {"id": 5, "description": "Time Limit Exceeded"}, "stdout": out, "stderr": None}
+    status = {"id": 3, "description": "Accepted"} if proc.returncode == 0 else {"id": 11, "description": "Runtime Error (NZEC)"}
+    return {"status": status, "stdout": proc.stdout, "stderr": proc.stderr or None}
+
+
+def _execute(payload: dict) -> dict:
+    if payload.get("language_id") == MULTI_FILE_LANGUAGE_ID:
+        return _execute_multi_file(payload)
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-c", payload.get("source_code") or ""],
+            input=payload.get("stdin") or "",
+            capture_output=True,
+            text=True,
+            timeout=float(payload.get("cpu_time_limit") or 5),
+        )
+    except subprocess.TimeoutExpired:
+        return {"status": {"id": 5, "description": "Time Limit Exceeded"}, "stdout": None, "stderr": None}
+
+    expected = payload.get("expected_output")
+    if proc.returncode != 0:
+        status = {"id": 11, "description": "Runtime Error (NZEC)"}
+    elif expected is not None and proc.stdout.strip() != expected.strip():
+        status = {"id": 4, "description": "Wrong Answer"}
+    else:
+        status = {"id": 3, "description": "Accepted"}
+    return {"status": status, "stdout": proc.stdout, "stderr": proc.stderr or None}
+
+
+def _view(result: dict, base64_encoded: bool = False) -> dict:
+    view = {field: result.get(field) for field in RESULT_FIELDS}
+    if base64_encoded:
+        for field in ("stdout", "stderr", "compile_output", "message"):
+            if view[field] is not None:
+                view[field] = base64.b64encode(view[field].encode()).decode()
+    return view
+
+
+async def _callback(url: str, result: dict):
+    # Judge0 PUTs the finished submission, base64 encoded, to callback_url
+    try:
+        async with httpx.AsyncClient(timeout=5) as client:
+            await client.put(url, json=_view(result, base64_encoded=True))
+        stats["callbacks"] += 1
+    except httpx.HTTPError:
+        stats["callback_errors"] += 1
+
+
+async def _judge(token: str, payload: dict) -> dict:
+    result = await asyncio.to_thread(_execute, payload)
+    result = dict({"compile_output": None}, **result)
+    result.update(token=token, time="0.01", memory=1000, message=None)
+    submissions[token] = result
+    if payload.get("callback_url"):
+        await _callback(payload["callback_url"], result)
+    return result
+
+
+def _spawn(token: str, payload: dict):
+    task = asyncio.create_task(_judge(token, payload))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def _create(payload: dict) -> str:
+    token = str(uuid.uuid4())
+    submissions[token] = {"token": token, "status": IN_QUEUE}
+    stats["created"] += 1
+    return token
+
+
+@app.post("/submissions")
+async def create_submission(request: Request, wait: bool = False):
+    payload = await request.json()
+    token = _create(payload)
+    if wait:
+        return _view(await _judge(token, payload))
+    _spawn(token, payload)
+    return {"token": token}
+
+
+@app.post("/submissions/batch")
+async def create_batch(request: Request):
+    body = await request.json()
+    created = []
+    for payload in body.get("submissions", []):
+        token = _create(payload)
+        _spawn(token, payload)
+        created.append({"token": token})
+    return created
+
+
+@app.get("/submissions/batch")
+async def get_batch(tokens: str = Query(...)):
+    return {"submissions": [
+        _view(submissions[token]) if token in submissions else None
+        for token in tokens.split(",")
+    ]}
+
+
+@app.get("/submissions/{token}")
+async def get_submission(token: str):
+    result: Optional[dict] = submissions.get(token)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return _view(result)
+
+
+@app.get("/languages")
+async def languages():
+    return LANGUAGES
+
+
+@app.get("/stats")
+async def fake_stats():
+    return stats
+
+
+@app.get("/faults")
+async def get_faults():
+    return faults
+
+
+@app.put("/faults")
+async def set_faults(request: Request):
+    body = await request.json()
+    for name, value in body.items():
+        if name in faults:
+            faults[name] = type(faults[name])(value)
+    return faults
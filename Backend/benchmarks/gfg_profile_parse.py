@@ -0,0 +1,87 @@
+"""
+Micro-benchmark: reading a GeeksforGeeks profile page.
+
+Compares the old path (a full BeautifulSoup html.parser pass to find the
+__NEXT_DATA__ script, done once for /info and again for /stats) with the
+byte scan in platforms/geeksforgeeks.py, which runs once per cached
+profile.
+
+    cd Backend && python benchmarks/gfg_profile_parse.py [saved_profile.html ...]
+
+Without arguments a synthetic page of realistic size is used.
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup as bs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.platforms.geeksforgeeks import parse_profile  # noqa: E402
+
+
+def synthetic_page(solved: int = 600) -> bytes:
+    user_info = {
+        "name": "Example User", "profile_image_url": "https://example.org/p.png",
+        "institute_name": "Example Institute", "institute_rank": 12, "score": 1834,
+        "monthly_score": 40, "total_problems_solved": solved, "contest_rating": 1650,
+        "pod_solved_longest_streak": 21, "pod_solved_global_longest_streak": 310,
+    }
+    submissions = {
+        difficulty: {
+            str(i): {"pname": f"{difficulty} problem {i}", "slug": f"{difficulty.lower()}-problem-{i}", "lang": "cpp"}
+            for i in range(solved // 5)
+        }
+        for difficulty in ("School", "Basic", "Easy", "Medium", "Hard")
+    }
+    next_data = {"props": {"pageProps": {"userInfo": user_info, "userSubmissionsInfo": submissions}}, "page": "/user/[username]"}
+
+    head = "".join(f'<link rel="preload" href="/_next/static/chunks/{i}.js" as="script"/>' for i in range(60))
+    body = "".join(
+        f'<div class="profile_card_{i}"><span class="label">Stat {i}</span><a href="/x/{i}">{i}</a></div>'
+        for i in range(3000)
+    )
+    scripts = "".join(f'<script src="/_next/static/chunks/{i}.js" async=""></script>' for i in range(40))
+    return (
+        f'<!DOCTYPE html><html><head><title>Profile</title>{head}</head><body><div id="__next">{body}</div>'
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>{scripts}</body></html>'
+    ).encode()
+
+
+def soup_profile(html: bytes) -> dict:
+    soup = bs(html, 'html.parser')
+    script_tag = soup.find("script", id="__NEXT_DATA__", type="application/json")
+    return json.loads(script_tag.string)["props"]["pageProps"]
+
+
+def measure(label: str, fn, html: bytes, rounds: int) -> float:
+    fn(html)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(html)
+    per_call = (time.perf_counter() - started) / rounds
+
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<26} {per_call * 1000:9.2f} ms   peak alloc {peak / 2**20:7.2f} MiB")
+    return per_call
+
+
+def main():
+    pages = [(path, open(path, "rb").read()) for path in sys.argv[1:]] or [("synthetic", synthetic_page())]
+    for name, html in pages:
+        print(f"{name}: {len(html) / 1024:.0f} KiB")
+        assert soup_profile(html)["userInfo"] == parse_profile(html)["userInfo"]
+        soup = measure("BeautifulSoup html.parser", soup_profile, html, 5)
+        scan = measure("__NEXT_DATA__ byte scan", parse_profile, html, 50)
+        # /info and /stats each parsed the page before; now one parse serves both
+        print(f"  per /info + /stats pair: {soup * 2 * 1000:.2f} ms -> {scan * 1000:.2f} ms ({soup * 2 / scan:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
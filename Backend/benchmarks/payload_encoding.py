@@ -0,0 +1,100 @@
+"""
+Micro-benchmark: building Judge0 batch request bodies for one submission.
+
+Compares the old path (fresh payload dicts serialized with json.dumps, as
+httpx does for json=) with bodies assembled from pre-encoded case
+fragments, for a problem with large hidden inputs.
+
+    cd Backend && python benchmarks/payload_encoding.py [cases] [input_kb]
+"""
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.judge.payloads import JudgePayload, encode_batch, encode_head  # noqa: E402
+from src.schemas.problem_loader import TestCase  # noqa: E402
+
+BATCH_SIZE = 20
+
+
+def make_cases(count: int, input_kb: int):
+    rng = random.Random(42)
+    cases = []
+    for _ in range(count):
+        numbers = " ".join(str(rng.randint(-10**9, 10**9)) for _ in range(input_kb * 1024 // 11))
+        cases.append(TestCase(input=f"{len(numbers)}\n{numbers}", output=str(rng.randint(0, 10**12))))
+    return cases
+
+
+def old_bodies(request, cases):
+    payloads = [
+        {
+            "source_code": request.source_code,
+            "language_id": request.language_id,
+            "stdin": case['input'],
+            "cpu_time_limit": request.cpu_time_limit,
+            "memory_limit": request.memory_limit,
+        }
+        for case in cases
+    ]
+    return [
+        json.dumps({"submissions": payloads[i:i + BATCH_SIZE]}).encode()
+        for i in range(0, len(payloads), BATCH_SIZE)
+    ]
+
+
+def new_bodies(request, cases):
+    head = encode_head(request)
+    payloads = [JudgePayload(head, case, {}) for case in cases]
+    return [encode_batch(payloads[i:i + BATCH_SIZE]) for i in range(0, len(payloads), BATCH_SIZE)]
+
+
+def measure(label, fn, request, cases, rounds):
+    fn(request, cases)  # warm up (and, for the new path, fill the case cache)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(request, cases)
+    per_call = (time.perf_counter() - started) / rounds
+
+    tracemalloc.start()
+    fn(request, cases)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<34} {per_call * 1000:9.2f} ms   peak alloc {peak / 2**20:8.2f} MiB")
+    return per_call
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    input_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    request = SimpleNamespace(
+        source_code="import sys\nprint(sum(map(int, sys.stdin.read().split()[1:])))\n" * 20,
+        language_id=71,
+        cpu_time_limit=5.0,
+        memory_limit=128000,
+    )
+    cases = make_cases(count, input_kb)
+    print(f"{count} cases x {input_kb} KiB input, batches of {BATCH_SIZE}")
+
+    assert [json.loads(b) for b in old_bodies(request, cases)] == [json.loads(b) for b in new_bodies(request, cases)]
+
+    rounds = 10
+    old = measure("json.dumps per submission", old_bodies, request, cases, rounds)
+
+    cold = [TestCase(case) for case in cases]
+    started = time.perf_counter()
+    new_bodies(request, cold)
+    print(f"{'pre-encoded, first use (cold)':<34} {(time.perf_counter() - started) * 1000:9.2f} ms")
+
+    new = measure("pre-encoded fragments (warm)", new_bodies, request, cases, rounds)
+    print(f"speed-up (warm): {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
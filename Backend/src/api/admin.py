@@ -0,0 +1,28 @@
+import asyncio
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+
+from src.codeDeck.settings import settings
+from src.schemas.problem_loader import reload_problems, problem_db
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_admin(token: str):
+    # Admin endpoints are disabled unless an admin key is configured
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not token or not hmac.compare_digest(token, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+@router.post("/problems/reload")
+async def reload_problem_catalog(request: Request, x_admin_token: str = Header(None)):
+    """
+    Incrementally reloads problems.jsonl: only new or changed lines are parsed
+    and swapped into the running catalog.
+    """
+    require_admin(x_admin_token)
+    stats = await asyncio.to_thread(reload_problems, request.app.problems_path)
+    return {"message": "Problems reloaded", "stats": stats, "cache": problem_db.cache_info()}
@@ -1,59 +1,117 @@
-from fastapi import APIRouter, HTTPException, status,Response
-import json
-from bs4 import BeautifulSoup as bs
-import requests
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, status,Response
+
+from src.codeDeck.settings import settings
+from src.platforms.codeforces import CodeforcesError, codeforces_client
+from src.platforms.codeforces_sync import codeforces_sync
 
 
 router = APIRouter(prefix="/cfcs", tags=["codeforces"])
 
 
+def upstream_error(e: CodeforcesError) -> HTTPException:
+    if e.status_code == status.HTTP_404_NOT_FOUND:
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return HTTPException(status_code=e.status_code, detail=str(e))
+
+
+def format_info(user_info: dict) -> dict:
+    # Unrated users have no rating/rank fields, and names are optional
+    return {
+        "userName": user_info["handle"],
+        "fullName": f"{user_info.get('firstName', '')} {user_info.get('lastName', '')}".strip(),
+        "profilePicture": user_info.get("titlePhoto"),
+        "rating": user_info.get("rating"),
+        "rank": user_info.get("rank"),
+        "maxRating": user_info.get("maxRating"),
+        "maxRank": user_info.get("maxRank"),
+    }
+
+
+def format_rating(rating_changes: List[dict]) -> List[dict]:
+    return [
+        {
+            "contestId": change["contestId"],
+            "contestName": change["contestName"],
+            "rank": change["rank"],
+            "oldRating": change["oldRating"],
+            "newRating": change["newRating"],
+            "ratingUpdateTimeSeconds": change["ratingUpdateTimeSeconds"]
+        }
+        for change in rating_changes
+    ]
+
+
+@router.get("/upstream")
+async def codeforces_upstream_stats():
+    """Rate governor (bucket, queue, waits, shed calls), caches, batching and sync counters."""
+    return {**codeforces_client.stats(), "sync": codeforces_sync.stats()}
+
+
+@router.get("/info")
+async def get_codeforces_users_info(handles: str = Query(..., description="Handles separated by ';' or ','")):
+    """
+    Several users in one request, e.g. for leaderboards. Lookups are cached
+    and batched into multi-handle user.info calls.
+    """
+    unique = list(dict.fromkeys(h.strip() for h in handles.replace(",", ";").split(";") if h.strip()))
+    if not unique:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No handles given")
+    if len(unique) > settings.CODEFORCES_BULK_MAX_HANDLES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.CODEFORCES_BULK_MAX_HANDLES} handles per request",
+        )
+    try:
+        users, not_found = await codeforces_client.users_info(unique)
+    except CodeforcesError as e:
+        raise upstream_error(e)
+    return {"users": [format_info(user) for user in users], "notFound": not_found}
+
+
 @router.get("/{username}/info")
 async def get_codeforces_info(username: str):
-    res=requests.get(f"https://codeforces.com/api/user.info?handles={username}")
-    if res.status_code == 200:
-        data = res.json()
-        if data["status"] == "OK":
-            user_info = data["result"][0]
-            return {
-                "userName": user_info["handle"],
-                "fullName": user_info["firstName"] + " " + user_info["lastName"],
-                "profilePicture": user_info["titlePhoto"],
-                "rating": user_info["rating"],
-                "rank": user_info["rank"],
-                "maxRating": user_info["maxRating"],
-                "maxRank": user_info["maxRank"],
-            }
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    try:
+        user_info = await codeforces_client.user_info(username)
+    except CodeforcesError as e:
+        raise upstream_error(e)
+    return format_info(user_info)
 
 @router.get("/{username}/rating")
 async def get_codeforces_rating(username: str):
-    res=requests.get(f"https://codeforces.com/api/user.rating?handle={username}")
-    if res.status_code == 200:
-        data = res.json()
-        if data["status"] == "OK":
-            rating_changes = data["result"]
-            rating_history = [
-                {
-                    "contestId": change["contestId"],
-                    "contestName": change["contestName"],
-                    "rank": change["rank"],
-                    "oldRating": change["oldRating"],
-                    "newRating": change["newRating"],
-                    "ratingUpdateTimeSeconds": change["ratingUpdateTimeSeconds"]
-                }
-                for change in rating_changes
-            ]
-            return {"ratingHistory": rating_history}
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    try:
+        rating_changes = await codeforces_client.user_rating(username)
+    except CodeforcesError as e:
+        raise upstream_error(e)
+    return {"ratingHistory": format_rating(rating_changes)}
 
 
 @router.get("/{username}/status")
-async def get_codeforces_rating(username: str):
-    res=requests.get(f"https://codeforces.com/api/user.status?handle={username}&from=1&count=10")
-    if res.status_code == 200:
-        data = res.json()
-        if data["status"] == "OK":
-            submissions = data["result"]
-            
-            return {"submissions": submissions}
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
\ No newline at end of file
+async def get_codeforces_status(
+    username: str,
+    verdict: Optional[str] = None,
+    tag: Optional[List[str]] = Query(None),
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    before: Optional[int] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+):
+    """
+    Submission history from the local store, newest first. Filters:
+    `verdict` (e.g. OK), `tag` (repeatable, all must match) and a
+    creation time range `since`/`until` in epoch seconds. Page with
+    `before=<next_before>` or `page`. `syncing` is true while older
+    submissions may still be on their way into the store.
+    """
+    try:
+        await codeforces_sync.ensure_synced(username)
+    except CodeforcesError as e:
+        raise upstream_error(e)
+    result = await codeforces_sync.submissions(
+        username, verdict=verdict, tags=tag, since=since, until=until,
+        before=before, page=page, page_size=page_size,
+    )
+    result["syncing"] = codeforces_sync.syncing(username)
+    return result
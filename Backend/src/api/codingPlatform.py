@@ -1,25 +1,41 @@
 # main.py
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, APIRouter
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, APIRouter, Request, Response, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import httpx
 import asyncio
+import json
 import logging
 
 # Import the loader
 from src.schemas.problem_loader import load_problems, problem_db, Problem, TestCase
 from src.codeDeck.settings import settings
+from src.utils.response_cache import ResponseCache
+from src.judge.client import (
+    call_judge0_api, get_judge0_client, get_pool_stats, JUDGE0_URL, JUDGE0_API_KEY, JUDGE0_RAPIDAPI_HOST
+)
+from src.judge.backends import backend_for, backend_stats
+from src.judge.batch import PENDING_STATUS_IDS
+from src.judge.callbacks import (
+    CALLBACK_PATH, callbacks_enabled, decode_callback, result_store, verify_callback_key
+)
+from src.judge.submission import MODES, evaluate_submission, grade_result, is_accepted
+from src.judge.checker import JUDGE0_RULES, CompareRules
+from src.judge.verdict_cache import verdict_cache
+from src.judge.jobs import job_store, JobStoreFull
+from src.judge.languages import language_catalog
+from src.judge.resilience import judge_resilience
+from src.judge.scheduler import judge_scheduler, admit_or_429, owner_from_request
 
 router = APIRouter(prefix="", tags=["codingPlatform"])
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# --- Environment Variables ---
-JUDGE0_URL = settings.JUDGE0_URL
-JUDGE0_API_KEY = settings.JUDGE0_API_KEY
-JUDGE0_RAPIDAPI_HOST = settings.JUDGE0_RAPIDAPI_HOST
+# Pre-encoded GET /problem/{id} bodies, keyed by problem id and source checksum
+problem_response_cache = ResponseCache(settings.PROBLEM_RESPONSE_CACHE_BYTES)
 
 # --- Models ---
 
@@ -28,14 +44,16 @@ class SubmissionRequest(BaseModel):
     language_id: int
     stdin: Optional[str] = ""
     expected_output: Optional[str] = None
-    cpu_time_limit: Optional[float] = 5
-    memory_limit: Optional[int] = 128000
+    # Unset limits take the language's defaults from the catalog
+    cpu_time_limit: Optional[float] = None
+    memory_limit: Optional[int] = None
 
 class SubmitCodeRequest(BaseModel):
     source_code: str
     language_id: int
-    cpu_time_limit: Optional[float] = 5
-    memory_limit: Optional[int] = 128000
+    # Unset limits take the language's defaults from the catalog
+    cpu_time_limit: Optional[float] = None
+    memory_limit: Optional[int] = None
 
 class PublicTestCase(BaseModel):
     input: str
@@ -47,6 +65,18 @@ class ProblemSummary(BaseModel):
     title: str
     difficulty: str
 
+class ProblemSearchResult(BaseModel):
+    id: int
+    title: str
+    difficulty: str
+    score: float
+
+class ProblemSearchResponse(BaseModel):
+    query: str
+    total: int
+    results: List[ProblemSearchResult]
+    facets: Dict[str, Dict[str, int]]
+
 class ProblemResponse(BaseModel):
     id: int
     title: str # Added title here
@@ -57,6 +87,7 @@ class ProblemResponse(BaseModel):
 class SubmitResultResponse(BaseModel):
     passed: int
     total: int
+    evaluated: Optional[int] = None
     message: str = "Submission processed"
 
 class SubmissionResponse(BaseModel):
@@ -69,185 +100,323 @@ class SubmissionResponse(BaseModel):
     memory: Optional[int] = None
     message: Optional[str] = None
 
+class SubmissionJobResponse(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    status_url: str
+    events_url: str
+
+class SubmissionJobStatus(BaseModel):
+    job_id: str
+    status: str
+    problem_id: int
+    total: int
+    completed: int
+    summary: Optional[SubmitResultResponse] = None
+    source: Optional[str] = None
+
 class LanguageResponse(BaseModel):
     id: int
     name: str
     judge0_id: int
+    cpu_time_limit: Optional[float] = None
+    memory_limit: Optional[int] = None
     
 
-async def call_judge0_api(endpoint: str, method: str = "GET", data: dict = None):
-    headers = {"Content-Type": "application/json"}
-
-    if "rapidapi.com" in JUDGE0_URL:
-        headers["X-RapidAPI-Key"] = JUDGE0_API_KEY
-        headers["X-RapidAPI-Host"] = JUDGE0_RAPIDAPI_HOST
-    elif JUDGE0_API_KEY:
-        headers["X-Auth-Token"] = JUDGE0_API_KEY
-
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        url = f"{JUDGE0_URL}{endpoint}"
-        try:
-            if method == "GET":
-                resp = await client.get(url, headers=headers)
-            else:
-                resp = await client.post(url, json=data, headers=headers)
-            resp.raise_for_status()
-            return resp.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Judge0 API error: {e.response.status_code} - {e.response.text}")
-            raise HTTPException(status_code=e.response.status_code, detail=f"Judge0 API Error: {e.response.text}")
-        except Exception as e:
-            logger.error(f"Error calling Judge0: {e}")
-            raise HTTPException(status_code=500, detail=f"Error connecting to Judge0: {str(e)}")
-
-
 # --- NEW: Get All Problems Endpoint ---
 @router.get("/problems", response_model=List[ProblemSummary], tags=["Problems"])
-async def get_all_problems(skip: int = 0, limit: int = 50):
+async def get_all_problems(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1),
+    after_id: Optional[int] = None,
+    difficulty: Optional[str] = None
+):
     """
     Get a list of problems with pagination.
     Returns ID, Title, and Difficulty only.
+
+    Use `after_id` (the last id of the previous page) for cursor pagination;
+    `X-Next-After-Id` is set when more results may follow.
     """
-    # Convert dict values to a list and sort by ID
-    all_problems = sorted(problem_db.values(), key=lambda x: x['id'])
-    
-    # Apply pagination
-    paged_problems = all_problems[skip : skip + limit]
-    
+    # Pages come from the precomputed sorted indexes (no sorting per request)
+    paged_problems = problem_db.page(after_id=after_id, skip=skip, limit=limit, difficulty=difficulty)
+
+    if paged_problems and len(paged_problems) == limit:
+        response.headers["X-Next-After-Id"] = str(paged_problems[-1].id)
+
     return [
         ProblemSummary(
-            id=p['id'],
-            title=p['title'],
-            difficulty=p['difficulty']
+            id=p.id,
+            title=p.title,
+            difficulty=p.difficulty
         )
         for p in paged_problems
     ]
 
+# --- Search Problems Endpoint ---
+@router.get("/problems/search", response_model=ProblemSearchResponse, tags=["Problems"])
+async def search_problems(
+    q: str = Query(..., min_length=1, max_length=200),
+    difficulty: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    prefix: bool = True
+):
+    """
+    Full-text search over problem titles and statements (BM25 ranked).
+    The last word of `q` also matches as a prefix unless `prefix=false`.
+    `facets.difficulty` counts matches per difficulty before filtering.
+    """
+    results, total, facets = problem_db.search(q, limit=limit, difficulty=difficulty, prefix=prefix)
+
+    return ProblemSearchResponse(
+        query=q,
+        total=total,
+        results=[
+            ProblemSearchResult(id=p.id, title=p.title, difficulty=p.difficulty, score=round(score, 4))
+            for p, score in results
+        ],
+        facets={"difficulty": facets}
+    )
+
 # --- Get Single Problem Endpoint ---
 @router.get("/problem/{problem_id}", response_model=ProblemResponse, tags=["Problems"])
-async def get_problem(problem_id: int):
+async def get_problem(problem_id: int, request: Request):
     """
     Get a specific problem by its ID.
+
+    The JSON body is encoded once per problem revision and served from
+    `problem_response_cache` with a strong ETag (304 on If-None-Match).
     """
-    problem = problem_db.get(problem_id-1)
-    if not problem:
+    record = problem_db.record(problem_id-1)
+    if not record:
         raise HTTPException(status_code=404, detail=f"Problem with id {problem_id} not found.")
-    
-    return ProblemResponse(
-        id=problem['id'],
-        title=problem['title'], # Included in response
-        question=problem['question'],
-        difficulty=problem['difficulty'],
-        public_cases=[
-            PublicTestCase(input=case['input'], output=case['output'])
-            for case in problem['public_cases']
-        ]
-    )
+
+    cached = problem_response_cache.get(record.id, record.checksum)
+    if cached is None:
+        record, problem = problem_db.get_with_record(problem_id-1)
+        if not problem:
+            raise HTTPException(status_code=404, detail=f"Problem with id {problem_id} not found.")
+
+        body = ProblemResponse(
+            id=problem['id'],
+            title=problem['title'], # Included in response
+            question=problem['question'],
+            difficulty=problem['difficulty'],
+            public_cases=[
+                PublicTestCase(input=case['input'], output=case['output'])
+                for case in problem['public_cases']
+            ]
+        ).model_dump_json().encode()
+        cached = problem_response_cache.put(record.id, record.checksum, body)
+
+    return cached.respond(request)
 
 # --- Submit to Problem Endpoint ---
 @router.post("/submit/{problem_id}", response_model=SubmitResultResponse, tags=["Problems"])
 async def submit_to_problem(
     problem_id: int, 
     request: SubmitCodeRequest,
-    subset: str = Query("all")
+    http_request: Request,
+    response: Response,
+    subset: str = Query("all"),
+    mode: str = Query("full"),
+    client: httpx.AsyncClient = Depends(get_judge0_client)
 ):
     """
     Submits code to a specific problem.
+
+    `mode=fail_fast` runs public cases first, then hidden cases from the
+    smallest input up, and stops at the first failing case; `evaluated`
+    reports how many cases actually ran.
     """
-    problem = problem_db.get(problem_id)
+    record, problem = problem_db.get_with_record(problem_id)
     if not problem:
         raise HTTPException(status_code=404, detail="Problem not found.")
 
     if subset not in ["public", "all"]:
         subset = "all"
+    if mode not in MODES:
+        mode = "full"
 
-    if subset == "public":
-        test_cases = problem['public_cases']
-    else:
-        hidden = problem.get('hidden_cases', [])
-        test_cases = problem['public_cases'] + hidden
+    # Unknown languages are rejected before any judge traffic
+    await language_catalog.apply_defaults(request)
 
-    if not test_cases:
+    public_cases = problem['public_cases']
+    hidden_cases = problem.get('hidden_cases', []) if subset == "all" else []
+    total = len(public_cases) + len(hidden_cases)
+
+    if not total:
         return SubmitResultResponse(passed=0, total=0, message="No test cases available for this selection.")
 
-    tasks = []
-    for case in test_cases:
-        payload = {
-            "source_code": request.source_code,
-            "language_id": request.language_id,
-            "stdin": case['input'],
-            "expected_output": case['output'],
-            "cpu_time_limit": request.cpu_time_limit,
-            "memory_limit": request.memory_limit,
-        }
-        tasks.append(
-            call_judge0_api(
-                "/submissions?wait=true&base64_encoded=false",
-                method="POST",
-                data=payload
-            )
+    verdict, source = await evaluate_submission(
+        problem_id, record.checksum, request, public_cases, hidden_cases,
+        subset=subset, mode=mode, client=client, owner=owner_from_request(http_request),
+        rules=CompareRules.for_problem(problem.get('checker'))
+    )
+    response.headers["X-Verdict-Source"] = source
+
+    return SubmitResultResponse(**verdict)
+
+# --- Submission Jobs ---
+
+def case_event(index: int, result: dict) -> dict:
+    """Per-case progress for job streams; never includes case output."""
+    status = result.get("status") or {}
+    return {
+        "index": index,
+        "status_id": status.get("id"),
+        "status": status.get("description"),
+        "passed": is_accepted(result),
+        "time": result.get("time"),
+        "memory": result.get("memory"),
+    }
+
+
+@router.post("/submit/{problem_id}/jobs", response_model=SubmissionJobResponse, status_code=202, tags=["Problems"])
+async def submit_job(
+    problem_id: int,
+    request: SubmitCodeRequest,
+    http_request: Request,
+    subset: str = Query("all"),
+    mode: str = Query("full"),
+    client: httpx.AsyncClient = Depends(get_judge0_client)
+):
+    """
+    Same as POST /submit/{problem_id} but returns a job id right away.
+    Per-case verdicts are streamed from GET /jobs/{job_id}/events as they
+    complete, followed by the final summary.
+    """
+    record, problem = problem_db.get_with_record(problem_id)
+    if not problem:
+        raise HTTPException(status_code=404, detail="Problem not found.")
+
+    if subset not in ["public", "all"]:
+        subset = "all"
+    if mode not in MODES:
+        mode = "full"
+
+    # Unknown languages are rejected before any judge traffic
+    await language_catalog.apply_defaults(request)
+
+    public_cases = problem['public_cases']
+    hidden_cases = problem.get('hidden_cases', []) if subset == "all" else []
+    total = len(public_cases) + len(hidden_cases)
+
+    # Refuse up front rather than accepting a job that cannot be scheduled
+    admit_or_429(total, backend_for(request.language_id).scheduler)
+    owner = owner_from_request(http_request)
+    rules = CompareRules.for_problem(problem.get('checker'))
+
+    async def run(job):
+        if not total:
+            return SubmitResultResponse(
+                passed=0, total=0, message="No test cases available for this selection."
+            ).model_dump(), "judge"
+        return await evaluate_submission(
+            problem_id, record.checksum, request, public_cases, hidden_cases,
+            subset=subset, mode=mode, client=client, owner=owner,
+            on_result=lambda index, result: job.emit("case", case_event(index, result)),
+            rules=rules
         )
 
     try:
-        results = await asyncio.gather(*tasks)
-    except HTTPException as e:
-        return SubmitResultResponse(
-            passed=0, 
-            total=len(test_cases), 
-            message=f"Execution failed: {e.detail}"
+        job = job_store.start(owner, problem_id, total, run)
+    except JobStoreFull:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many submission jobs in progress, please retry later.",
+            headers={"Retry-After": str(judge_scheduler.retry_after())},
         )
 
-    passed_count = 0
-    first_fail_message = ""
-    for res in results:
-        status_id = res.get("status", {}).get("id")
-        if status_id == 3:
-            passed_count += 1
-        elif not first_fail_message:
-            first_fail_message = res.get("status", {}).get("description", "Test case failed")
-
-    return SubmitResultResponse(
-        passed=passed_count,
-        total=len(test_cases),
-        message=first_fail_message if passed_count != len(test_cases) else "All selected test cases passed!"
+    return SubmissionJobResponse(
+        job_id=job.id,
+        status=job.status,
+        total=total,
+        status_url=f"/jobs/{job.id}",
+        events_url=f"/jobs/{job.id}/events",
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=SubmissionJobStatus, tags=["Problems"])
+async def get_job(job_id: str):
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+    return SubmissionJobStatus(**job.snapshot())
+
+
+@router.get("/jobs/{job_id}/events", tags=["Problems"])
+async def stream_job_events(job_id: str, request: Request, last_event_id: Optional[int] = Query(None)):
+    """
+    Server-Sent Events stream of a job: one `case` event per finished test
+    case, then a `done` (summary) or `error` event. Reconnecting clients
+    resume after the Last-Event-ID header (or `last_event_id` query).
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+
+    header_id = request.headers.get("last-event-id")
+    if last_event_id is None and header_id and header_id.isdigit():
+        last_event_id = int(header_id)
+    start = last_event_id + 1 if last_event_id is not None else 0
+
+    async def events():
+        seen = max(0, start)
+        yield "retry: 2000\n\n"
+        while True:
+            while seen < len(job.events):
+                event, data = job.events[seen]
+                yield f"id: {seen}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+                seen += 1
+            if job.finished and seen >= len(job.events):
+                return
+            if not await job.wait(seen, settings.JOB_EVENTS_KEEPALIVE):
+                if await request.is_disconnected():
+                    return
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
+
 # --- Languages ---
 @router.get("/languages", response_model=list[LanguageResponse], tags=["Languages"])
-async def get_languages():
-    try:
-        languages = await call_judge0_api("/languages")
-        result = []
-        for lang in languages:
-            result.append({
-                "id": lang.get("id"),
-                "name": lang.get("name"),
-                "judge0_id": lang.get("id"),
-            })
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching languages: {str(e)}")
+async def get_languages(request: Request):
+    """Served from the cached catalog, with ETag revalidation."""
+    catalog = await language_catalog.get()
+    return catalog.response.respond(request)
 
 # --- Execute (Raw) ---
 @router.post("/execute", response_model=SubmissionResponse, tags=["Code Execution"])
-async def execute_code(request: SubmissionRequest):
+async def execute_code(
+    request: SubmissionRequest,
+    http_request: Request,
+    client: httpx.AsyncClient = Depends(get_judge0_client)
+):
+    await language_catalog.apply_defaults(request)
+    backend = backend_for(request.language_id)
+    admit_or_429(1, backend.scheduler)
     try:
         payload = {
             "source_code": request.source_code,
             "language_id": request.language_id,
             "stdin": request.stdin if request.stdin else None,
-            "expected_output": request.expected_output,
             "cpu_time_limit": request.cpu_time_limit,
             "memory_limit": request.memory_limit,
         }
         payload = {k: v for k, v in payload.items() if v is not None}
-        result = await call_judge0_api(
-            "/submissions?wait=true&base64_encoded=false",
-            method="POST",
-            data=payload
-        )
+        result = (await backend.run([payload], client, owner_from_request(http_request)))[0]
+        # expected_output is never sent: every backend only runs the program
+        # and it is graded here, like /submit grades its test cases
+        if request.expected_output is not None:
+            result = grade_result(result, request.expected_output, JUDGE0_RULES)
         if "token" not in result and result.get("token"):
              result["token"] = result.get("token")
         
@@ -268,9 +437,14 @@ async def execute_code(request: SubmissionRequest):
 
 # --- Get Submission ---
 @router.get("/submission/{token}", response_model=SubmissionResponse, tags=["Code Execution"])
-async def get_submission(token: str):
+async def get_submission(token: str, client: httpx.AsyncClient = Depends(get_judge0_client)):
     try:
-        result = await call_judge0_api(f"/submissions/{token}?base64_encoded=false")
+        # Results we submitted, polled or got called back with are served locally
+        result = result_store.get(token)
+        if result is None:
+            result = await call_judge0_api(f"/submissions/{token}?base64_encoded=false", client=client)
+            if (result.get("status") or {}).get("id") not in PENDING_STATUS_IDS:
+                result_store.put(result)
         return SubmissionResponse(
             token=result.get("token"),
             status=result.get("status"),
@@ -286,6 +460,71 @@ async def get_submission(token: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching submission: {str(e)}")
 
+# --- Judge0 Callbacks ---
+@router.put(CALLBACK_PATH, status_code=204, include_in_schema=False)
+async def judge0_callback(request: Request, key: Optional[str] = Query(None)):
+    """
+    Receives finished submissions from Judge0 (callback_url) and wakes
+    whoever is waiting on them.
+    """
+    if not callbacks_enabled():
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not verify_callback_key(key):
+        raise HTTPException(status_code=403, detail="Invalid callback key.")
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid callback body.")
+    if not isinstance(body, dict) or not body.get("token"):
+        raise HTTPException(status_code=400, detail="Invalid callback body.")
+
+    result_store.callbacks += 1
+    result_store.put(decode_callback(body))
+    return Response(status_code=204)
+
+@router.get("/judge0/results", tags=["Code Execution"])
+async def judge0_result_store_stats():
+    return result_store.stats()
+
+@router.get("/execution/backends", tags=["Code Execution"])
+async def execution_backend_stats():
+    return backend_stats()
+
+@router.get("/judge0/languages", tags=["Code Execution"])
+async def language_catalog_stats():
+    return language_catalog.stats()
+
+@router.get("/judge0/pool", tags=["Code Execution"])
+async def judge0_pool_stats():
+    """Connection-pool usage of the shared Judge0 client."""
+    return get_pool_stats()
+
+@router.get("/judge0/health", tags=["Code Execution"])
+async def judge0_health(response: Response):
+    """
+    Judge0 status as seen by the resilience layer ("ok", "degraded" or
+    "unavailable"), circuit breaker state, hedging/retry counts and per-endpoint
+    latency. Answers 503 while the circuit breaker is open.
+    """
+    stats = judge_resilience.stats()
+    if stats["status"] == "unavailable":
+        response.status_code = 503
+    return stats
+
+@router.get("/judge0/scheduler", tags=["Code Execution"])
+async def judge0_scheduler_stats():
+    """Queue depth, in-flight jobs and wait times of the judge scheduler."""
+    return judge_scheduler.stats()
+
+@router.get("/judge0/jobs", tags=["Code Execution"])
+async def submission_job_stats():
+    return job_store.stats()
+
+@router.get("/judge0/verdict-cache", tags=["Code Execution"])
+async def verdict_cache_stats():
+    """Hit rates of the submission verdict cache."""
+    return verdict_cache.stats()
+
 @router.get("/debug-env")
 async def debug_env():
     return {
@@ -1,52 +1,35 @@
 from fastapi import APIRouter, HTTPException, status,Response
-import json
-from bs4 import BeautifulSoup as bs
-import requests
+
+from src.platforms.geeksforgeeks import GfgError, gfg_client
 
 
 router = APIRouter(prefix="/g4g", tags=["geeksforgeeks"])
 
 
-@router.get("/{username}/info")
-async def get_g4g_data(username: str):
-    profilePage = requests.get(f"https://www.geeksforgeeks.org/user/{username}/", headers={"User-Agent": "Mozilla/5.0"})
-
-    soup = bs(profilePage.content, 'html.parser')
-
-    script_tag = soup.find("script", id="__NEXT_DATA__", type="application/json")
-
-    user_data = json.loads(script_tag.string)
-    user_info = user_data["props"]["pageProps"]["userInfo"]
-    #user_submissions = user_data["props"]["pageProps"]["userSubmissionsInfo"]
-
-    generalInfo = {
-                "userName": "speedcuberayush",
-                "fullName": user_info.get("name", ""),
-                "profilePicture": user_info.get("profile_image_url", ""),
-                "institute": user_info.get("institute_name", ""),
-                "instituteRank": user_info.get("institute_rank", ""),
-                "currentStreak": user_info.get("pod_solved_longest_streak", "00"),
-                "maxStreak": user_info.get("pod_solved_global_longest_streak", "00"),
-                "codingScore": user_info.get("score", 0),
-                "monthlyScore": user_info.get("monthly_score", 0),
-                "totalProblemsSolved": user_info.get("total_problems_solved", 0),
-                "contestRating": user_info.get("contest_rating", 0),
+async def load_profile(username: str) -> dict:
+    try:
+        return await gfg_client.profile(username)
+    except GfgError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+def general_info(username: str, user_info: dict) -> dict:
+    return {
+        "userName": username,
+        "fullName": user_info.get("name", ""),
+        "profilePicture": user_info.get("profile_image_url", ""),
+        "institute": user_info.get("institute_name", ""),
+        "instituteRank": user_info.get("institute_rank", ""),
+        "currentStreak": user_info.get("pod_solved_longest_streak", "00"),
+        "maxStreak": user_info.get("pod_solved_global_longest_streak", "00"),
+        "codingScore": user_info.get("score", 0),
+        "monthlyScore": user_info.get("monthly_score", 0),
+        "totalProblemsSolved": user_info.get("total_problems_solved", 0),
+        "contestRating": user_info.get("contest_rating", 0),
     }
-    return {"generalInfo": generalInfo}
-
-
-
-@router.get("/{username}/stats")
-async def get_g4g_data(username: str):
-    profilePage = requests.get(f"https://www.geeksforgeeks.org/user/{username}/", headers={"User-Agent": "Mozilla/5.0"})
-
-    soup = bs(profilePage.content, 'html.parser')
 
-    script_tag = soup.find("script", id="__NEXT_DATA__", type="application/json")
 
-    user_data = json.loads(script_tag.string)
-   
-    user_submissions = user_data["props"]["pageProps"]["userSubmissionsInfo"]
+def solved_stats(user_submissions: dict) -> dict:
     solvedStats = {}
     for difficulty, problems in user_submissions.items():
         questions = [
@@ -57,5 +40,23 @@ async def get_g4g_data(username: str):
             for details in problems.values()
         ]
         solvedStats[difficulty.lower()] = {"count": len(questions), "questions": questions}
+    return solvedStats
 
-    return {"solvedStats": solvedStats}
+
+@router.get("/upstream")
+async def g4g_upstream_stats():
+    """Rate governor state and queue waits, and profile cache counters."""
+    return gfg_client.stats()
+
+
+@router.get("/{username}/info")
+async def get_g4g_data(username: str):
+    profile = await load_profile(username)
+    return {"generalInfo": general_info(username, profile["userInfo"])}
+
+
+
+@router.get("/{username}/stats")
+async def get_g4g_stats(username: str):
+    profile = await load_profile(username)
+    return {"solvedStats": solved_stats(profile["userSubmissionsInfo"])}
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from src.api.codeforces import format_info, format_rating
+from src.api.geeksforgeeks import general_info, solved_stats
+from src.codeDeck.settings import settings
+from src.platforms.codeforces import CodeforcesError, codeforces_client
+from src.platforms.geeksforgeeks import GfgError, gfg_client
+
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/profile", tags=["profile"])
+
+
+class Source:
+    """
+    One upstream fetch and the profile sections built from its result.
+    `cached` returns the last result and its age without calling upstream.
+    """
+
+    def __init__(
+        self,
+        platform: str,
+        deadline: Callable[[], float],
+        fetch: Callable[[str], Awaitable[Any]],
+        cached: Callable[[str], Optional[Tuple[Any, float]]],
+        sections: Dict[str, Callable[[str, Any], Any]],
+    ):
+        self.platform = platform
+        self.deadline = deadline
+        self.fetch = fetch
+        self.cached = cached
+        self.sections = sections
+
+
+def cached_entry(entry) -> Optional[Tuple[Any, float]]:
+    return None if entry is None else (entry.value, entry.age)
+
+
+SOURCES = [
+    Source(
+        "codeforces",
+        lambda: settings.PROFILE_CODEFORCES_DEADLINE,
+        codeforces_client.user_info,
+        lambda handle: cached_entry(codeforces_client.cached("user.info", handle)),
+        {"codeforces.info": lambda handle, user_info: format_info(user_info)},
+    ),
+    Source(
+        "codeforces",
+        lambda: settings.PROFILE_CODEFORCES_DEADLINE,
+        codeforces_client.user_rating,
+        lambda handle: cached_entry(codeforces_client.cached("user.rating", handle)),
+        {"codeforces.rating": lambda handle, changes: format_rating(changes)},
+    ),
+    # One profile page serves both GeeksforGeeks sections
+    Source(
+        "geeksforgeeks",
+        lambda: settings.PROFILE_GFG_DEADLINE,
+        gfg_client.profile,
+        lambda username: cached_entry(gfg_client.cached(username)),
+        {
+            "geeksforgeeks.info": lambda username, profile: general_info(username, profile["userInfo"]),
+            "geeksforgeeks.stats": lambda username, profile: solved_stats(profile["userSubmissionsInfo"]),
+        },
+    ),
+]
+SECTIONS = [section for source in SOURCES for section in source.sections]
+
+
+def select_sections(fields: Optional[str]) -> set:
+    """`fields` lists sections (`codeforces.info`) or whole platforms (`geeksforgeeks`)."""
+    if not fields:
+        return set(SECTIONS)
+    wanted = set()
+    for field in filter(None, (f.strip() for f in fields.split(","))):
+        matches = [s for s in SECTIONS if s == field or s.startswith(field + ".")]
+        if not matches:
+            raise HTTPException(status_code=400, detail=f"Unknown field '{field}'. Available: {', '.join(SECTIONS)}")
+        wanted.update(matches)
+    return wanted
+
+
+async def resolve(source: Source, handle: str, deadline: float, wanted: set) -> Dict[str, Tuple[dict, Any]]:
+    """
+    Runs one source within `deadline` seconds. Each wanted section comes
+    back as (outcome, data): `ok` with fresh data, `stale` with the last
+    cached result when the source was late or failing, `missing` without
+    one or when the source broke unexpectedly, or `error` when the user does
+    not exist there.
+    """
+    started = time.perf_counter()
+    task = asyncio.ensure_future(source.fetch(handle))
+    # A late fetch keeps running so the next view finds it cached
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    raw, outcome = None, {"status": "ok"}
+    try:
+        raw = await asyncio.wait_for(asyncio.shield(task), deadline)
+    except (asyncio.TimeoutError, CodeforcesError, GfgError) as e:
+        if getattr(e, "status_code", None) == 404:
+            outcome = {"status": "error", "detail": "User not found"}
+        else:
+            reason = f"No answer within {deadline}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+            cached = source.cached(handle)
+            if cached is None:
+                outcome = {"status": "missing", "detail": reason}
+            else:
+                raw, age = cached
+                outcome = {"status": "stale", "age": round(age), "detail": reason}
+    except Exception as e:
+        # One broken source must not fail the other platforms' sections
+        logger.error(f"Profile source {source.platform} failed for {handle}: {e!r}")
+        outcome = {"status": "missing", "detail": f"{source.platform} is unavailable"}
+    outcome["ms"] = round((time.perf_counter() - started) * 1000)
+
+    resolved = {}
+    for section, build in source.sections.items():
+        if section not in wanted:
+            continue
+        try:
+            resolved[section] = (outcome, build(handle, raw) if raw is not None else None)
+        except Exception as e:
+            # e.g. the platform changed the shape of its response
+            logger.error(f"Profile section {section} failed for {handle}: {e!r}")
+            resolved[section] = (dict(outcome, status="missing", detail=f"{section} is unavailable"), None)
+    return resolved
+
+
+@router.get("/{username}")
+async def get_profile(
+    username: str,
+    fields: Optional[str] = None,
+    cf: Optional[str] = None,
+    g4g: Optional[str] = None,
+    timeout: Optional[float] = Query(None, gt=0, le=30),
+    stream: bool = False,
+):
+    """
+    A user's Codeforces and GeeksforGeeks profile in one call. All platforms
+    are fetched concurrently, each within its own deadline (`timeout` lowers
+    them), so the answer waits for the slowest source only up to that
+    deadline. `sources` tells per section whether it is ok, stale (served
+    from cache), missing or an error.
+
+    `fields` picks sections, e.g. `codeforces.info,geeksforgeeks`. `cf` and
+    `g4g` override the handle used on each platform. With `stream=true`
+    sections are sent as Server-Sent Events as soon as they resolve.
+    """
+    wanted = select_sections(fields)
+    handles = {"codeforces": cf or username, "geeksforgeeks": g4g or username}
+    jobs = [
+        resolve(
+            source,
+            handles[source.platform],
+            min(source.deadline(), timeout) if timeout else source.deadline(),
+            wanted,
+        )
+        for source in SOURCES
+        if wanted.intersection(source.sections)
+    ]
+
+    if stream:
+        async def events():
+            sources = {}
+            for job in asyncio.as_completed(jobs):
+                for section, (outcome, data) in (await job).items():
+                    sources[section] = outcome
+                    yield f"event: section\ndata: {json.dumps({'section': section, **outcome, 'data': data})}\n\n"
+            done = {"partial": any(o["status"] != "ok" for o in sources.values()), "sources": sources}
+            yield f"event: done\ndata: {json.dumps(done)}\n\n"
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    profile: Dict[str, Any] = {"username": username}
+    sources = {}
+    for resolved in await asyncio.gather(*jobs):
+        for section, (outcome, data) in resolved.items():
+            platform, part = section.split(".")
+            profile.setdefault(platform, {})[part] = data
+            sources[section] = outcome
+    profile["partial"] = any(o["status"] != "ok" for o in sources.values())
+    profile["sources"] = sources
+    return profile
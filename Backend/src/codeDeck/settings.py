@@ -15,5 +15,172 @@ class AppSettings(BaseSettings):
     JUDGE0_URL: str
     JUDGE0_API_KEY: str
     JUDGE0_RAPIDAPI_HOST: str
+    # "batch" uses /submissions/batch + batched polling, "single" one wait=true call per case
+    JUDGE0_SUBMISSION_MODE: str = "batch"
+    # Judge0's max_submission_batch_size (20 by default on the server)
+    JUDGE0_BATCH_SIZE: int = 20
+    JUDGE0_POLL_INTERVAL: float = 0.25
+    JUDGE0_BATCH_TIMEOUT: float = 60
+
+    # Shared Judge0 HTTP client (connection pool and per-phase timeouts)
+    JUDGE0_MAX_CONNECTIONS: int = 100
+    JUDGE0_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    JUDGE0_KEEPALIVE_EXPIRY: float = 30.0
+    JUDGE0_HTTP2: bool = False
+    JUDGE0_CONNECT_TIMEOUT: float = 5.0
+    JUDGE0_READ_TIMEOUT: float = 30.0
+    JUDGE0_WRITE_TIMEOUT: float = 10.0
+    JUDGE0_POOL_TIMEOUT: float = 10.0
+
+    # Judge0 resilience: a GET (polling, catalog) still running after its
+    # endpoint's p95 latency (once JUDGE0_HEDGE_MIN_SAMPLES are known) gets a
+    # duplicate, for at most JUDGE0_HEDGE_RATIO of all calls; failed GETs are
+    # retried up to JUDGE0_RETRIES times (submission POSTs never are)
+    # with jittered backoff starting at JUDGE0_RETRY_BACKOFF seconds; after
+    # JUDGE0_BREAKER_FAILURES failures in a row calls fail fast for
+    # JUDGE0_BREAKER_COOLDOWN seconds
+    JUDGE0_HEDGE_ENABLED: bool = True
+    JUDGE0_HEDGE_RATIO: float = 0.1
+    JUDGE0_HEDGE_MIN_SAMPLES: int = 20
+    JUDGE0_RETRIES: int = 2
+    JUDGE0_RETRY_BACKOFF: float = 0.1
+    JUDGE0_BREAKER_FAILURES: int = 5
+    JUDGE0_BREAKER_COOLDOWN: float = 10.0
+
+    # Public base URL of this backend as reachable from Judge0. When set,
+    # submissions carry a callback_url instead of using wait=true/polling
+    JUDGE0_CALLBACK_URL: str = ""
+    # Shared by all workers so any of them can accept a callback
+    JUDGE0_CALLBACK_SECRET: str = ""
+    # Results not delivered by callback are polled for after this long
+    JUDGE0_CALLBACK_FALLBACK_INTERVAL: float = 5.0
+    # Recent Judge0 results kept per worker for GET /submission/{token}
+    JUDGE0_RESULT_STORE_SIZE: int = 5000
+
+    # Judge0 language ids (comma separated, e.g. "54,62") judged with one
+    # compile-once multi-file submission per chunk of test cases. Memory is
+    # not measured per case there: the memory limit only caps the whole run
+    # and results report no memory, so no case of these languages gets a
+    # memory-limit verdict from its usage
+    JUDGE0_MULTI_TEST_LANGUAGES: str = ""
+    JUDGE0_MULTI_TEST_MAX_CASES: int = 64
+    # Budget of one multi-test submission; keep within the server's
+    # max_cpu_time_limit / max_wall_time_limit
+    JUDGE0_MULTI_TEST_CPU_LIMIT: float = 15
+    JUDGE0_MULTI_TEST_WALL_LIMIT: float = 20
+
+    # Judge0 language ids (comma separated, e.g. "71,54") run by the local
+    # subprocess engine instead of Judge0. The engine stays off (those
+    # languages go to Judge0) unless EXECUTION_LOCAL_SANDBOX is set
+    EXECUTION_LOCAL_LANGUAGES: str = ""
+    # Command prefix that isolates every local compile and run: an
+    # unprivileged uid, no network and only the toolchain and the program's
+    # own files visible. {artifact} is the program's directory and {workdir}
+    # the one the command may write to. With bubblewrap, for example:
+    #   bwrap --unshare-all --die-with-parent --uid 65534 --gid 65534
+    #   --ro-bind /usr /usr --symlink usr/bin /bin --symlink usr/lib /lib
+    #   --symlink usr/lib64 /lib64 --proc /proc --dev /dev
+    #   --ro-bind {artifact} {artifact} --bind {workdir} {workdir}
+    #   --chdir {workdir} --
+    EXECUTION_LOCAL_SANDBOX: str = ""
+    # Development and load tests only: enables the engine without a sandbox,
+    # so submitted code runs as the server's user with its network and files
+    EXECUTION_LOCAL_ALLOW_UNSANDBOXED: bool = False
+    # Local engine worker threads (0 = one per CPU core)
+    EXECUTION_LOCAL_WORKERS: int = 0
+    # Compiled programs kept for reuse across test cases and resubmissions
+    EXECUTION_LOCAL_ARTIFACTS: int = 128
+    EXECUTION_LOCAL_COMPILE_TIMEOUT: float = 30
+    # Largest stdout/stderr a local run may write, in bytes
+    EXECUTION_LOCAL_OUTPUT_LIMIT: int = 8 * 1024 * 1024
+
+    # Judge0 language list: fresh for LANGUAGE_CACHE_TTL seconds, then served
+    # stale for up to LANGUAGE_CACHE_STALE_TTL more while it is refreshed
+    LANGUAGE_CACHE_TTL: float = 3600
+    LANGUAGE_CACHE_STALE_TTL: float = 24 * 3600
+    # Language ids rejected even if Judge0 offers them (comma separated)
+    DISABLED_LANGUAGES: str = ""
+    # Per-language default limits, e.g. "62=10:256000" (seconds:KB)
+    LANGUAGE_LIMITS: str = ""
+
+    # Judge scheduler: test cases executing at once, and queued before 429s
+    JUDGE_MAX_IN_FLIGHT: int = 32
+    JUDGE_MAX_QUEUE_DEPTH: int = 2000
+    # Problem outputs are graded here, not by Judge0. Defaults for problems
+    # without their own "checker" entry: whitespace mode (tokens, lines or
+    # exact) and the absolute/relative error allowed for decimal tokens
+    JUDGE_OUTPUT_WHITESPACE: str = "tokens"
+    JUDGE_FLOAT_TOLERANCE: float = 1e-6
+
+    # Verdict cache for identical resubmissions (memory LRU + optional MongoDB tier)
+    VERDICT_CACHE_BYTES: int = 8 * 1024 * 1024
+    VERDICT_CACHE_MONGO: bool = False
+    VERDICT_CACHE_TTL: int = 24 * 3600
+
+    # Background submission jobs: how many are tracked per worker, how long
+    # finished ones stay readable, and the SSE keep-alive interval
+    JOB_STORE_MAX_JOBS: int = 1000
+    JOB_TTL_SECONDS: float = 300
+    JOB_EVENTS_KEEPALIVE: float = 15
+
+    # Number of fully decoded problems kept in memory per worker
+    PROBLEM_CACHE_SIZE: int = 256
+    # Load/write the binary catalog snapshot next to problems.jsonl
+    PROBLEM_SNAPSHOT_ENABLED: bool = True
+    # Upper bound for pre-encoded GET /problem/{id} bodies kept per worker
+    PROBLEM_RESPONSE_CACHE_BYTES: int = 64 * 1024 * 1024
+    # Poll problems.jsonl and reload changed lines every N seconds (0 disables)
+    PROBLEM_RELOAD_INTERVAL: float = 0
+
+    # Shared async HTTP client for Codeforces / GeeksforGeeks requests
+    PLATFORM_HTTP_TIMEOUT: float = 10.0
+    PLATFORM_MAX_CONNECTIONS: int = 50
+    CODEFORCES_API_URL: str = "https://codeforces.com/api"
+    # Codeforces responses are fresh for *_TTL seconds, then served for up
+    # to CODEFORCES_STALE_TTL more while one background call refreshes them
+    CODEFORCES_INFO_TTL: float = 300
+    CODEFORCES_RATING_TTL: float = 1800
+    CODEFORCES_STALE_TTL: float = 3600
+    # Handles kept per cached Codeforces method
+    CODEFORCES_CACHE_SIZE: int = 4096
+    # user.info lookups arriving within this many seconds share one call of at
+    # most CODEFORCES_INFO_BATCH_SIZE handles (the API accepts up to 10000,
+    # the URL length is the practical limit); /cfcs/info takes up to
+    # CODEFORCES_BULK_MAX_HANDLES per request
+    CODEFORCES_INFO_BATCH_WINDOW: float = 0.02
+    CODEFORCES_INFO_BATCH_SIZE: int = 300
+    CODEFORCES_BULK_MAX_HANDLES: int = 1000
+    # Codeforces API pacing: token bucket refill rate (calls/s) and burst;
+    # Codeforces publishes a limit of one call per two seconds. 0 disables it
+    CODEFORCES_RATE_LIMIT: float = 0.5
+    CODEFORCES_RATE_BURST: int = 5
+    # Codeforces submission history synced into MongoDB: submissions fetched
+    # per user.status call, age after which a status view triggers a
+    # background sync, and the period of the sync loop over recently viewed
+    # handles (0 disables the loop)
+    CODEFORCES_SYNC_PAGE_SIZE: int = 1000
+    CODEFORCES_SYNC_MAX_AGE: float = 300
+    CODEFORCES_SYNC_INTERVAL: float = 0
+    CODEFORCES_SYNC_BATCH: int = 20
+    # GeeksforGeeks profiles: one parsed page per username serves /info and /stats
+    GFG_PROFILE_URL: str = "https://www.geeksforgeeks.org/user/{username}/"
+    GFG_CACHE_TTL: float = 600
+    GFG_STALE_TTL: float = 3600
+    GFG_CACHE_SIZE: int = 1024
+    # GeeksforGeeks profile page fetches per second and burst (0 disables pacing)
+    GFG_RATE_LIMIT: float = 1.0
+    GFG_RATE_BURST: int = 5
+    # Longest expected wait for an upstream slot before a call is shed (and
+    # answered from cache where possible), for user-facing calls and for
+    # background refreshes/syncs, which queue behind them
+    PLATFORM_MAX_QUEUE_WAIT: float = 3.0
+    PLATFORM_BACKGROUND_MAX_QUEUE_WAIT: float = 60.0
+    # /profile/{username}: seconds each platform gets before its sections are
+    # answered from cache (stale) or left out (missing)
+    PROFILE_CODEFORCES_DEADLINE: float = 2.0
+    PROFILE_GFG_DEADLINE: float = 3.0
+
+    # Enables /admin endpoints when set (sent as the X-Admin-Token header)
+    ADMIN_API_KEY: str = ""
 
 settings=AppSettings()
\ No newline at end of file
@@ -0,0 +1,170 @@
+import asyncio
+from functools import partial
+from typing import Awaitable, Callable, Hashable, List, Optional, Tuple
+
+import httpx
+
+from src.codeDeck.settings import settings
+from src.judge import multitest
+from src.judge.batch import ResultCallback, plan_jobs, run_one
+from src.judge.callbacks import result_store
+from src.judge.languages import LOCAL_LANGUAGE_IDS, _parse_ids
+from src.judge.local_engine import local_engine
+from src.judge.scheduler import JudgeScheduler, judge_scheduler
+
+JobPlan = List[Tuple[int, Callable[[], Awaitable[List[dict]]]]]
+
+
+class ExecutionBackend:
+    """
+    Runs Judge0-style submission payloads and returns Judge0-style results.
+
+    Backends split work into independently schedulable jobs through
+    `plan_jobs` (used directly by fail-fast waves); `run` executes a whole
+    list of payloads and returns the results in payload order.
+    """
+    name = "base"
+    scheduler: JudgeScheduler = None
+
+    def plan_jobs(
+        self,
+        payloads: List[dict],
+        client: Optional[httpx.AsyncClient] = None,
+        owner: Hashable = None,
+        on_result: Optional[ResultCallback] = None,
+        offset: int = 0
+    ) -> JobPlan:
+        raise NotImplementedError
+
+    async def run(
+        self,
+        payloads: List[dict],
+        client: Optional[httpx.AsyncClient] = None,
+        owner: Hashable = None,
+        on_result: Optional[ResultCallback] = None
+    ) -> List[dict]:
+        job_results = await asyncio.gather(*[
+            factory() for _, factory in self.plan_jobs(payloads, client, owner, on_result)
+        ])
+        return [result for results in job_results for result in results]
+
+
+class Judge0Backend(ExecutionBackend):
+    """The remote Judge0 server, in the configured single/batch mode."""
+    name = "judge0"
+    scheduler = judge_scheduler
+
+    def plan_jobs(self, payloads, client=None, owner=None, on_result=None, offset=0) -> JobPlan:
+        return plan_jobs(payloads, client, owner, on_result, offset)
+
+
+class LocalBackend(ExecutionBackend):
+    """
+    The in-process subprocess engine. One job per test case; jobs are
+    admitted through a scheduler sized to the engine's worker pool so users
+    are still served round-robin.
+    """
+    name = "local"
+
+    def __init__(self):
+        self.scheduler = JudgeScheduler(local_engine.workers, settings.JUDGE_MAX_QUEUE_DEPTH)
+
+    async def _run_one(self, payload: dict, owner: Hashable, on_result: Optional[ResultCallback], index: int):
+        async with self.scheduler.slot(owner, 1):
+            result = await local_engine.run(payload)
+        # Lets GET /submission/{token} find local results too
+        result_store.put(result)
+        if on_result is not None:
+            on_result(index, result)
+        return [result]
+
+    def plan_jobs(self, payloads, client=None, owner=None, on_result=None, offset=0) -> JobPlan:
+        return [
+            (i, partial(self._run_one, payload, owner, on_result, offset + i))
+            for i, payload in enumerate(payloads)
+        ]
+
+
+class MultiTestBackend(ExecutionBackend):
+    """
+    Judge0 with compile-once multi-test submissions: up to
+    JUDGE0_MULTI_TEST_MAX_CASES cases of one program are packed into a
+    single multi-file submission whose runner compiles once and runs every
+    input, and the reported outputs are graded here. Single runs fall back
+    to the plain Judge0 backend.
+    """
+    name = "judge0_multi_test"
+    scheduler = judge_scheduler
+
+    async def _run_cases(
+        self,
+        payloads: List[dict],
+        client: Optional[httpx.AsyncClient],
+        owner: Hashable,
+        on_result: Optional[ResultCallback],
+        offset: int
+    ) -> List[dict]:
+        results: List[Optional[dict]] = [None] * len(payloads)
+        remaining = list(range(len(payloads)))
+        while remaining:
+            batch = [payloads[i] for i in remaining]
+            submission = await run_one(multitest.build_payload(batch), client, owner, weight=len(batch))
+            graded = multitest.grade(submission, batch)
+
+            for i, result in zip(remaining, graded):
+                if result is not None:
+                    results[i] = result
+                    if on_result is not None:
+                        on_result(offset + i, result)
+            unfinished = [i for i in remaining if results[i] is None]
+            if len(unfinished) == len(remaining):
+                first = unfinished.pop(0)
+                status = submission.get("status") or {}
+                if status.get("id") == multitest.TIME_LIMIT_STATUS_ID:
+                    # Not even the first case fit in the budget: it timed out
+                    results[first] = {"token": submission.get("token"), "status": status}
+                    if on_result is not None:
+                        on_result(offset + first, results[first])
+                else:
+                    # Its output alone overflowed the runner's (or the runner
+                    # died): it runs as a plain submission with its own limits
+                    results[first] = await run_one(payloads[first], client, owner, on_result, offset + first)
+            # Cases cut off by the time budget or the output limit run again
+            remaining = unfinished
+        return results
+
+    def plan_jobs(self, payloads, client=None, owner=None, on_result=None, offset=0) -> JobPlan:
+        if len(payloads) < 2 or not multitest.supports(payloads[0].get("language_id")):
+            return judge0_backend.plan_jobs(payloads, client, owner, on_result, offset)
+        size = max(1, settings.JUDGE0_MULTI_TEST_MAX_CASES)
+        return [
+            (start, partial(self._run_cases, payloads[start:start + size], client, owner, on_result, offset + start))
+            for start in range(0, len(payloads), size)
+        ]
+
+
+judge0_backend = Judge0Backend()
+local_backend = LocalBackend()
+multi_test_backend = MultiTestBackend()
+
+
+MULTI_TEST_LANGUAGE_IDS = _parse_ids(settings.JUDGE0_MULTI_TEST_LANGUAGES)
+
+
+def backend_for(language_id: int) -> ExecutionBackend:
+    """The backend configured for a Judge0 language id (Judge0 by default)."""
+    # Without a sandbox (or the explicit unsafe flag) local languages go to Judge0
+    if language_id in LOCAL_LANGUAGE_IDS and local_engine.enabled and local_engine.supports(language_id):
+        return local_backend
+    if language_id in MULTI_TEST_LANGUAGE_IDS and multitest.supports(language_id):
+        return multi_test_backend
+    return judge0_backend
+
+
+def backend_stats() -> dict:
+    return {
+        "local_languages": sorted(LOCAL_LANGUAGE_IDS),
+        "multi_test_languages": sorted(MULTI_TEST_LANGUAGE_IDS),
+        "local_engine": local_engine.stats(),
+        "local_scheduler": local_backend.scheduler.stats(),
+    }
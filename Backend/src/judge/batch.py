@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import time
+from functools import partial
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException
+
+from src.codeDeck.settings import settings
+from src.judge.callbacks import callback_url, callbacks_enabled, result_store
+from src.judge.client import call_judge0_api
+from src.judge.payloads import encode_batch, encode_submission
+from src.judge.scheduler import judge_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Judge0 status ids 1 (In Queue) and 2 (Processing) are not final yet
+PENDING_STATUS_IDS = (1, 2)
+INTERNAL_ERROR_STATUS = {"id": 13, "description": "Internal Error"}
+
+RESULT_FIELDS = "token,status,stdout,stderr,compile_output,time,memory,message"
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# Called with (payload index, result) as soon as each case has a final result
+ResultCallback = Callable[[int, dict], None]
+
+
+def _extra_fields() -> Optional[dict]:
+    """Members added to every submission we create."""
+    if not callbacks_enabled():
+        return None
+    return {"callback_url": callback_url()}
+
+
+async def _collect(
+    pending: Dict[str, int],
+    results: List[dict],
+    client: Optional[httpx.AsyncClient],
+    on_result: Optional[ResultCallback],
+    offset: int
+):
+    """
+    Fills `results` for the `pending` tokens (token -> index). Results are
+    taken from the result store as Judge0 callbacks deliver them; tokens
+    still missing after a wait are fetched with one batched status request,
+    which is all that happens when callbacks are disabled.
+    """
+    deadline = time.monotonic() + settings.JUDGE0_BATCH_TIMEOUT
+    if callbacks_enabled():
+        interval = settings.JUDGE0_CALLBACK_FALLBACK_INTERVAL
+    else:
+        interval = settings.JUDGE0_POLL_INTERVAL
+
+    def finish(token: str, submission: dict):
+        index = pending.pop(token)
+        results[index] = submission
+        if on_result is not None:
+            on_result(offset + index, submission)
+
+    try:
+        while pending:
+            arrived = await result_store.wait_any(pending, interval)
+            if not arrived:
+                response = await call_judge0_api(
+                    f"/submissions/batch?tokens={','.join(pending)}&base64_encoded=false&fields={RESULT_FIELDS}",
+                    client=client
+                )
+                for submission in response.get("submissions", []):
+                    if not submission:
+                        continue
+                    status_id = (submission.get("status") or {}).get("id")
+                    if submission.get("token") in pending and status_id not in PENDING_STATUS_IDS:
+                        result_store.put(submission)
+                        arrived[submission["token"]] = submission
+                if not callbacks_enabled():
+                    # Back off gently for long-running programs
+                    interval = min(interval * 1.5, 2.0)
+
+            for token, submission in arrived.items():
+                if token in pending:
+                    finish(token, submission)
+
+            if pending and time.monotonic() > deadline:
+                logger.error(f"Timed out waiting for {len(pending)} Judge0 submissions")
+                raise HTTPException(status_code=504, detail="Timed out waiting for Judge0 results")
+    finally:
+        result_store.release(list(pending))
+
+
+async def run_one(
+    payload: dict,
+    client: Optional[httpx.AsyncClient],
+    owner: Hashable,
+    on_result: Optional[ResultCallback] = None,
+    index: int = 0,
+    weight: int = 1
+) -> dict:
+    """
+    Runs one Judge0 submission. `weight` is the number of test cases it
+    stands for in the scheduler.
+    """
+    async with judge_scheduler.slot(owner, weight):
+        if not callbacks_enabled():
+            result = await call_judge0_api(
+                "/submissions?wait=true&base64_encoded=false",
+                method="POST",
+                content=encode_submission(payload),
+                client=client
+            )
+            result_store.put(result)
+        else:
+            # Judge0 calls back when done, so no Judge0 worker blocks on a wait
+            created = await call_judge0_api(
+                "/submissions?base64_encoded=false",
+                method="POST",
+                content=encode_submission(payload, _extra_fields()),
+                client=client
+            )
+            token = created.get("token") if isinstance(created, dict) else None
+            if not token:
+                raise HTTPException(status_code=502, detail=f"Judge0 API Error: no token in {created}")
+            results: List[dict] = [None]
+            await _collect({token: 0}, results, client, None, 0)
+            result = results[0]
+    if on_result is not None:
+        on_result(index, result)
+    return result
+
+
+async def run_single(
+    payloads: List[dict],
+    client: Optional[httpx.AsyncClient] = None,
+    owner: Hashable = None
+) -> List[dict]:
+    """
+    One submission per payload: a synchronous `wait=true` call, or a
+    callback-driven one when JUDGE0_CALLBACK_URL is set.
+    """
+    return await asyncio.gather(*[run_one(payload, client, owner) for payload in payloads])
+
+
+async def _create_batch(chunk: List[dict], client: Optional[httpx.AsyncClient]) -> List[dict]:
+    created = await call_judge0_api(
+        "/submissions/batch?base64_encoded=false",
+        method="POST",
+        content=encode_batch(chunk, _extra_fields()),
+        client=client
+    )
+    if not isinstance(created, list) or len(created) != len(chunk):
+        raise HTTPException(status_code=502, detail="Judge0 API Error: unexpected batch response")
+    return created
+
+
+async def _run_chunk(
+    chunk: List[dict],
+    client: Optional[httpx.AsyncClient],
+    owner: Hashable,
+    on_result: Optional[ResultCallback] = None,
+    offset: int = 0
+) -> List[dict]:
+    # The slot is held until the chunk's results are in, since that is how
+    # long the cases occupy Judge0 workers
+    async with judge_scheduler.slot(owner, len(chunk)):
+        created = await _create_batch(chunk, client)
+
+        results: List[dict] = [None] * len(chunk)
+        pending = {}
+        for index, item in enumerate(created):
+            token = item.get("token") if isinstance(item, dict) else None
+            if token:
+                pending[token] = index
+            else:
+                # Judge0 reports per-submission validation errors in place of a token
+                results[index] = {"status": dict(INTERNAL_ERROR_STATUS, description=f"Rejected by Judge0: {item}")}
+                if on_result is not None:
+                    on_result(offset + index, results[index])
+
+        await _collect(pending, results, client, on_result, offset)
+        return results
+
+
+async def run_batch(
+    payloads: List[dict],
+    client: Optional[httpx.AsyncClient] = None,
+    owner: Hashable = None
+) -> List[dict]:
+    """
+    Creates the submissions through `/submissions/batch` (chunked to the
+    server's batch limit) without holding a Judge0 wait slot, then collects
+    each chunk's results from Judge0 callbacks, or with one batched status
+    fetch per poll round.
+    Results are returned in the same order as `payloads`.
+    """
+    batch_size = max(1, settings.JUDGE0_BATCH_SIZE)
+    chunk_results = await asyncio.gather(*[
+        _run_chunk(chunk, client, owner) for chunk in _chunks(payloads, batch_size)
+    ])
+    return [result for chunk in chunk_results for result in chunk]
+
+
+def plan_jobs(
+    payloads: List[dict],
+    client: Optional[httpx.AsyncClient] = None,
+    owner: Hashable = None,
+    on_result: Optional[ResultCallback] = None,
+    offset: int = 0
+) -> List[Tuple[int, Callable[[], Awaitable[List[dict]]]]]:
+    """
+    Splits `payloads` into independently schedulable Judge0 jobs (one per
+    case in single mode, one per chunk in batch mode). Returns
+    (index of the job's first payload, factory returning its results).
+    `on_result` receives each case's result as it completes, indexed from
+    `offset`.
+    """
+    if settings.JUDGE0_SUBMISSION_MODE == "single" or len(payloads) == 1:
+        async def one(payload, index):
+            return [await run_one(payload, client, owner, on_result, offset + index)]
+        return [(i, partial(one, payload, i)) for i, payload in enumerate(payloads)]
+
+    batch_size = max(1, settings.JUDGE0_BATCH_SIZE)
+    return [
+        (start, partial(_run_chunk, payloads[start:start + batch_size], client, owner, on_result, offset + start))
+        for start in range(0, len(payloads), batch_size)
+    ]
+
+
+async def run_submissions(
+    payloads: List[dict],
+    client: Optional[httpx.AsyncClient] = None,
+    owner: Hashable = None,
+    on_result: Optional[ResultCallback] = None
+) -> List[dict]:
+    """
+    Executes `payloads` on Judge0 using the configured submission mode
+    ("batch" or "single") and returns one result per payload, in order.
+    Every Judge0 job goes through the shared scheduler under `owner`.
+    """
+    job_results = await asyncio.gather(*[
+        factory() for _, factory in plan_jobs(payloads, client, owner, on_result)
+    ])
+    return [result for results in job_results for result in results]
@@ -0,0 +1,129 @@
+import asyncio
+import base64
+import binascii
+import hmac
+import logging
+import secrets
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from src.codeDeck.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CALLBACK_PATH = "/judge0/callback"
+
+# Judge0 always base64-encodes these fields in callback bodies
+ENCODED_FIELDS = ("stdout", "stderr", "compile_output", "message")
+
+# Without a configured secret each worker makes up its own; callbacks that
+# land on another worker are then rejected and picked up by fallback polling
+_secret = settings.JUDGE0_CALLBACK_SECRET or secrets.token_urlsafe(24)
+
+
+def callbacks_enabled() -> bool:
+    return bool(settings.JUDGE0_CALLBACK_URL)
+
+
+def callback_url() -> str:
+    return f"{settings.JUDGE0_CALLBACK_URL.rstrip('/')}{CALLBACK_PATH}?key={_secret}"
+
+
+def verify_callback_key(key: Optional[str]) -> bool:
+    return bool(key) and hmac.compare_digest(key, _secret)
+
+
+def decode_callback(body: dict) -> dict:
+    """Turns a callback body into the shape of a base64_encoded=false result."""
+    result = dict(body)
+    for field in ENCODED_FIELDS:
+        value = result.get(field)
+        if isinstance(value, str):
+            try:
+                result[field] = base64.b64decode(value).decode("utf-8", errors="replace")
+            except (binascii.Error, ValueError):
+                logger.warning(f"Judge0 callback field '{field}' is not valid base64")
+    return result
+
+
+class ResultStore:
+    """
+    Recent final Judge0 results by token, fed by callbacks, polls and
+    synchronous responses alike. Coroutines waiting on a token are woken as
+    soon as its result is stored. Bounded to `max_entries` results (LRU).
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._results: "OrderedDict[str, dict]" = OrderedDict()
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self.callbacks = 0
+        self.stored = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        result = self._results.get(token)
+        if result is None:
+            self.misses += 1
+            return None
+        self._results.move_to_end(token)
+        self.hits += 1
+        return result
+
+    def put(self, result: dict):
+        token = result.get("token")
+        if not token:
+            return
+        self._results[token] = result
+        self._results.move_to_end(token)
+        self.stored += 1
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+        waiter = self._waiters.pop(token, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(result)
+
+    def _waiter(self, token: str) -> asyncio.Future:
+        waiter = self._waiters.get(token)
+        if waiter is None:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters[token] = waiter
+        return waiter
+
+    async def wait_any(self, tokens: Iterable[str], timeout: float) -> Dict[str, dict]:
+        """
+        Returns the stored results among `tokens`, waiting up to `timeout`
+        seconds for at least one of them to arrive.
+        """
+        tokens = list(tokens)
+        ready = {token: self._results[token] for token in tokens if token in self._results}
+        if ready or not tokens:
+            return ready
+
+        waiters = [self._waiter(token) for token in tokens]
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        return {token: self._results[token] for token in tokens if token in self._results}
+
+    def release(self, tokens: Iterable[str]):
+        """Drops the waiters of tokens nobody is waiting on anymore."""
+        for token in tokens:
+            waiter = self._waiters.pop(token, None)
+            if waiter is not None and not waiter.done():
+                waiter.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "callbacks_enabled": callbacks_enabled(),
+            "entries": len(self._results),
+            "max_entries": self.max_entries,
+            "waiting": len(self._waiters),
+            "callbacks": self.callbacks,
+            "stored": self.stored,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+result_store = ResultStore(settings.JUDGE0_RESULT_STORE_SIZE)
@@ -0,0 +1,157 @@
+import logging
+import math
+import re
+from itertools import chain, zip_longest
+from typing import Iterator, List, Optional
+
+from src.codeDeck.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# How output whitespace is compared:
+#   tokens - only the whitespace-separated tokens matter (default)
+#   lines  - line breaks matter; spacing within a line and trailing
+#            whitespace do not
+#   exact  - lines must match character for character, apart from trailing
+#            whitespace; no float tolerance
+WHITESPACE_MODES = ("tokens", "lines", "exact")
+
+_WHITESPACE = re.compile(r"\s")
+# Texts are tokenized this many characters at a time
+BLOCK_SIZE = 1 << 16
+
+
+class CompareRules:
+    """How a problem's outputs are compared: whitespace mode and float tolerance."""
+    __slots__ = ("whitespace", "float_tolerance")
+
+    def __init__(self, whitespace: str = "tokens", float_tolerance: float = 0.0):
+        if whitespace not in WHITESPACE_MODES:
+            raise ValueError(f"Unknown whitespace mode: {whitespace!r}")
+        self.whitespace = whitespace
+        self.float_tolerance = max(0.0, float(float_tolerance))
+
+    @classmethod
+    def for_problem(cls, spec: Optional[dict]) -> "CompareRules":
+        """
+        Rules from a problem's optional `checker` entry, e.g.
+        {"whitespace": "lines", "float_tolerance": 1e-9}; unset keys take the
+        JUDGE_OUTPUT_WHITESPACE / JUDGE_FLOAT_TOLERANCE defaults.
+        """
+        spec = spec if isinstance(spec, dict) else {}
+        try:
+            return cls(
+                spec.get("whitespace", settings.JUDGE_OUTPUT_WHITESPACE),
+                spec.get("float_tolerance", settings.JUDGE_FLOAT_TOLERANCE),
+            )
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring invalid checker spec {spec!r}: {e}")
+            return cls(settings.JUDGE_OUTPUT_WHITESPACE, settings.JUDGE_FLOAT_TOLERANCE)
+
+    @property
+    def key(self) -> str:
+        return f"{self.whitespace}:{self.float_tolerance!r}"
+
+
+# What Judge0 itself does with expected_output; used for ad-hoc /execute runs
+JUDGE0_RULES = CompareRules("exact")
+
+
+def _content_end(text: str) -> int:
+    """Index just past the last non-whitespace character."""
+    end = len(text)
+    while end and text[end - 1].isspace():
+        end -= 1
+    return end
+
+
+def _token_blocks(text: str) -> Iterator[List[str]]:
+    start, length = 0, len(text)
+    while start < length:
+        end = start + BLOCK_SIZE
+        if end < length:
+            # Extend to the next whitespace so no token is cut in two
+            match = _WHITESPACE.search(text, end)
+            end = match.start() if match else length
+        yield text[start:end].split()
+        start = end
+
+
+def _tokens(text: str) -> Iterator[str]:
+    """
+    Whitespace-separated tokens of `text`. str.split runs on one bounded
+    block at a time, which is far faster than a regex per token while never
+    holding more than a block's tokens in memory.
+    """
+    return chain.from_iterable(_token_blocks(text))
+
+
+def _is_float_token(token: str) -> bool:
+    return "." in token or "e" in token or "E" in token
+
+
+def tokens_match(actual: str, expected: str, tolerance: float) -> bool:
+    if actual == expected:
+        return True
+    if not tolerance or not _is_float_token(expected):
+        return False
+    try:
+        a, b = float(actual), float(expected)
+    except ValueError:
+        return False
+    if not (math.isfinite(a) and math.isfinite(b)):
+        return False
+    # Absolute error for small values, relative error for large ones
+    return abs(a - b) <= tolerance * max(1.0, abs(b))
+
+
+def _token_streams_match(actual: Iterator[str], expected: Iterator[str], tolerance: float) -> bool:
+    for a, b in zip_longest(actual, expected):
+        if a == b:
+            continue
+        if a is None or b is None or not tokens_match(a, b, tolerance):
+            return False
+    return True
+
+
+def _lines(text: str, end: int) -> Iterator[str]:
+    position = 0
+    while position <= end:
+        newline = text.find("\n", position, end)
+        if newline < 0:
+            yield text[position:end]
+            return
+        yield text[position:newline]
+        position = newline + 1
+
+
+def outputs_match(stdout: Optional[str], expected: str, rules: Optional[CompareRules] = None) -> bool:
+    """
+    Compares a program's output with an expected output under `rules`
+    (Judge0-style trailing whitespace handling by default). Tokens and lines
+    are streamed from both texts, so large outputs are never split into lists
+    and the comparison stops at the first difference.
+    """
+    rules = rules or JUDGE0_RULES
+    actual = stdout or ""
+    if "\r" in actual:
+        actual = actual.replace("\r\n", "\n")
+
+    # Fast path: the output is the expected text plus trailing whitespace
+    if actual.startswith(expected) and _content_end(actual) <= len(expected):
+        return True
+
+    if rules.whitespace == "tokens":
+        return _token_streams_match(_tokens(actual), _tokens(expected), rules.float_tolerance)
+
+    actual_lines = _lines(actual, _content_end(actual))
+    expected_lines = _lines(expected, _content_end(expected))
+    for a, b in zip_longest(actual_lines, expected_lines):
+        if a is None or b is None:
+            return False
+        if rules.whitespace == "exact":
+            if a.rstrip() != b.rstrip():
+                return False
+        elif not _token_streams_match(_tokens(a), _tokens(b), rules.float_tolerance):
+            return False
+    return True
@@ -0,0 +1,174 @@
+from fastapi import HTTPException
+from functools import partial
+from typing import Optional
+import httpx
+import logging
+
+from src.codeDeck.settings import settings
+from src.judge.resilience import CircuitOpen, judge_resilience
+from src.utils.shared_client import SharedClient
+
+logger = logging.getLogger(__name__)
+
+# --- Environment Variables ---
+JUDGE0_URL = settings.JUDGE0_URL
+JUDGE0_API_KEY = settings.JUDGE0_API_KEY
+JUDGE0_RAPIDAPI_HOST = settings.JUDGE0_RAPIDAPI_HOST
+
+
+class PoolStats:
+    """Request counters used to size the connection pool against Judge0."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def started(self):
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finished(self, failed: bool = False):
+        self.in_flight -= 1
+        if failed:
+            self.errors += 1
+
+
+pool_stats = PoolStats()
+
+
+def _auth_headers() -> dict:
+    headers = {"Content-Type": "application/json"}
+
+    if "rapidapi.com" in JUDGE0_URL:
+        headers["X-RapidAPI-Key"] = JUDGE0_API_KEY
+        headers["X-RapidAPI-Host"] = JUDGE0_RAPIDAPI_HOST
+    elif JUDGE0_API_KEY:
+        headers["X-Auth-Token"] = JUDGE0_API_KEY
+    return headers
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_judge0_client() -> httpx.AsyncClient:
+    """
+    Builds the long-lived, pooled client used for all Judge0 traffic.
+    """
+    http2 = settings.JUDGE0_HTTP2
+    if http2 and not _http2_available():
+        logger.warning("JUDGE0_HTTP2 is set but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        base_url=JUDGE0_URL,
+        headers=_auth_headers(),
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.JUDGE0_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.JUDGE0_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.JUDGE0_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.JUDGE0_CONNECT_TIMEOUT,
+            read=settings.JUDGE0_READ_TIMEOUT,
+            write=settings.JUDGE0_WRITE_TIMEOUT,
+            pool=settings.JUDGE0_POOL_TIMEOUT,
+        ),
+    )
+
+
+_shared = SharedClient(create_judge0_client)
+
+
+async def init_judge0_client() -> httpx.AsyncClient:
+    return _shared.get()
+
+
+async def close_judge0_client():
+    await _shared.close()
+
+
+def get_judge0_client() -> httpx.AsyncClient:
+    """FastAPI dependency returning the shared Judge0 client."""
+    return _shared.get()
+
+
+def get_pool_stats() -> dict:
+    stats = {
+        "requests": pool_stats.requests,
+        "errors": pool_stats.errors,
+        "in_flight": pool_stats.in_flight,
+        "peak_in_flight": pool_stats.peak_in_flight,
+        "max_connections": settings.JUDGE0_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.JUDGE0_MAX_KEEPALIVE_CONNECTIONS,
+    }
+    # httpx does not expose pool internals publicly; report them when available
+    client = _shared.client
+    try:
+        connections = client._transport._pool.connections if client is not None else []
+        stats["connections"] = len(connections)
+        stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+        stats["http2"] = bool(client and client._transport._pool._http2)
+    except AttributeError:
+        pass
+    return stats
+
+
+async def call_judge0_api(
+    endpoint: str,
+    method: str = "GET",
+    data: dict = None,
+    client: Optional[httpx.AsyncClient] = None,
+    content: Optional[bytes] = None
+):
+    """
+    Calls Judge0 and returns the decoded JSON response. POST bodies are
+    either `data` (serialized here) or an already encoded JSON `content`.
+
+    Calls go through `judge_resilience`. GETs (polling, catalog reads) are
+    safe to repeat, so they are retried with jittered backoff and get a
+    hedged duplicate when they run past the endpoint's p95 latency. POSTs
+    create submissions and are sent exactly once. While the circuit breaker
+    is open this raises a 503 without calling Judge0.
+    """
+    client = client or get_judge0_client()
+
+    if method == "GET":
+        send = partial(client.get, endpoint)
+    elif content is not None:
+        send = partial(client.post, endpoint, content=content)
+    else:
+        send = partial(client.post, endpoint, json=data)
+    hedge = method == "GET"
+    retries = settings.JUDGE0_RETRIES if hedge else 0
+
+    pool_stats.started()
+    failed = True
+    try:
+        resp = await judge_resilience.request(method, endpoint, send, hedge, retries)
+        resp.raise_for_status()
+        result = resp.json()
+        failed = False
+        return result
+    except CircuitOpen as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Judge0 is unavailable, please retry later.",
+            headers={"Retry-After": str(int(e.retry_after + 0.999))},
+        )
+    except httpx.HTTPStatusError as e:
+        logger.error(f"Judge0 API error: {e.response.status_code} - {e.response.text}")
+        raise HTTPException(status_code=e.response.status_code, detail=f"Judge0 API Error: {e.response.text}")
+    except Exception as e:
+        logger.error(f"Error calling Judge0: {e}")
+        raise HTTPException(status_code=500, detail=f"Error connecting to Judge0: {str(e)}")
+    finally:
+        pool_stats.finished(failed)
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from src.codeDeck.settings import settings
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobStoreFull(Exception):
+    """Raised when every slot of the job store holds an unfinished job."""
+
+
+class Job:
+    """
+    One background submission. Progress is an append-only list of
+    (event, data) pairs; an event's id is its position in the list, so
+    stream consumers can resume from any point.
+    """
+    __slots__ = (
+        "id", "owner", "problem_id", "total", "status", "events",
+        "summary", "source", "created_at", "finished_at", "task", "_changed",
+    )
+
+    def __init__(self, owner: Hashable, problem_id: int, total: int):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.problem_id = problem_id
+        self.total = total
+        self.status = QUEUED
+        self.events: List[Tuple[str, dict]] = []
+        self.summary: Optional[dict] = None
+        self.source: Optional[str] = None
+        self.created_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @property
+    def completed(self) -> int:
+        return sum(1 for event, _ in self.events if event == "case")
+
+    def emit(self, event: str, data: dict):
+        self.events.append((event, data))
+        # Wake everybody waiting on the current event, then arm a fresh one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def finish(self, status: str, event: str, data: dict):
+        self.status = status
+        self.finished_at = time.monotonic()
+        self.emit(event, data)
+
+    async def wait(self, seen: int, timeout: float) -> bool:
+        """
+        Waits until there are more than `seen` events or the job finished.
+        Returns False on timeout.
+        """
+        changed = self._changed
+        if len(self.events) > seen or self.finished:
+            return True
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "problem_id": self.problem_id,
+            "total": self.total,
+            "completed": self.completed,
+            "summary": self.summary,
+            "source": self.source,
+        }
+
+
+class JobStore:
+    """
+    Bounded in-memory store of submission jobs for this worker.
+
+    Finished jobs are kept for `ttl_seconds` so clients can fetch the result
+    or replay the event stream, and are evicted oldest first when the store
+    is full. Running jobs are never evicted; once all `max_jobs` slots hold
+    unfinished jobs new ones are refused with JobStoreFull.
+    """
+
+    def __init__(self, max_jobs: int, ttl_seconds: float):
+        self.max_jobs = max(1, max_jobs)
+        self.ttl_seconds = ttl_seconds
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.created = 0
+        self.evicted = 0
+        self.rejected = 0
+
+    # --- Eviction ---
+
+    def _expire(self):
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        self.evicted += len(expired)
+
+    def _make_room(self) -> bool:
+        self._expire()
+        if len(self._jobs) < self.max_jobs:
+            return True
+        for job_id, job in self._jobs.items():
+            if job.finished:
+                del self._jobs[job_id]
+                self.evicted += 1
+                return True
+        return False
+
+    # --- Jobs ---
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._expire()
+        return self._jobs.get(job_id)
+
+    def start(
+        self,
+        owner: Hashable,
+        problem_id: int,
+        total: int,
+        run: Callable[[Job], Awaitable[Tuple[dict, str]]]
+    ) -> Job:
+        """
+        Registers a job and runs `run(job)` in the background. `run` emits
+        per-case events through the job and returns (summary, source).
+        """
+        if not self._make_room():
+            self.rejected += 1
+            raise JobStoreFull()
+
+        job = Job(owner, problem_id, total)
+        self._jobs[job.id] = job
+        self.created += 1
+        job.task = asyncio.create_task(self._run(job, run))
+        return job
+
+    async def _run(self, job: Job, run: Callable[[Job], Awaitable[Tuple[dict, str]]]):
+        job.status = RUNNING
+        try:
+            summary, source = await run(job)
+        except asyncio.CancelledError:
+            job.finish(FAILED, "error", {"detail": "Job was cancelled."})
+            raise
+        except Exception as e:
+            detail = getattr(e, "detail", None) or str(e) or type(e).__name__
+            logger.error(f"Submission job {job.id} failed: {detail}")
+            job.finish(FAILED, "error", {"detail": detail})
+            return
+        job.summary = summary
+        job.source = source
+        job.finish(DONE, "done", dict(summary, source=source))
+
+    async def shutdown(self):
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        self._expire()
+        running = sum(1 for job in self._jobs.values() if not job.finished)
+        return {
+            "jobs": len(self._jobs),
+            "running": running,
+            "max_jobs": self.max_jobs,
+            "created": self.created,
+            "evicted": self.evicted,
+            "rejected": self.rejected,
+        }
+
+
+job_store = JobStore(settings.JOB_STORE_MAX_JOBS, settings.JOB_TTL_SECONDS)
@@ -0,0 +1,185 @@
+import json
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+from src.codeDeck.settings import settings
+from src.judge.client import call_judge0_api, get_judge0_client
+from src.judge.local_engine import LANGUAGES as LOCAL_LANGUAGES, local_engine
+from src.utils.cache import AsyncTTLCache
+from src.utils.response_cache import EncodedResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CPU_TIME_LIMIT = 5.0
+DEFAULT_MEMORY_LIMIT = 128000  # KB, Judge0's unit
+# Seconds between catalog fetch attempts while none could be loaded
+RETRY_AFTER_FAILURE = 30
+
+# Runtimes that need more headroom than the defaults: id -> (seconds, KB)
+LIMIT_OVERRIDES: Dict[int, Tuple[float, int]] = {
+    51: (5.0, 256000),   # C#
+    62: (10.0, 256000),  # Java
+    63: (5.0, 256000),   # JavaScript
+    78: (10.0, 256000),  # Kotlin
+    81: (10.0, 256000),  # Scala
+}
+
+
+def _parse_ids(value: str) -> set:
+    return {int(part) for part in value.split(",") if part.strip().isdigit()}
+
+
+# Judged by the local engine instead of Judge0 (see backends.backend_for)
+LOCAL_LANGUAGE_IDS = _parse_ids(settings.EXECUTION_LOCAL_LANGUAGES)
+
+
+def _parse_limits(value: str) -> Dict[int, Tuple[float, int]]:
+    """Parses LANGUAGE_LIMITS, e.g. "62=10:256000,71=3:128000"."""
+    limits = {}
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        try:
+            language_id, spec = part.split("=")
+            cpu, memory = spec.split(":")
+            limits[int(language_id)] = (float(cpu), int(memory))
+        except ValueError:
+            logger.warning(f"Ignoring malformed LANGUAGE_LIMITS entry: {part!r}")
+    return limits
+
+
+class Language:
+    __slots__ = ("id", "name", "cpu_time_limit", "memory_limit")
+
+    def __init__(self, id: int, name: str, cpu_time_limit: float, memory_limit: int):
+        self.id = id
+        self.name = name
+        self.cpu_time_limit = cpu_time_limit
+        self.memory_limit = memory_limit
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "judge0_id": self.id,
+            "cpu_time_limit": self.cpu_time_limit,
+            "memory_limit": self.memory_limit,
+        }
+
+
+class LanguageList:
+    """One fetched catalog: languages by id plus the pre-encoded response."""
+    __slots__ = ("languages", "response")
+
+    def __init__(self, languages: Dict[int, Language]):
+        self.languages = languages
+        body = json.dumps([language.to_dict() for language in languages.values()]).encode()
+        self.response = EncodedResponse(None, body)
+
+
+class LanguageCatalog:
+    """
+    The judge's language list, fetched at startup and kept in a TTL cache
+    with stale-while-revalidate refresh. Execution endpoints validate
+    language ids and fill in per-language default limits from it without
+    any judge traffic.
+    """
+
+    def __init__(self):
+        self._cache: AsyncTTLCache[LanguageList] = AsyncTTLCache(
+            ttl=settings.LANGUAGE_CACHE_TTL,
+            stale_ttl=settings.LANGUAGE_CACHE_STALE_TTL,
+            max_entries=1,
+            name="languages",
+        )
+        self.disabled = _parse_ids(settings.DISABLED_LANGUAGES)
+        self.limits = {**LIMIT_OVERRIDES, **_parse_limits(settings.LANGUAGE_LIMITS)}
+        self._failed_at: Optional[float] = None
+
+    def _language(self, language_id: int, name: str) -> Language:
+        cpu, memory = self.limits.get(language_id, (DEFAULT_CPU_TIME_LIMIT, DEFAULT_MEMORY_LIMIT))
+        return Language(language_id, name, cpu, memory)
+
+    async def _fetch(self) -> LanguageList:
+        languages: Dict[int, Language] = {}
+        for item in await call_judge0_api("/languages", client=get_judge0_client()):
+            language_id = item.get("id")
+            if isinstance(language_id, int) and language_id not in self.disabled:
+                languages[language_id] = self._language(language_id, item.get("name") or str(language_id))
+
+        # Languages run only by the local engine still need to be accepted
+        for language_id in LOCAL_LANGUAGE_IDS if local_engine.enabled else ():
+            if language_id in LOCAL_LANGUAGES and language_id not in languages and language_id not in self.disabled:
+                languages[language_id] = self._language(language_id, LOCAL_LANGUAGES[language_id].name)
+
+        ordered = dict(sorted(languages.items()))
+        logger.info(f"Language catalog loaded: {len(ordered)} languages")
+        return LanguageList(ordered)
+
+    async def get(self) -> LanguageList:
+        """The catalog; raises the Judge0 HTTPException if it was never loaded."""
+        try:
+            catalog = await self._cache.get("languages", self._fetch)
+        except HTTPException:
+            self._failed_at = time.monotonic()
+            raise
+        self._failed_at = None
+        return catalog
+
+    async def refresh(self):
+        """Loads the catalog now (startup); failures are logged, not raised."""
+        self._cache.invalidate("languages")
+        try:
+            await self.get()
+        except HTTPException as e:
+            logger.warning(f"Could not load the language catalog: {e.detail}")
+
+    async def resolve(self, language_id: int) -> Language:
+        """
+        The language for `language_id`, or a 400 if the judge does not offer
+        it or it is disabled. When the catalog cannot be loaded at all, ids
+        are let through with default limits rather than blocking execution.
+        """
+        if language_id in self.disabled:
+            raise HTTPException(status_code=400, detail=f"Language {language_id} is disabled.")
+        recently_failed = (
+            self._failed_at is not None
+            and time.monotonic() - self._failed_at < RETRY_AFTER_FAILURE
+            and self._cache.peek("languages") is None
+        )
+        if recently_failed:
+            # Judge0 is likely down; do not add a failing round trip per request
+            return self._language(language_id, str(language_id))
+        try:
+            catalog = await self.get()
+        except HTTPException as e:
+            logger.warning(f"Language catalog unavailable, skipping validation: {e.detail}")
+            return self._language(language_id, str(language_id))
+
+        language = catalog.languages.get(language_id)
+        if language is None:
+            raise HTTPException(status_code=400, detail=f"Unsupported language_id: {language_id}")
+        return language
+
+    async def apply_defaults(self, request):
+        """Validates request.language_id and fills in unset time/memory limits."""
+        language = await self.resolve(request.language_id)
+        if request.cpu_time_limit is None:
+            request.cpu_time_limit = language.cpu_time_limit
+        if request.memory_limit is None:
+            request.memory_limit = language.memory_limit
+        return language
+
+    def stats(self) -> dict:
+        entry = self._cache.peek("languages")
+        return dict(
+            self._cache.stats(),
+            languages=len(entry.value.languages) if entry else 0,
+            age=round(entry.age, 1) if entry else None,
+        )
+
+
+language_catalog = LanguageCatalog()
@@ -0,0 +1,400 @@
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import shlex
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from src.codeDeck.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Judge0 status ids, so local results look exactly like Judge0 ones
+STATUS_ACCEPTED = {"id": 3, "description": "Accepted"}
+STATUS_WRONG_ANSWER = {"id": 4, "description": "Wrong Answer"}
+STATUS_TIME_LIMIT = {"id": 5, "description": "Time Limit Exceeded"}
+STATUS_COMPILATION_ERROR = {"id": 6, "description": "Compilation Error"}
+STATUS_INTERNAL_ERROR = {"id": 13, "description": "Internal Error"}
+SIGNAL_STATUSES = {
+    signal.SIGSEGV: {"id": 7, "description": "Runtime Error (SIGSEGV)"},
+    signal.SIGXFSZ: {"id": 8, "description": "Runtime Error (SIGXFSZ)"},
+    signal.SIGFPE: {"id": 9, "description": "Runtime Error (SIGFPE)"},
+    signal.SIGABRT: {"id": 10, "description": "Runtime Error (SIGABRT)"},
+}
+STATUS_NZEC = {"id": 11, "description": "Runtime Error (NZEC)"}
+STATUS_OTHER = {"id": 12, "description": "Runtime Error (Other)"}
+
+
+# Runs in a fresh interpreter between the worker and the program: applies the
+# rlimits, runs the program as its own child and records the child's wait
+# status, CPU time and peak RSS. Measuring from this small process keeps the
+# backend's RSS out of ru_maxrss, which a direct fork+exec would inherit.
+LAUNCHER = """
+import os, resource, sys
+cpu, output, address_space, usage_path = map(sys.argv.__getitem__, range(1, 5))
+cpu, output, address_space = int(cpu), int(output), int(address_space)
+pid = os.fork()
+if pid == 0:
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (output, output))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    if address_space:
+        resource.setrlimit(resource.RLIMIT_AS, (address_space, address_space))
+    try:
+        os.execvp(sys.argv[5], sys.argv[5:])
+    except OSError:
+        os._exit(127)
+_, status, usage = os.wait4(pid, 0)
+exec_failed = os.WIFEXITED(status) and os.WEXITSTATUS(status) == 127 and usage.ru_utime == 0
+with open(usage_path, "w") as f:
+    f.write("exec-error 0 0" if exec_failed else f"{status} {usage.ru_utime + usage.ru_stime} {usage.ru_maxrss}")
+"""
+
+
+class LocalLanguage:
+    """
+    How to build and run one Judge0 language locally. Commands are argument
+    lists where {source} and {binary} are replaced with paths inside the
+    program's artifact directory.
+    """
+    __slots__ = ("name", "source_name", "compile", "run", "limit_address_space")
+
+    def __init__(
+        self,
+        name: str,
+        source_name: str,
+        run: List[str],
+        compile: Optional[List[str]] = None,
+        limit_address_space: bool = True
+    ):
+        self.name = name
+        self.source_name = source_name
+        self.compile = compile
+        self.run = run
+        # JIT runtimes reserve far more address space than they use, so
+        # RLIMIT_AS would kill them before the memory limit means anything
+        self.limit_address_space = limit_address_space
+
+
+# Keyed by Judge0 language id
+LANGUAGES: Dict[int, LocalLanguage] = {
+    50: LocalLanguage(
+        "C (GCC)", "main.c", ["{binary}"],
+        compile=["gcc", "-O2", "-std=c11", "-o", "{binary}", "{source}", "-lm"]
+    ),
+    54: LocalLanguage(
+        "C++ (GCC)", "main.cpp", ["{binary}"],
+        compile=["g++", "-O2", "-std=c++17", "-o", "{binary}", "{source}"]
+    ),
+    63: LocalLanguage("JavaScript (Node.js)", "main.js", ["node", "{source}"], limit_address_space=False),
+    71: LocalLanguage("Python 3", "main.py", ["python3", "{source}"]),
+}
+
+
+class Artifact:
+    """
+    A prepared program: its directory, and the compiler output if it failed.
+    `users` counts the runs holding it; an evicted artifact's directory is
+    only removed once that drops to zero.
+    """
+    __slots__ = ("path", "compile_error", "users", "evicted")
+
+    def __init__(self, path: str, compile_error: Optional[str] = None):
+        self.path = path
+        self.compile_error = compile_error
+        self.users = 0
+        self.evicted = False
+
+
+class LocalEngine:
+    """
+    Runs programs in subprocesses on this host.
+
+    Each run goes through LAUNCHER, which applies CPU time, address space,
+    output size and core dump rlimits; runs also get their own session (so a timeout kills the whole process group),
+    a scratch working directory and a scrubbed environment. That bounds
+    resource use but does not isolate anything: compiles and runs are
+    wrapped in the `sandbox` command prefix for that, and without one the
+    engine refuses to run unless `allow_unsandboxed` is set.
+
+    Runs execute on a thread pool with one worker per CPU core by default.
+    Programs are prepared once per (language, source): compiled binaries are
+    kept in an LRU of artifact directories and reused by every test case
+    and by identical resubmissions.
+    """
+
+    def __init__(self, workers: int = 0, max_artifacts: int = 128, sandbox: str = "", allow_unsandboxed: bool = False):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_artifacts = max(1, max_artifacts)
+        self.sandbox = shlex.split(sandbox)
+        self.allow_unsandboxed = allow_unsandboxed
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._root: Optional[str] = None
+        self._artifacts: "OrderedDict[str, Artifact]" = OrderedDict()
+        self._preparing: Dict[str, asyncio.Future] = {}
+
+        self.runs = 0
+        self.compiles = 0
+        self.artifact_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sandbox) or self.allow_unsandboxed
+
+    def supports(self, language_id: int) -> bool:
+        return language_id in LANGUAGES
+
+    def _sandboxed(self, command: List[str], artifact: str, workdir: str) -> List[str]:
+        return [part.format(artifact=artifact, workdir=workdir) for part in self.sandbox] + command
+
+    # --- Worker pool ---
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="local-judge")
+        return self._executor
+
+    def _artifact_root(self) -> str:
+        if self._root is None:
+            self._root = tempfile.mkdtemp(prefix="codedeck-artifacts-")
+        return self._root
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._root is not None:
+            shutil.rmtree(self._root, ignore_errors=True)
+            self._root = None
+            self._artifacts.clear()
+
+    # --- Artifacts ---
+
+    def _build(self, key: str, language: LocalLanguage, source_code: str) -> Artifact:
+        path = os.path.join(self._artifact_root(), key)
+        os.makedirs(path, exist_ok=True)
+        source = os.path.join(path, language.source_name)
+        with open(source, "w", encoding="utf-8") as f:
+            f.write(source_code)
+        if not language.compile:
+            return Artifact(path)
+
+        self.compiles += 1
+        command = [part.format(source=source, binary=os.path.join(path, "main")) for part in language.compile]
+        try:
+            proc = subprocess.run(
+                self._sandboxed(command, path, path),
+                cwd=path,
+                capture_output=True,
+                text=True,
+                env={"PATH": os.environ.get("PATH", ""), "LANG": "C.UTF-8", "HOME": path},
+                timeout=settings.EXECUTION_LOCAL_COMPILE_TIMEOUT,
+            )
+        except subprocess.TimeoutExpired:
+            return Artifact(path, "Compilation timed out")
+        if proc.returncode != 0:
+            output = proc.stderr or proc.stdout or "Compilation failed"
+            return Artifact(path, output.replace(path + os.sep, ""))
+        return Artifact(path)
+
+    def _evict(self, artifact: Artifact):
+        artifact.evicted = True
+        if artifact.users == 0:
+            shutil.rmtree(artifact.path, ignore_errors=True)
+
+    def release(self, artifact: Artifact):
+        """Ends one use of an artifact returned by `prepare`."""
+        artifact.users -= 1
+        if artifact.evicted and artifact.users == 0:
+            shutil.rmtree(artifact.path, ignore_errors=True)
+
+    async def prepare(self, language_id: int, source_code: str) -> Artifact:
+        """
+        Returns the artifact for this program, building it at most once even
+        when many test cases ask for it concurrently. Every call must be
+        paired with `release`, which keeps the directory alive while in use.
+        """
+        while True:
+            artifact = await self._lookup_or_build(language_id, source_code)
+            # A build finished by another caller may have been evicted (and
+            # deleted) before this one resumed
+            if not (artifact.evicted and artifact.users == 0):
+                artifact.users += 1
+                return artifact
+
+    async def _lookup_or_build(self, language_id: int, source_code: str) -> Artifact:
+        key = hashlib.sha256(f"{language_id}\0{source_code}".encode()).hexdigest()[:32]
+        artifact = self._artifacts.get(key)
+        if artifact is not None:
+            self._artifacts.move_to_end(key)
+            self.artifact_hits += 1
+            return artifact
+
+        building = self._preparing.get(key)
+        if building is not None:
+            self.artifact_hits += 1
+            return await asyncio.shield(building)
+
+        future = asyncio.get_running_loop().create_future()
+        self._preparing[key] = future
+        try:
+            artifact = await asyncio.get_running_loop().run_in_executor(
+                self._pool(), self._build, key, LANGUAGES[language_id], source_code
+            )
+            self._artifacts[key] = artifact
+            while len(self._artifacts) > self.max_artifacts:
+                _, evicted = self._artifacts.popitem(last=False)
+                self._evict(evicted)
+            future.set_result(artifact)
+            return artifact
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                future.exception()
+            raise
+        finally:
+            self._preparing.pop(key, None)
+
+    # --- Execution ---
+
+    def _execute(self, artifact: Artifact, language: LocalLanguage, payload: dict) -> dict:
+        cpu_limit = float(payload.get("cpu_time_limit") or 5)
+        memory_kb = int(payload.get("memory_limit") or 128000)
+        command = [
+            part.format(source=os.path.join(artifact.path, language.source_name), binary=os.path.join(artifact.path, "main"))
+            for part in language.run
+        ]
+
+        with tempfile.TemporaryDirectory(prefix="run-", dir=self._artifact_root()) as scratch:
+            # Files instead of pipes: no deadlocks on large output, and
+            # RLIMIT_FSIZE caps how much a program can print
+            stdin_path = os.path.join(scratch, "stdin")
+            stdout_path = os.path.join(scratch, "stdout")
+            stderr_path = os.path.join(scratch, "stderr")
+            usage_path = os.path.join(scratch, "usage")
+            with open(stdin_path, "w", encoding="utf-8") as f:
+                f.write(payload.get("stdin") or "")
+
+            launcher = [
+                sys.executable, "-S", "-E", "-c", LAUNCHER,
+                str(max(1, math.ceil(cpu_limit))),
+                str(settings.EXECUTION_LOCAL_OUTPUT_LIMIT),
+                str(memory_kb * 1024 if language.limit_address_space else 0),
+                usage_path,
+            ] + self._sandboxed(command, artifact.path, scratch)
+
+            with open(stdin_path, "rb") as stdin, open(stdout_path, "wb") as stdout, open(stderr_path, "wb") as stderr:
+                proc = subprocess.Popen(
+                    launcher,
+                    stdin=stdin,
+                    stdout=stdout,
+                    stderr=stderr,
+                    cwd=scratch,
+                    env={"PATH": os.environ.get("PATH", ""), "LANG": "C.UTF-8", "HOME": scratch},
+                    start_new_session=True,
+                )
+                # RLIMIT_CPU does not catch programs that sleep or block
+                try:
+                    proc.wait(timeout=cpu_limit * 2 + 1)
+                    timed_out = False
+                except subprocess.TimeoutExpired:
+                    timed_out = True
+                    try:
+                        os.killpg(proc.pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                    proc.wait()
+
+            with open(stdout_path, "rb") as f:
+                out = f.read().decode("utf-8", errors="replace")
+            with open(stderr_path, "rb") as f:
+                err = f.read().decode("utf-8", errors="replace")
+            try:
+                with open(usage_path) as f:
+                    wait_status, cpu_time, max_rss = f.read().split()
+            except (OSError, ValueError):
+                wait_status, cpu_time, max_rss = None, cpu_limit, 0
+
+        if wait_status == "exec-error":
+            return {"status": dict(STATUS_INTERNAL_ERROR, description=f"Cannot start {command[0]}")}
+
+        cpu_time = float(cpu_time)
+        exit_code = os.waitstatus_to_exitcode(int(wait_status)) if wait_status is not None else None
+        term_signal = -exit_code if exit_code is not None and exit_code < 0 else None
+        if timed_out or exit_code is None or term_signal == signal.SIGXCPU or cpu_time > cpu_limit:
+            status = STATUS_TIME_LIMIT
+        elif term_signal is not None:
+            status = SIGNAL_STATUSES.get(term_signal, STATUS_OTHER)
+        elif exit_code != 0:
+            status = STATUS_NZEC
+        else:
+            status = STATUS_ACCEPTED
+
+        return {
+            "status": status,
+            "stdout": out,
+            "stderr": err or None,
+            "compile_output": None,
+            "time": f"{cpu_time:.3f}",
+            "memory": int(max_rss),  # KB on Linux, like Judge0
+            "message": f"Exited with signal {term_signal}" if term_signal else None,
+            "exit_code": exit_code if term_signal is None else None,
+        }
+
+    async def run(self, payload: dict) -> dict:
+        """Runs one Judge0-style submission payload; returns a Judge0-style result."""
+        token = f"local-{uuid.uuid4()}"
+        language_id = payload.get("language_id")
+        if language_id not in LANGUAGES:
+            return {"token": token, "status": dict(STATUS_INTERNAL_ERROR, description=f"Language {language_id} is not available locally")}
+        if not self.enabled:
+            return {"token": token, "status": dict(STATUS_INTERNAL_ERROR, description="Local execution needs EXECUTION_LOCAL_SANDBOX")}
+
+        artifact = await self.prepare(language_id, payload.get("source_code") or "")
+        try:
+            if artifact.compile_error is not None:
+                return {"token": token, "status": STATUS_COMPILATION_ERROR, "compile_output": artifact.compile_error}
+
+            self.runs += 1
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._pool(), self._execute, artifact, LANGUAGES[language_id], payload
+                )
+            except OSError as e:
+                logger.error(f"Local execution failed: {e}")
+                return {"token": token, "status": dict(STATUS_INTERNAL_ERROR, description=f"Local execution failed: {e}")}
+        finally:
+            self.release(artifact)
+        result["token"] = token
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "enabled": self.enabled,
+            "sandboxed": bool(self.sandbox),
+            "languages": sorted(LANGUAGES),
+            "runs": self.runs,
+            "compiles": self.compiles,
+            "artifacts": len(self._artifacts),
+            "artifacts_in_use": sum(1 for a in self._artifacts.values() if a.users),
+            "max_artifacts": self.max_artifacts,
+            "artifact_hits": self.artifact_hits,
+        }
+
+
+local_engine = LocalEngine(
+    settings.EXECUTION_LOCAL_WORKERS,
+    settings.EXECUTION_LOCAL_ARTIFACTS,
+    settings.EXECUTION_LOCAL_SANDBOX,
+    settings.EXECUTION_LOCAL_ALLOW_UNSANDBOXED,
+)
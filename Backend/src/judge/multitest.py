@@ -0,0 +1,182 @@
+import base64
+import binascii
+import io
+import logging
+import signal
+import zipfile
+from typing import Dict, List, Optional, Tuple
+
+from src.codeDeck.settings import settings
+from src.judge.local_engine import (
+    SIGNAL_STATUSES, STATUS_ACCEPTED, STATUS_NZEC, STATUS_OTHER,
+    STATUS_TIME_LIMIT,
+)
+
+logger = logging.getLogger(__name__)
+
+# Judge0's "Multi-file program": runs the `compile` then the `run` script
+# from a base64 zip passed as additional_files
+MULTI_FILE_LANGUAGE_ID = 89
+COMPILATION_ERROR_STATUS_ID = 6
+TIME_LIMIT_STATUS_ID = 5
+
+# exit status of coreutils `timeout` when the wall clock limit is hit
+TIMEOUT_EXIT = 124
+CASE_MARKER = "@@case"
+MAX_STDERR_BYTES = 4096
+
+
+class MultiTestLanguage:
+    """Source file name and shell commands inside the Judge0 sandbox."""
+    __slots__ = ("source_name", "compile", "run")
+
+    def __init__(self, source_name: str, compile: str, run: str):
+        self.source_name = source_name
+        self.compile = compile
+        self.run = run
+
+
+# Keyed by Judge0 language id; paths are those of the official Judge0 image
+LANGUAGES: Dict[int, MultiTestLanguage] = {
+    50: MultiTestLanguage(
+        "main.c", "/usr/local/gcc-9.2.0/bin/gcc -O2 -o main main.c -lm", "./main"
+    ),
+    54: MultiTestLanguage(
+        "main.cpp", "/usr/local/gcc-9.2.0/bin/g++ -O2 -std=c++17 -o main main.cpp", "./main"
+    ),
+    62: MultiTestLanguage(
+        "Main.java", "/usr/local/openjdk13/bin/javac Main.java", "/usr/local/openjdk13/bin/java Main"
+    ),
+}
+
+# Runs every tests/NNNNN.in once against the compiled program. Each case
+# prints a marker line (name, exit code, wall microseconds) followed by its
+# stdout and stderr, base64 encoded on one line each.
+RUNNER = """#!/bin/bash
+for input in tests/*.in; do
+  name=$(basename "$input" .in)
+  start=$(date +%s%N)
+  ( ulimit -St @CPU@; exec timeout @WALL@ @RUN@ ) < "$input" > case.out 2> case.err
+  code=$?
+  end=$(date +%s%N)
+  echo "@@case $name $code $(( (end - start) / 1000 ))"
+  base64 -w0 case.out; echo
+  head -c @STDERR@ case.err | base64 -w0; echo
+done
+"""
+
+
+def supports(language_id: int) -> bool:
+    return language_id in LANGUAGES
+
+
+def build_archive(payloads: List[dict]) -> str:
+    """
+    Zips the source, one input file per case and the compile/run scripts
+    for a list of payloads of the same program. Returns it base64 encoded.
+    """
+    first = payloads[0]
+    language = LANGUAGES[first["language_id"]]
+    cpu_limit = float(first.get("cpu_time_limit") or 5)
+
+    runner = (
+        RUNNER
+        .replace("@CPU@", str(max(1, int(cpu_limit + 0.999))))
+        .replace("@WALL@", f"{cpu_limit * 2 + 1:g}")
+        .replace("@RUN@", language.run)
+        .replace("@STDERR@", str(MAX_STDERR_BYTES))
+    )
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(language.source_name, first["source_code"])
+        archive.writestr("compile", f"#!/bin/bash\n{language.compile}\n")
+        archive.writestr("run", runner)
+        for i, payload in enumerate(payloads):
+            archive.writestr(f"tests/{i:05d}.in", payload.get("stdin") or "")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def build_payload(payloads: List[dict]) -> dict:
+    """One Judge0 multi-file submission running every payload's input."""
+    first = payloads[0]
+    return {
+        "language_id": MULTI_FILE_LANGUAGE_ID,
+        "additional_files": build_archive(payloads),
+        # The run script executes all cases, so it gets the whole budget;
+        # per-case limits are enforced by the script itself
+        "cpu_time_limit": settings.JUDGE0_MULTI_TEST_CPU_LIMIT,
+        "wall_time_limit": settings.JUDGE0_MULTI_TEST_WALL_LIMIT,
+        "memory_limit": first.get("memory_limit"),
+    }
+
+
+def _decode(value: str) -> str:
+    return base64.b64decode(value).decode("utf-8", errors="replace")
+
+
+def parse_runner_output(stdout: Optional[str]) -> Dict[int, Tuple[int, float, str, str]]:
+    """
+    {case index: (exit code, seconds, stdout, stderr)} for every complete
+    record. A truncated tail (output limit, killed run) is ignored.
+    """
+    records = {}
+    lines = (stdout or "").split("\n")
+    for i, line in enumerate(lines):
+        if not line.startswith(CASE_MARKER) or i + 2 >= len(lines):
+            continue
+        try:
+            _, name, code, micros = line.split()
+            records[int(name)] = (int(code), int(micros) / 1_000_000, _decode(lines[i + 1]), _decode(lines[i + 2]))
+        except (ValueError, binascii.Error):
+            logger.warning(f"Unreadable multi-test record: {line[:80]}")
+    return records
+
+
+def grade_case(payload: dict, record: Tuple[int, float, str, str], token: Optional[str]) -> dict:
+    exit_code, seconds, out, err = record
+    cpu_limit = float(payload.get("cpu_time_limit") or 5)
+
+    killed_for_time = exit_code in (128 + signal.SIGXCPU, 128 + signal.SIGKILL) and seconds >= cpu_limit
+    if exit_code == TIMEOUT_EXIT or killed_for_time or seconds > cpu_limit * 2 + 1:
+        status = STATUS_TIME_LIMIT
+    elif exit_code > 128:
+        status = SIGNAL_STATUSES.get(exit_code - 128, STATUS_OTHER)
+    elif exit_code != 0:
+        status = STATUS_NZEC
+    else:
+        status = STATUS_ACCEPTED
+
+    return {
+        "token": token,
+        "status": status,
+        "stdout": out,
+        "stderr": err or None,
+        "compile_output": None,
+        "time": f"{seconds:.3f}",
+        # Judge0 only measures the whole run, not each case
+        "memory": None,
+        "message": None,
+        "exit_code": exit_code if exit_code <= 128 else None,
+    }
+
+
+def grade(submission: dict, payloads: List[dict]) -> List[Optional[dict]]:
+    """
+    Per-case results for a finished multi-file submission. Cases without a
+    complete record (the run hit its time budget, its output was cut off by
+    Judge0's output limit, or the runner died) are None, so the caller can
+    run them again.
+    """
+    status = submission.get("status") or {}
+    token = submission.get("token")
+
+    if status.get("id") == COMPILATION_ERROR_STATUS_ID:
+        failed = {"token": token, "status": status, "compile_output": submission.get("compile_output")}
+        return [dict(failed) for _ in payloads]
+
+    records = parse_runner_output(submission.get("stdout"))
+    return [
+        grade_case(payload, records[i], token) if i in records else None
+        for i, payload in enumerate(payloads)
+    ]
@@ -0,0 +1,62 @@
+import json
+from typing import Iterable, List, Optional
+
+from src.schemas.problem_loader import TestCase
+
+
+class JudgePayload(dict):
+    """
+    A Judge0 submission payload for one problem test case.
+
+    It behaves like the plain payload dict (the local and multi-test
+    engines read it as such) but also keeps its pre-encoded JSON parts: the
+    per-submission `head` (source and limits, encoded once per submission
+    and shared by every case) and the case's cached stdin fragment; expected
+    outputs are graded locally and never sent. Request bodies are assembled
+    from those bytes.
+    """
+    __slots__ = ("head", "case")
+
+    def __init__(self, head: bytes, case: TestCase, fields: dict):
+        super().__init__(fields)
+        self.head = head
+        self.case = case
+
+
+def encode_head(request) -> bytes:
+    """The JSON members shared by all of a submission's payloads, without braces."""
+    return json.dumps({
+        "source_code": request.source_code,
+        "language_id": request.language_id,
+        "cpu_time_limit": request.cpu_time_limit,
+        "memory_limit": request.memory_limit,
+    }).encode()[1:-1]
+
+
+def _parts(payload: dict, extra: Optional[dict]) -> List[bytes]:
+    if not isinstance(payload, JudgePayload) or not isinstance(payload.case, TestCase):
+        return [json.dumps(dict(payload, **extra) if extra else payload).encode()]
+    parts = [b"{", payload.head, b",", payload.case.json_fragment()]
+    if extra:
+        parts += [b",", json.dumps(extra).encode()[1:-1]]
+    parts.append(b"}")
+    return parts
+
+
+def encode_submission(payload: dict, extra: Optional[dict] = None) -> bytes:
+    """JSON body for POST /submissions; `extra` adds members such as callback_url."""
+    return b"".join(_parts(payload, extra))
+
+
+def encode_batch(payloads: Iterable[dict], extra: Optional[dict] = None) -> bytes:
+    """
+    JSON body for POST /submissions/batch. All parts are joined in one go,
+    so test data is copied exactly once, into the body itself.
+    """
+    parts = [b'{"submissions":[']
+    for i, payload in enumerate(payloads):
+        if i:
+            parts.append(b",")
+        parts += _parts(payload, extra)
+    parts.append(b"]}")
+    return b"".join(parts)
@@ -0,0 +1,301 @@
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+import httpx
+
+from src.codeDeck.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Responses worth another try (or a hedge) rather than being final
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_TOKEN_SEGMENT = re.compile(r"/[0-9a-f]{8}-[0-9a-f-]{27}")
+
+
+def endpoint_key(method: str, endpoint: str) -> str:
+    """
+    Latency bucket for a call: method and path, with submission tokens and
+    the query string dropped. wait=true submissions get their own bucket
+    since they include the program's run time.
+    """
+    path, _, query = endpoint.partition("?")
+    key = f"{method} {_TOKEN_SEGMENT.sub('/{token}', path)}"
+    return key + " (wait)" if "wait=true" in query else key
+
+
+class LatencyTracker:
+    """Recent successful call durations per endpoint."""
+
+    def __init__(self, window: int = 256, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        # key -> (sample count when computed, p95)
+        self._p95: Dict[str, tuple] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, key: str, seconds: float):
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+    def percentile(self, key: str, p: float) -> Optional[float]:
+        samples = self._samples.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def p95(self, key: str) -> Optional[float]:
+        # Re-sorted at most every 16 samples; the hedge delay need not be exact
+        count = self._counts.get(key, 0)
+        cached = self._p95.get(key)
+        if cached is None or count - cached[0] >= 16:
+            cached = self._p95[key] = (count, self.percentile(key, 0.95))
+        return cached[1]
+
+    def stats(self) -> dict:
+        return {
+            key: {
+                "samples": len(samples),
+                "p50": round(self.percentile(key, 0.5) or 0.0, 4),
+                "p95": round(self.percentile(key, 0.95) or 0.0, 4),
+            }
+            for key, samples in self._samples.items()
+        }
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling Judge0 while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Judge0 circuit is open, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops calling Judge0 after `failure_threshold` consecutive failures
+    (transport errors and 5xx responses). After `cooldown` seconds one probe
+    call is let through: success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float, window: int = 100):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        # Recent outcomes (True = failure) for the error rate
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self.opened = 0
+        self.rejected = 0
+
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+
+    def before_call(self):
+        """Raises CircuitOpen unless a call may go out now."""
+        if self.state == CLOSED:
+            return
+        if self.state == OPEN and self.retry_after() <= 0:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        raise CircuitOpen(max(1.0, self.retry_after()))
+
+    def record_success(self):
+        self._outcomes.append(False)
+        self._failures = 0
+        self._probing = False
+        if self.state != CLOSED:
+            logger.info("Judge0 circuit closed")
+            self.state = CLOSED
+
+    def record_failure(self):
+        self._outcomes.append(True)
+        self._failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+            logger.warning(f"Judge0 circuit opened after {self._failures} consecutive failures")
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+            self.opened += 1
+
+    def release(self):
+        """A call ended without an outcome (cancelled hedge): frees the probe."""
+        self._probing = False
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "error_rate": round(self.error_rate, 3),
+            "retry_after": round(self.retry_after(), 1) if self.state != CLOSED else 0,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class HedgeBudget:
+    """Token bucket capping hedged requests at `ratio` of all calls."""
+
+    def __init__(self, ratio: float, burst: float = 10):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst
+
+    def earn(self):
+        self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def spend(self) -> bool:
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+Send = Callable[[], Awaitable[httpx.Response]]
+
+
+class JudgeResilience:
+    """
+    Wraps every Judge0 request: tracks latency per endpoint, sends a hedged
+    duplicate once a hedgeable call runs past its endpoint's p95 and keeps
+    whichever usable response arrives first, retries idempotent calls with
+    jittered exponential backoff, and fails fast through the circuit breaker
+    while Judge0 is unhealthy.
+    """
+
+    def __init__(self):
+        self.latency = LatencyTracker(min_samples=settings.JUDGE0_HEDGE_MIN_SAMPLES)
+        self.breaker = CircuitBreaker(settings.JUDGE0_BREAKER_FAILURES, settings.JUDGE0_BREAKER_COOLDOWN)
+        self.hedge_budget = HedgeBudget(settings.JUDGE0_HEDGE_RATIO)
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retries = 0
+
+    async def _attempt(self, key: str, send: Send) -> httpx.Response:
+        self.breaker.before_call()
+        started = time.monotonic()
+        try:
+            response = await send()
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+            self.latency.record(key, time.monotonic() - started)
+        return response
+
+    async def _hedged(self, key: str, send: Send, hedge: bool) -> httpx.Response:
+        delay = self.latency.p95(key) if hedge and settings.JUDGE0_HEDGE_ENABLED else None
+        if delay is None:
+            return await self._attempt(key, send)
+
+        first = asyncio.ensure_future(self._attempt(key, send))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self.hedge_budget.spend():
+                self.hedges += 1
+                tasks.add(asyncio.ensure_future(self._attempt(key, send)))
+
+            error: Optional[BaseException] = None
+            fallback: Optional[httpx.Response] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    response = task.result()
+                    if response.status_code not in RETRYABLE_STATUS_CODES:
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return response
+                    fallback = response
+            if fallback is not None:
+                return fallback
+            raise error
+        finally:
+            for task in tasks:
+                if not task.cancel() and not task.cancelled():
+                    task.exception()  # finished meanwhile; mark its error as seen
+
+    async def request(self, method: str, endpoint: str, send: Send, hedge: bool, retries: int) -> httpx.Response:
+        """
+        Sends one logical Judge0 request. Raises CircuitOpen, or the last
+        transport error once `retries` are used up; a retryable status
+        response is returned as-is after the last attempt.
+        """
+        key = endpoint_key(method, endpoint)
+        self.calls += 1
+        self.hedge_budget.earn()
+
+        attempt = 0
+        while True:
+            try:
+                response = await self._hedged(key, send, hedge)
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= retries:
+                    return response
+                reason = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                if attempt >= retries:
+                    raise
+                reason = repr(e)
+
+            # Full jitter keeps retries from many callers from lining up
+            backoff = random.uniform(0, min(2.0, settings.JUDGE0_RETRY_BACKOFF * 2 ** attempt))
+            attempt += 1
+            self.retries += 1
+            logger.info(f"Retrying {key} in {backoff:.2f}s ({reason})")
+            await asyncio.sleep(backoff)
+
+    def health(self) -> str:
+        """"ok", "degraded" (recent failures or probing) or "unavailable"."""
+        if self.breaker.state == OPEN and self.breaker.retry_after() > 0:
+            return "unavailable"
+        if self.breaker.state == HALF_OPEN or self.breaker.error_rate >= 0.1:
+            return "degraded"
+        return "ok"
+
+    def stats(self) -> dict:
+        return {
+            "status": self.health(),
+            "breaker": self.breaker.stats(),
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "retries": self.retries,
+            "latency": self.latency.stats(),
+        }
+
+
+judge_resilience = JudgeResilience()
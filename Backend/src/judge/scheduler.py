@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Hashable
+
+import jwt
+from fastapi import HTTPException, Request, status
+
+from src.codeDeck.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerFull(Exception):
+    """Raised when the judge queue is past its configured depth."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Judge queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    __slots__ = ("weight", "future", "enqueued_at", "granted")
+
+    def __init__(self, weight: int, future: asyncio.Future):
+        self.weight = weight
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+
+class JudgeScheduler:
+    """
+    In-process scheduler for judge jobs.
+
+    At most `max_in_flight` test cases (a job's weight is the number of cases
+    it runs) are executing at once. Waiting jobs are queued per owner and
+    owners are served round-robin, so one user's huge submission cannot
+    starve everybody else. New work is rejected with SchedulerFull once the
+    queue holds `max_queue_depth` test cases.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue_depth: int):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue_depth = max_queue_depth
+        self._queues: "OrderedDict[Hashable, Deque[_Ticket]]" = OrderedDict()
+        self._in_flight = 0
+        self._queued = 0
+
+        # Metrics
+        self._waits: Deque[float] = deque(maxlen=1000)
+        self._service_per_case = 0.5  # EWMA seconds per test case
+        self.granted = 0
+        self.rejected = 0
+
+    # --- Admission ---
+
+    def retry_after(self) -> int:
+        backlog = self._queued + self._in_flight
+        return max(1, math.ceil(backlog * self._service_per_case / self.max_in_flight))
+
+    def admit(self, weight: int = 1):
+        """Raises SchedulerFull if `weight` more cases should not be queued."""
+        if self._queued > 0 and self._queued + weight > self.max_queue_depth:
+            self.rejected += 1
+            raise SchedulerFull(self.retry_after())
+
+    # --- Slots ---
+
+    def _fits(self, weight: int) -> bool:
+        return self._in_flight == 0 or self._in_flight + weight <= self.max_in_flight
+
+    def _dispatch(self):
+        while self._queues:
+            owner, queue = next(iter(self._queues.items()))
+            ticket = queue[0]
+            if ticket.future.done():
+                # Waiter was cancelled before it got a slot
+                queue.popleft()
+                self._queued -= ticket.weight
+                if not queue:
+                    del self._queues[owner]
+                continue
+            if not self._fits(ticket.weight):
+                return
+
+            queue.popleft()
+            self._queued -= ticket.weight
+            self._in_flight += ticket.weight
+            ticket.granted = True
+            ticket.future.set_result(None)
+            self._waits.append(time.monotonic() - ticket.enqueued_at)
+            self.granted += 1
+
+            # Round-robin: the owner goes to the back of the line
+            del self._queues[owner]
+            if queue:
+                self._queues[owner] = queue
+
+    def _release(self, weight: int, elapsed: float = None):
+        self._in_flight -= weight
+        if elapsed is not None and weight:
+            self._service_per_case = 0.9 * self._service_per_case + 0.1 * (elapsed / weight)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, owner: Hashable, weight: int = 1):
+        """Waits for a fair share of judge capacity for `weight` test cases."""
+        weight = min(max(1, weight), self.max_in_flight)
+        ticket = _Ticket(weight, asyncio.get_running_loop().create_future())
+        self._queues.setdefault(owner, deque()).append(ticket)
+        self._queued += weight
+        self._dispatch()
+
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.granted:
+                self._release(weight)
+            else:
+                queue = self._queues.get(owner)
+                if queue is not None and ticket in queue:
+                    queue.remove(ticket)
+                    self._queued -= weight
+                    if not queue:
+                        del self._queues[owner]
+                self._dispatch()
+            raise
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(weight, time.monotonic() - started)
+
+    # --- Metrics ---
+
+    def stats(self) -> Dict[str, float]:
+        waits = sorted(self._waits)
+
+        def pct(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 4)
+
+        return {
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": self._queued,
+            "max_queue_depth": self.max_queue_depth,
+            "waiting_owners": len(self._queues),
+            "granted": self.granted,
+            "rejected": self.rejected,
+            "wait_p50": pct(0.5),
+            "wait_p95": pct(0.95),
+            "wait_max": round(waits[-1], 4) if waits else 0.0,
+            "service_seconds_per_case": round(self._service_per_case, 4),
+        }
+
+
+judge_scheduler = JudgeScheduler(settings.JUDGE_MAX_IN_FLIGHT, settings.JUDGE_MAX_QUEUE_DEPTH)
+
+
+def admit_or_429(weight: int = 1, scheduler: JudgeScheduler = judge_scheduler):
+    """Admission check for endpoints: turns SchedulerFull into a 429."""
+    try:
+        scheduler.admit(weight)
+    except SchedulerFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Judge is busy, please retry later.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+def owner_from_request(request: Request) -> str:
+    """
+    Fairness key for a request: the logged-in user when the access token
+    cookie is valid, otherwise the client address.
+    """
+    token = request.cookies.get("access_token")
+    if token:
+        try:
+            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
+            return f"user:{payload['sub']}"
+        except (jwt.InvalidTokenError, KeyError):
+            pass
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
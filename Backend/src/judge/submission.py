@@ -0,0 +1,240 @@
+import asyncio
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException
+
+from src.codeDeck.settings import settings
+from src.judge.backends import ExecutionBackend, backend_for, judge0_backend
+from src.judge.batch import ResultCallback
+from src.judge.checker import CompareRules, outputs_match
+from src.judge.local_engine import STATUS_WRONG_ANSWER
+from src.judge.payloads import JudgePayload, encode_head
+from src.judge.scheduler import admit_or_429
+from src.judge.verdict_cache import verdict_cache, verdict_key, cacheable_results
+
+ACCEPTED_STATUS_ID = 3
+
+MODES = ("full", "fail_fast")
+
+
+def build_payloads(request, cases: List[dict]) -> List[dict]:
+    # Source and limits are JSON-encoded once here; each case contributes its
+    # cached stdin fragment. No expected_output: outputs are graded here.
+    head = encode_head(request)
+    return [
+        JudgePayload(head, case, {
+            "source_code": request.source_code,
+            "language_id": request.language_id,
+            "stdin": case['input'],
+            "cpu_time_limit": request.cpu_time_limit,
+            "memory_limit": request.memory_limit,
+        })
+        for case in cases
+    ]
+
+
+def is_accepted(result: Optional[dict]) -> bool:
+    return bool(result) and (result.get("status") or {}).get("id") == ACCEPTED_STATUS_ID
+
+
+def grade_result(result: dict, expected: str, rules: CompareRules) -> dict:
+    """
+    Turns a run the judge reported as Accepted (it ran without errors) into
+    Wrong Answer when its stdout does not match `expected`. Returns a graded
+    copy; `result` itself is left as the judge reported it, since the same
+    dict is kept in result_store.
+    """
+    if is_accepted(result) and not outputs_match(result.get("stdout"), expected, rules):
+        return dict(result, status=dict(STATUS_WRONG_ANSWER))
+    return result
+
+
+class CaseGrader:
+    """
+    Result callback that grades each case against its expected output as it
+    arrives, keeps the graded result in `graded` by case index and forwards
+    it to `on_result`. Every backend reports each result through the
+    callback before returning it, so fail-fast and the summary read the
+    graded results from here rather than the backend's raw ones.
+    """
+
+    def __init__(self, payloads: List[JudgePayload], rules: CompareRules, on_result: Optional[ResultCallback]):
+        self.payloads = payloads
+        self.rules = rules
+        self.on_result = on_result
+        self.graded: Dict[int, dict] = {}
+
+    def __call__(self, index: int, result: dict):
+        graded = self.graded[index] = grade_result(result, self.payloads[index].case['output'], self.rules)
+        if self.on_result is not None:
+            self.on_result(index, graded)
+
+
+def fail_fast_order(public_cases: List[dict], hidden_cases: List[dict]) -> List[dict]:
+    """Public cases first, then hidden cases from the smallest input up."""
+    return list(public_cases) + sorted(hidden_cases, key=lambda case: len(case['input']))
+
+
+async def run_fail_fast(
+    payloads: List[dict],
+    first_wave: int,
+    next_wave: int,
+    grader: CaseGrader,
+    client: Optional[httpx.AsyncClient] = None,
+    owner: Hashable = None,
+    backend: ExecutionBackend = judge0_backend
+) -> Tuple[List[dict], bool]:
+    """
+    Runs `payloads` (already in the order they should be tried) in waves and
+    stops at the first non-accepted verdict: later waves are never scheduled
+    and outstanding jobs of the current wave are cancelled. After the first
+    wave, waves start at `next_wave` cases and double each time.
+
+    Returns the graded results that were actually evaluated, in payload
+    order, and whether the run stopped early.
+    """
+    evaluated: List[Tuple[int, dict]] = []
+    start = 0
+    wave_size = max(1, first_wave)
+
+    while start < len(payloads):
+        wave = payloads[start:start + wave_size]
+        tasks = {
+            asyncio.ensure_future(factory()): offset
+            for offset, factory in backend.plan_jobs(wave, client, owner, grader, start)
+        }
+        failed = False
+        try:
+            pending = set(tasks)
+            while pending and not failed:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    offset = tasks[task]
+                    for i in range(len(task.result())):
+                        index = start + offset + i
+                        result = grader.graded[index]
+                        evaluated.append((index, result))
+                        if not is_accepted(result):
+                            failed = True
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if failed:
+            evaluated.sort(key=lambda item: item[0])
+            return [result for _, result in evaluated], True
+
+        start += len(wave)
+        # Submissions that keep passing get bigger waves to keep latency down
+        wave_size = max(1, next_wave) if start == len(wave) else wave_size * 2
+
+    evaluated.sort(key=lambda item: item[0])
+    return [result for _, result in evaluated], False
+
+
+async def judge_cases(
+    request,
+    public_cases: List[dict],
+    hidden_cases: List[dict],
+    mode: str = "full",
+    client: Optional[httpx.AsyncClient] = None,
+    owner: Hashable = None,
+    on_result: Optional[ResultCallback] = None,
+    rules: Optional[CompareRules] = None
+) -> List[dict]:
+    """
+    Executes the submission against the given cases and returns the graded
+    results of every case that was evaluated. `on_result` is called with
+    (case index, result) as each case finishes, in the order the cases are
+    tried. The execution backend is picked by the submission's language;
+    outputs are compared under `rules` (the configured defaults if unset).
+    """
+    backend = backend_for(request.language_id)
+    rules = rules or CompareRules.for_problem(None)
+    if mode == "fail_fast":
+        payloads = build_payloads(request, fail_fast_order(public_cases, hidden_cases))
+        first_wave = max(len(public_cases), 1)
+        results, _ = await run_fail_fast(
+            payloads, first_wave, settings.JUDGE0_BATCH_SIZE,
+            CaseGrader(payloads, rules, on_result), client, owner, backend
+        )
+        return results
+
+    payloads = build_payloads(request, list(public_cases) + list(hidden_cases))
+    grader = CaseGrader(payloads, rules, on_result)
+    results = await backend.run(payloads, client, owner, grader)
+    return [grader.graded[index] for index in range(len(results))]
+
+
+def summarize(results: List[dict], total: int) -> dict:
+    passed_count = 0
+    first_fail_message = ""
+    for res in results:
+        if is_accepted(res):
+            passed_count += 1
+        elif not first_fail_message:
+            first_fail_message = (res.get("status") or {}).get("description", "Test case failed")
+
+    message = first_fail_message if passed_count != total else "All selected test cases passed!"
+
+    return {
+        "passed": passed_count,
+        "total": total,
+        "evaluated": len(results),
+        "message": message,
+    }
+
+
+async def evaluate_submission(
+    problem_id: int,
+    problem_checksum: int,
+    request,
+    public_cases: List[dict],
+    hidden_cases: List[dict],
+    subset: str = "all",
+    mode: str = "full",
+    client: Optional[httpx.AsyncClient] = None,
+    owner: Hashable = None,
+    on_result: Optional[ResultCallback] = None,
+    rules: Optional[CompareRules] = None
+) -> Tuple[dict, str]:
+    """
+    Judges a submission through the verdict cache and returns
+    (summary, verdict source). Shared by the blocking submit endpoint and
+    background submission jobs; `on_result` only fires when the cases
+    actually run. Raises a 429 HTTPException when the judge is saturated
+    and a 503 while Judge0's circuit breaker is open.
+    """
+    total = len(public_cases) + len(hidden_cases)
+    rules = rules or CompareRules.for_problem(None)
+
+    async def run_judge():
+        # Backpressure: refuse before creating any judge work
+        admit_or_429(total, backend_for(request.language_id).scheduler)
+
+        try:
+            results = await judge_cases(
+                request, public_cases, hidden_cases,
+                mode=mode, client=client, owner=owner, on_result=on_result, rules=rules
+            )
+        except HTTPException as e:
+            # Busy or unavailable judge: tell the client to retry rather
+            # than reporting every case as failed
+            if e.status_code in (429, 503):
+                raise
+            failed = {
+                "passed": 0,
+                "total": total,
+                "evaluated": None,
+                "message": f"Execution failed: {e.detail}",
+            }
+            return failed, False
+
+        return summarize(results, total), cacheable_results(results)
+
+    # Identical resubmissions are answered from the verdict cache
+    key = verdict_key(problem_id, problem_checksum, request, subset, mode, rules.key)
+    return await verdict_cache.get_or_compute(key, problem_id, run_judge)
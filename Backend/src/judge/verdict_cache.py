@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from src.codeDeck.settings import settings
+from src.db.client import MongoDBClient
+
+logger = logging.getLogger(__name__)
+
+# Judge0 "Internal Error"; such verdicts say nothing about the code itself
+INTERNAL_ERROR_STATUS_ID = 13
+
+
+def normalize_source(source_code: str) -> str:
+    """
+    Canonical form of a program for cache keys: unified line endings, no
+    trailing whitespace per line and no trailing blank lines. Leading
+    whitespace is kept since it is significant in some languages.
+    """
+    lines = source_code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).rstrip("\n")
+
+
+def verdict_key(
+    problem_id: int,
+    problem_checksum: int,
+    request,
+    subset: str,
+    mode: str,
+    grading: str = ""
+) -> str:
+    """
+    Hash of everything that determines a verdict. The problem checksum
+    changes whenever the problem's line is edited, so a reload with new test
+    cases never hits an old entry; `grading` covers output comparison rules
+    that come from settings rather than the problem.
+    """
+    digest = hashlib.sha256()
+    digest.update(
+        f"{problem_id}|{problem_checksum}|{request.language_id}|{subset}|{mode}|"
+        f"{request.cpu_time_limit}|{request.memory_limit}|{grading}|".encode()
+    )
+    digest.update(normalize_source(request.source_code).encode())
+    return digest.hexdigest()
+
+
+def cacheable_results(results) -> bool:
+    return all(
+        (result.get("status") or {}).get("id") != INTERNAL_ERROR_STATUS_ID
+        for result in results
+    )
+
+
+class VerdictCache:
+    """
+    Two-tier verdict cache with request coalescing.
+
+    The first tier is a per-worker LRU bounded by the encoded size of its
+    entries. The optional second tier is a MongoDB collection shared by all
+    workers, expiring entries through a TTL index. Concurrent identical
+    submissions share one in-flight computation.
+    """
+
+    def __init__(self, max_bytes: int, use_mongo: bool = False, ttl_seconds: int = 86400):
+        self.max_bytes = max_bytes
+        self.use_mongo = use_mongo
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[dict, int]]" = OrderedDict()
+        self._bytes = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._indexes_ready = False
+
+        self.hits = 0
+        self.mongo_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    # --- Memory tier ---
+
+    def _get_local(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return dict(entry[0])
+
+    def _put_local(self, key: str, verdict: dict):
+        size = len(key) + len(json.dumps(verdict))
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (dict(verdict), size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    # --- MongoDB tier ---
+
+    def _collection(self):
+        return MongoDBClient().mongodb["verdict_cache"]
+
+    async def _ensure_indexes(self, collection):
+        if not self._indexes_ready:
+            await collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
+            await collection.create_index("problem_id")
+            self._indexes_ready = True
+
+    async def _get_remote(self, key: str) -> Optional[dict]:
+        try:
+            doc = await self._collection().find_one({"_id": key})
+        except Exception as e:
+            logger.warning(f"Verdict cache lookup failed: {e}")
+            return None
+        return doc["verdict"] if doc else None
+
+    async def _put_remote(self, key: str, problem_id: int, verdict: dict):
+        try:
+            collection = self._collection()
+            await self._ensure_indexes(collection)
+            await collection.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "problem_id": problem_id,
+                    "verdict": verdict,
+                    "created_at": datetime.now(timezone.utc),
+                },
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning(f"Verdict cache store failed: {e}")
+
+    # --- Public API ---
+
+    async def get_or_compute(
+        self,
+        key: str,
+        problem_id: int,
+        compute: Callable[[], Awaitable[Tuple[dict, bool]]]
+    ) -> Tuple[dict, str]:
+        """
+        Returns (verdict, source) where source is "memory", "mongo",
+        "coalesced" or "judge". `compute` returns (verdict, cacheable).
+        """
+        verdict = self._get_local(key)
+        if verdict is not None:
+            self.hits += 1
+            return verdict, "memory"
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            return dict(await asyncio.shield(in_flight)), "coalesced"
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            if self.use_mongo:
+                verdict = await self._get_remote(key)
+                if verdict is not None:
+                    self.mongo_hits += 1
+                    self._put_local(key, verdict)
+                    future.set_result(verdict)
+                    return dict(verdict), "mongo"
+
+            self.misses += 1
+            verdict, cacheable = await compute()
+            if cacheable:
+                self._put_local(key, verdict)
+                if self.use_mongo:
+                    await self._put_remote(key, problem_id, verdict)
+            future.set_result(verdict)
+            return dict(verdict), "judge"
+        except BaseException as e:
+            if not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    # Waiters re-raise it; mark it retrieved for the event loop
+                    future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "mongo_hits": self.mongo_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "mongo_enabled": self.use_mongo,
+        }
+
+
+verdict_cache = VerdictCache(
+    settings.VERDICT_CACHE_BYTES,
+    use_mongo=settings.VERDICT_CACHE_MONGO,
+    ttl_seconds=settings.VERDICT_CACHE_TTL,
+)
@@ -4,9 +4,12 @@ from .api.authentication import router as auth_router
 from fastapi.middleware.cors import CORSMiddleware
 
 from .db.dbutil import get_mongoDb
+from .codeDeck.settings import settings
 from .api.geeksforgeeks import router as g4g_router
 from .api.codeforces import router as cf_router
 from .api.codingPlatform import router as cp_router
+from .api.admin import router as admin_router
+from .api.profile import router as profile_router
 
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
@@ -17,6 +20,13 @@ import asyncio
 import logging
 # Import the loader
 from src.schemas.problem_loader import load_problems, problem_db, Problem, TestCase
+from src.schemas.problem_watcher import watch_problem_file
+from src.judge.client import init_judge0_client, close_judge0_client
+from src.judge.jobs import job_store
+from src.judge.languages import language_catalog
+from src.judge.local_engine import local_engine
+from src.platforms.http import init_platform_client, close_platform_client
+from src.platforms.codeforces_sync import codeforces_sync
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -37,22 +47,65 @@ async def lifespan(app: FastAPI):
    # Load problems into memory
    current_dir = os.path.dirname(os.path.abspath(__file__))
    file_path = os.path.join(current_dir, "schemas", "problems.jsonl")
-   load_problems(file_path)
+   load_problems(
+       file_path,
+       cache_size=settings.PROBLEM_CACHE_SIZE,
+       use_snapshot=settings.PROBLEM_SNAPSHOT_ENABLED
+   )
+   app.problems_path = file_path
+
+   # Pick up edits to problems.jsonl without a restart
+   watcher = None
+   if settings.PROBLEM_RELOAD_INTERVAL > 0:
+       watcher = asyncio.create_task(watch_problem_file(file_path, settings.PROBLEM_RELOAD_INTERVAL))
     
    # Initialize MongoDB connection
    mongodb = await get_mongoDb()
    app.mongodb = mongodb
+
+   # One pooled HTTP client for all Judge0 traffic
+   app.judge0_client = await init_judge0_client()
+
+   # Untrusted code only runs on this host inside the configured sandbox
+   if settings.EXECUTION_LOCAL_LANGUAGES.strip() and not local_engine.enabled:
+       logger.error(
+           "EXECUTION_LOCAL_LANGUAGES is set but EXECUTION_LOCAL_SANDBOX is not: "
+           "local execution is disabled and those languages are judged by Judge0"
+       )
+   elif local_engine.enabled and not local_engine.sandbox:
+       logger.warning("Local execution runs submitted code without a sandbox (EXECUTION_LOCAL_ALLOW_UNSANDBOXED)")
+
+   # Language list for /languages and request validation
+   await language_catalog.refresh()
+
+   # Shared async client for Codeforces / GeeksforGeeks
+   await init_platform_client()
+
+   # Keep recently viewed Codeforces histories up to date
+   cf_sync = None
+   if settings.CODEFORCES_SYNC_INTERVAL > 0:
+       cf_sync = asyncio.create_task(codeforces_sync.run_loop(settings.CODEFORCES_SYNC_INTERVAL))
     
    yield
     
    # Clean up resources if needed on shutdown
    # (e.g., close database connections)
+   if watcher is not None:
+       watcher.cancel()
+   if cf_sync is not None:
+       cf_sync.cancel()
+   await job_store.shutdown()
+   await close_judge0_client()
+   await close_platform_client()
+   local_engine.shutdown()
 
 app=FastAPI(lifespan=lifespan)
 app.include_router(auth_router)
 app.include_router(g4g_router)
 app.include_router(cf_router)
 app.include_router(cp_router)
+app.include_router(admin_router)
+app.include_router(profile_router)
 
 app.add_middleware(
     CORSMiddleware,
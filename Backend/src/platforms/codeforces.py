@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import re
+from functools import partial
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from src.codeDeck.settings import settings
+from src.platforms.governor import BACKGROUND, RateGovernor, Throttled, current_priority
+from src.platforms.http import get_platform_client
+from src.utils.cache import AsyncTTLCache, CacheEntry
+
+logger = logging.getLogger(__name__)
+
+NOT_FOUND_HANDLE = re.compile(r"handle (\S+) not found")
+
+codeforces_governor = RateGovernor(
+    "codeforces",
+    settings.CODEFORCES_RATE_LIMIT,
+    settings.CODEFORCES_RATE_BURST,
+    settings.PLATFORM_MAX_QUEUE_WAIT,
+    settings.PLATFORM_BACKGROUND_MAX_QUEUE_WAIT,
+)
+
+
+class CodeforcesError(Exception):
+    """A Codeforces API call without a result; `status_code` is what to answer with."""
+
+    def __init__(self, message: str, status_code: int = 502):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+async def call_api(method: str, params: Dict[str, Any], priority: Optional[int] = None) -> Any:
+    """
+    Calls one Codeforces API method and returns its `result`. Calls are paced
+    by codeforces_governor; one it sheds fails with a 503 like a throttled call.
+    """
+    try:
+        await codeforces_governor.acquire(priority)
+    except Throttled as e:
+        raise CodeforcesError(str(e), 503) from e
+    try:
+        resp = await get_platform_client().get(f"{settings.CODEFORCES_API_URL}/{method}", params=params)
+    except httpx.HTTPError as e:
+        raise CodeforcesError(f"Codeforces is unreachable: {e!r}", 503)
+
+    try:
+        data = resp.json()
+    except ValueError:
+        data = {}
+    if data.get("status") == "OK":
+        codeforces_governor.reward()
+        return data["result"]
+
+    comment = data.get("comment") or f"HTTP {resp.status_code}"
+    if "not found" in comment:
+        raise CodeforcesError(comment, 404)
+    # Codeforces answers "Call limit exceeded" (HTTP 503) or a plain 429 when throttling us
+    throttled = resp.status_code in (429, 503) or "limit exceeded" in comment.lower()
+    if throttled:
+        codeforces_governor.penalize(f"{method}: {comment}")
+    logger.warning(f"Codeforces {method} failed: {comment}")
+    if not data:
+        raise CodeforcesError(f"Unexpected Codeforces response (HTTP {resp.status_code})", 503 if throttled else 502)
+    raise CodeforcesError(f"Codeforces API error: {comment}", 503 if throttled else 502)
+
+
+class UserInfoBatcher:
+    """
+    Groups user.info lookups into multi-handle calls.
+
+    Handles requested within `window` seconds of the first one (or until
+    `max_handles` are waiting) go upstream as one semicolon-joined call, and
+    each caller gets its own user back. Codeforces fails the whole call when
+    one handle does not exist; that handle's callers get a 404 and the call
+    is repeated for the rest. Any other failure is retried as two halves, so
+    one bad handle or one failed call does not fail everyone batched with
+    it: bad answers (502) are split down to the handle that causes them,
+    timeouts and throttling (503) are retried once per half.
+    """
+
+    def __init__(self, window: float, max_handles: int):
+        self.window = window
+        self.max_handles = max(1, max_handles)
+        self._pending: Dict[str, Tuple[str, List[asyncio.Future]]] = {}
+        # A batch is as urgent as its most urgent caller
+        self._priority = BACKGROUND
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+        self.lookups = 0
+        self.calls = 0
+        self.splits = 0
+        self.largest_batch = 0
+
+    async def load(self, handle: str) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        key = handle.lower()
+        if key in self._pending:
+            self._pending[key][1].append(future)
+        else:
+            self._pending[key] = (handle, [future])
+        self._priority = min(self._priority, current_priority())
+        self.lookups += 1
+
+        if len(self._pending) >= self.max_handles:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        priority, self._priority = self._priority, BACKGROUND
+        if batch:
+            self.largest_batch = max(self.largest_batch, len(batch))
+            # The loop only keeps weak references to tasks
+            task = asyncio.create_task(self._run(batch, priority))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _call(self, batch: Dict[str, Tuple[str, List[asyncio.Future]]], priority: int) -> Optional[Exception]:
+        """Resolves the batch's callers with one call; returns the error if the call failed."""
+        while batch:
+            handles = [handle for handle, _ in batch.values()]
+            self.calls += 1
+            try:
+                users = await call_api("user.info", {"handles": ";".join(handles)}, priority)
+            except Exception as e:
+                match = NOT_FOUND_HANDLE.search(str(e)) if isinstance(e, CodeforcesError) else None
+                missing = match and batch.pop(match.group(1).lower(), None)
+                if missing:
+                    self._resolve(missing[1], error=CodeforcesError(f"User with handle {missing[0]} not found", 404))
+                    continue
+                return e
+
+            # Results come in request order; renamed handles answer under their new name
+            for (_, futures), user in zip(batch.values(), users):
+                self._resolve(futures, user)
+            for handle, futures in list(batch.values())[len(users):]:
+                self._resolve(futures, error=CodeforcesError(f"User with handle {handle} not found", 404))
+            return None
+        return None
+
+    async def _run(
+        self,
+        batch: Dict[str, Tuple[str, List[asyncio.Future]]],
+        priority: int,
+        retry_unavailable: bool = True
+    ):
+        error = await self._call(batch, priority)
+        if error is None:
+            return
+        unavailable = getattr(error, "status_code", 502) == 503
+        # Calls the governor shed would only be shed again
+        shed = isinstance(error.__cause__, Throttled)
+        if len(batch) > 1 and not shed and (retry_unavailable or not unavailable):
+            self.splits += 1
+            items = list(batch.items())
+            half = len(items) // 2
+            await asyncio.gather(
+                self._run(dict(items[:half]), priority, retry_unavailable and not unavailable),
+                self._run(dict(items[half:]), priority, retry_unavailable and not unavailable),
+            )
+            return
+        for _, futures in batch.values():
+            self._resolve(futures, error=error)
+
+    @staticmethod
+    def _resolve(futures: List[asyncio.Future], user: Optional[dict] = None, error: Optional[Exception] = None):
+        for future in futures:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(user)
+
+    def stats(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "calls": self.calls,
+            "handles_per_call": round(self.lookups / self.calls, 1) if self.calls else 0,
+            "splits": self.splits,
+            "largest_batch": self.largest_batch,
+            "waiting": len(self._pending),
+        }
+
+
+class CodeforcesClient:
+    """
+    Cached access to the Codeforces user API.
+
+    Every method has its own TTL cache keyed by handle (case-insensitive,
+    like Codeforces itself). Fresh entries are served without an upstream
+    call, stale ones are served while one background call refreshes them,
+    and concurrent misses for the same handle share a single call. Misses
+    of user.info across handles are batched into multi-handle calls.
+    """
+
+    def __init__(self):
+        def cache(ttl: float, name: str) -> AsyncTTLCache:
+            return AsyncTTLCache(ttl, settings.CODEFORCES_STALE_TTL, settings.CODEFORCES_CACHE_SIZE, name)
+
+        self._caches = {
+            "user.info": cache(settings.CODEFORCES_INFO_TTL, "codeforces user.info"),
+            "user.rating": cache(settings.CODEFORCES_RATING_TTL, "codeforces user.rating"),
+        }
+        self._info_batcher = UserInfoBatcher(settings.CODEFORCES_INFO_BATCH_WINDOW, settings.CODEFORCES_INFO_BATCH_SIZE)
+
+    async def _get(self, method: str, key: tuple, params: Dict[str, Any]) -> Any:
+        return await self._caches[method].get(key, partial(call_api, method, params))
+
+    async def user_info(self, handle: str) -> dict:
+        return await self._caches["user.info"].get((handle.lower(),), partial(self._info_batcher.load, handle))
+
+    async def users_info(self, handles: List[str]) -> Tuple[List[dict], List[str]]:
+        """The users behind `handles`, and the handles that do not exist."""
+        results = await asyncio.gather(*(self.user_info(handle) for handle in handles), return_exceptions=True)
+        users, not_found = [], []
+        for handle, result in zip(handles, results):
+            if isinstance(result, CodeforcesError) and result.status_code == 404:
+                not_found.append(handle)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                users.append(result)
+        return users, not_found
+
+    async def user_rating(self, handle: str) -> List[dict]:
+        return await self._get("user.rating", (handle.lower(),), {"handle": handle})
+
+    def cached(self, method: str, handle: str) -> Optional[CacheEntry]:
+        """The last result of a per-handle method, however old, without calling Codeforces."""
+        return self._caches[method].peek((handle.lower(),))
+
+    def stats(self) -> dict:
+        stats = {method: cache.stats() for method, cache in self._caches.items()}
+        stats["user.info batches"] = self._info_batcher.stats()
+        stats["governor"] = codeforces_governor.stats()
+        return stats
+
+
+codeforces_client = CodeforcesClient()
@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pymongo import ASCENDING, DESCENDING, ReplaceOne
+
+from src.codeDeck.settings import settings
+from src.db.client import MongoDBClient
+from src.platforms.codeforces import call_api
+from src.platforms.governor import background_priority
+
+logger = logging.getLogger(__name__)
+
+SUBMISSIONS = "cf_submissions"
+SYNC_STATE = "cf_sync_state"
+# Verdicts that can still change on a later sync
+PENDING_VERDICTS = (None, "TESTING")
+
+
+class CodeforcesSync:
+    """
+    Keeps each handle's Codeforces submissions in MongoDB.
+
+    A sync walks user.status from the newest submission down and stops at
+    the first page reaching the handle's watermark: the highest id below
+    which every stored submission has a final verdict. So a sync costs one
+    call for most handles, and the full history is only fetched once.
+    Pages are stored as they arrive and the walk's position is saved after
+    each one, so a sync that fails midway resumes where it stopped.
+    Status views read from the store; syncs per handle are coalesced, and
+    a handle's first view only waits for the newest page.
+    """
+
+    def __init__(self):
+        self._running: Dict[str, asyncio.Task] = {}
+        # Set once a running sync has stored its first page
+        self._first_page: Dict[str, asyncio.Event] = {}
+        # The loop only keeps weak references to tasks
+        self._background: Set[asyncio.Task] = set()
+        self._indexes_ready = False
+        self.syncs = 0
+        self.upstream_calls = 0
+        self.stored = 0
+        self.errors = 0
+
+    # --- Storage ---
+
+    def _db(self):
+        return MongoDBClient().mongodb
+
+    async def _ensure_indexes(self):
+        if not self._indexes_ready:
+            await self._db()[SUBMISSIONS].create_index(
+                [("handle", ASCENDING), ("id", DESCENDING)], unique=True
+            )
+            self._indexes_ready = True
+
+    async def state(self, handle: str) -> Optional[dict]:
+        return await self._db()[SYNC_STATE].find_one({"_id": handle.lower()})
+
+    # --- Sync ---
+
+    async def _save_progress(self, key: str, fields: dict, unset: Optional[dict] = None):
+        update = {"$set": fields, "$setOnInsert": {"viewed_at": time.time()}}
+        if unset:
+            update["$unset"] = unset
+        await self._db()[SYNC_STATE].update_one({"_id": key}, update, upsert=True)
+
+    async def _sync(self, handle: str, first_page: asyncio.Event) -> dict:
+        key = handle.lower()
+        await self._ensure_indexes()
+        state = await self.state(key) or {}
+        watermark = state.get("watermark", 0)
+        # Left by a sync that failed midway: the newest `stored` submissions
+        # from `top` down are already in the store, so this walk skips them
+        resume = state.get("resume")
+        page_size = max(1, settings.CODEFORCES_SYNC_PAGE_SIZE)
+
+        pending: List[int] = [resume["pending"]] if resume and resume.get("pending") else []
+        top = resume["top"] if resume else None
+        stored = 0
+        start = 1
+        while True:
+            page = await call_api("user.status", {"handle": handle, "from": start, "count": page_size})
+            self.upstream_calls += 1
+            fresh = [s for s in page if s.get("id", 0) > watermark]
+            if fresh:
+                # Each page is stored as it arrives, so a later failure keeps it
+                await self._db()[SUBMISSIONS].bulk_write(
+                    [ReplaceOne({"handle": key, "id": s["id"]}, dict(s, handle=key), upsert=True) for s in fresh],
+                    ordered=False,
+                )
+                stored += len(fresh)
+                pending.extend(s["id"] for s in fresh if s.get("verdict") in PENDING_VERDICTS)
+                if start == 1:
+                    top = fresh[0]["id"]
+            first_page.set()
+            if len(page) < page_size or len(fresh) < len(page):
+                break
+
+            next_start = start + len(page)
+            if resume is not None:
+                reached = next((i for i, s in enumerate(page) if s.get("id", 0) <= resume["top"]), None)
+                if reached is not None:
+                    next_start = max(next_start, start + reached + resume["stored"])
+                    resume = None
+            start = next_start
+            await self._save_progress(
+                key, {"resume": {"top": top, "stored": start - 1, "pending": min(pending) if pending else None}}
+            )
+
+        if pending:
+            # Pending submissions stay above the watermark so the next sync refetches them
+            watermark = min(pending) - 1
+        elif top is not None:
+            watermark = max(watermark, top)
+
+        await self._save_progress(key, {"watermark": watermark, "synced_at": time.time()}, unset={"resume": ""})
+        self.syncs += 1
+        self.stored += stored
+        logger.info(f"Synced {stored} Codeforces submissions of {handle}")
+        return {"handle": key, "stored": stored, "watermark": watermark}
+
+    def _start(self, handle: str) -> Tuple[asyncio.Task, asyncio.Event]:
+        """The running sync of `handle`, started if there is none."""
+        key = handle.lower()
+        task = self._running.get(key)
+        if task is None:
+            first_page = asyncio.Event()
+            task = asyncio.create_task(self._sync(handle, first_page))
+            self._running[key] = task
+            self._first_page[key] = first_page
+
+            def finished(_):
+                self._running.pop(key, None)
+                self._first_page.pop(key, None)
+            task.add_done_callback(finished)
+        return task, self._first_page[key]
+
+    def syncing(self, handle: str) -> bool:
+        return handle.lower() in self._running
+
+    async def sync(self, handle: str) -> dict:
+        """Syncs `handle` now, joining a sync of the same handle already running."""
+        task, _ = self._start(handle)
+        return await asyncio.shield(task)
+
+    async def sync_first_page(self, handle: str):
+        """
+        Starts (or joins) a sync of `handle` and returns once its newest page
+        is stored; the rest of the history keeps syncing in the background.
+        """
+        task, first_page = self._start(handle)
+        stored = asyncio.ensure_future(first_page.wait())
+        try:
+            await asyncio.wait({task, stored}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stored.cancel()
+        if task.done():
+            task.result()
+            return
+
+        def finished(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is not None:
+                self.errors += 1
+                logger.warning(f"Background Codeforces sync of {handle} failed: {task.exception()}")
+        task.add_done_callback(finished)
+
+    def sync_in_background(self, handle: str):
+        async def run():
+            try:
+                with background_priority():
+                    await self.sync(handle)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Background Codeforces sync of {handle} failed: {e}")
+        if handle.lower() not in self._running:
+            task = asyncio.create_task(run())
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def ensure_synced(self, handle: str):
+        """
+        Called on each status view: the first view of a handle waits for the
+        newest page of its initial sync (the full history can take many
+        paced calls), later views refresh it in the background once it is
+        older than CODEFORCES_SYNC_MAX_AGE.
+        """
+        key = handle.lower()
+        state = await self.state(key)
+        if state is None:
+            await self.sync_first_page(handle)
+            return
+        await self._db()[SYNC_STATE].update_one({"_id": key}, {"$set": {"viewed_at": time.time()}})
+        if time.time() - state.get("synced_at", 0) > settings.CODEFORCES_SYNC_MAX_AGE:
+            self.sync_in_background(handle)
+
+    async def run_loop(self, interval: float):
+        """
+        Periodically re-syncs the handles viewed within the last day whose
+        history is out of date, CODEFORCES_SYNC_BATCH per round.
+        """
+        logger.info(f"Syncing Codeforces submissions every {interval}s")
+        while True:
+            await asyncio.sleep(interval)
+            now = time.time()
+            try:
+                cursor = self._db()[SYNC_STATE].find(
+                    {"viewed_at": {"$gte": now - 86400}, "synced_at": {"$lt": now - settings.CODEFORCES_SYNC_MAX_AGE}},
+                    {"_id": 1},
+                ).sort("synced_at", ASCENDING).limit(settings.CODEFORCES_SYNC_BATCH)
+                handles = [doc["_id"] async for doc in cursor]
+            except Exception as e:
+                logger.error(f"Could not list Codeforces handles to sync: {e}")
+                continue
+            for handle in handles:
+                try:
+                    with background_priority():
+                        await self.sync(handle)
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning(f"Codeforces sync of {handle} failed: {e}")
+
+    # --- Queries ---
+
+    async def submissions(
+        self,
+        handle: str,
+        verdict: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        before: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        One page of stored submissions, newest first. `before` (a submission
+        id from the previous page's `next_before`) pages without skipping
+        over earlier results; `page` is the simple offset alternative.
+        """
+        query: Dict[str, Any] = {"handle": handle.lower()}
+        if verdict:
+            query["verdict"] = verdict
+        if tags:
+            query["problem.tags"] = {"$all": tags}
+        if since is not None or until is not None:
+            query["creationTimeSeconds"] = {}
+            if since is not None:
+                query["creationTimeSeconds"]["$gte"] = since
+            if until is not None:
+                query["creationTimeSeconds"]["$lt"] = until
+        if before is not None:
+            query["id"] = {"$lt": before}
+
+        cursor = self._db()[SUBMISSIONS].find(query, {"_id": 0, "handle": 0}).sort("id", DESCENDING)
+        if before is None and page > 1:
+            cursor = cursor.skip((page - 1) * page_size)
+        # One extra row tells whether there is a next page
+        rows = [doc async for doc in cursor.limit(page_size + 1)]
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        return {
+            "submissions": rows,
+            "page_size": page_size,
+            "has_more": has_more,
+            "next_before": rows[-1]["id"] if has_more else None,
+        }
+
+    def stats(self) -> dict:
+        return {
+            "syncs": self.syncs,
+            "running": len(self._running),
+            "upstream_calls": self.upstream_calls,
+            "stored": self.stored,
+            "errors": self.errors,
+        }
+
+
+codeforces_sync = CodeforcesSync()
@@ -0,0 +1,110 @@
+import json
+import logging
+from functools import partial
+from typing import Optional
+
+import httpx
+
+from src.codeDeck.settings import settings
+from src.platforms.governor import RateGovernor, Throttled
+from src.platforms.http import get_platform_client
+from src.utils.cache import AsyncTTLCache, CacheEntry
+
+logger = logging.getLogger(__name__)
+
+NEXT_DATA_ID = b'id="__NEXT_DATA__"'
+
+gfg_governor = RateGovernor(
+    "geeksforgeeks",
+    settings.GFG_RATE_LIMIT,
+    settings.GFG_RATE_BURST,
+    settings.PLATFORM_MAX_QUEUE_WAIT,
+    settings.PLATFORM_BACKGROUND_MAX_QUEUE_WAIT,
+)
+
+
+class GfgError(Exception):
+    """A profile that could not be fetched or read; `status_code` is what to answer with."""
+
+    def __init__(self, message: str, status_code: int = 502):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def extract_next_data(html: bytes) -> dict:
+    """
+    The `__NEXT_DATA__` JSON of a Next.js page. Finds the script tag with a
+    few byte searches and decodes only its body, instead of building a DOM
+    of the whole page.
+    """
+    marker = html.find(NEXT_DATA_ID)
+    if marker < 0 or html.rfind(b"<script", 0, marker) < 0:
+        raise GfgError("Profile page has no __NEXT_DATA__ script")
+    start = html.find(b">", marker) + 1
+    end = html.find(b"</script>", start)
+    if start <= 0 or end < 0:
+        raise GfgError("Profile page has a truncated __NEXT_DATA__ script")
+    try:
+        return json.loads(html[start:end])
+    except ValueError as e:
+        raise GfgError(f"Unreadable __NEXT_DATA__ JSON: {e}")
+
+
+def parse_profile(html: bytes) -> dict:
+    """The parts of a profile page the API uses: userInfo and userSubmissionsInfo."""
+    page_props = extract_next_data(html).get("props", {}).get("pageProps", {})
+    user_info = page_props.get("userInfo")
+    if not user_info:
+        raise GfgError("User not found", 404)
+    return {
+        "userInfo": user_info,
+        "userSubmissionsInfo": page_props.get("userSubmissionsInfo") or {},
+    }
+
+
+async def fetch_profile(username: str) -> dict:
+    url = settings.GFG_PROFILE_URL.format(username=username)
+    try:
+        await gfg_governor.acquire()
+    except Throttled as e:
+        raise GfgError(str(e), 503)
+    try:
+        resp = await get_platform_client().get(url)
+    except httpx.HTTPError as e:
+        raise GfgError(f"GeeksforGeeks is unreachable: {e!r}", 503)
+    if resp.status_code == 404:
+        raise GfgError("User not found", 404)
+    # GeeksforGeeks blocks scrapers with 429 or 403 pages
+    if resp.status_code in (403, 429):
+        gfg_governor.penalize(f"profile {username} answered HTTP {resp.status_code}")
+        raise GfgError(f"GeeksforGeeks answered HTTP {resp.status_code}", 503)
+    if resp.status_code != 200:
+        logger.warning(f"GeeksforGeeks profile {username} answered HTTP {resp.status_code}")
+        raise GfgError(f"GeeksforGeeks answered HTTP {resp.status_code}", 502)
+    gfg_governor.reward()
+    return parse_profile(resp.content)
+
+
+class GfgClient:
+    """
+    Parsed GeeksforGeeks profiles, one cache entry per username shared by
+    every endpoint, with stale-while-revalidate and coalesced fetches.
+    """
+
+    def __init__(self):
+        self._cache: AsyncTTLCache[dict] = AsyncTTLCache(
+            settings.GFG_CACHE_TTL, settings.GFG_STALE_TTL, settings.GFG_CACHE_SIZE, "geeksforgeeks profiles"
+        )
+
+    async def profile(self, username: str) -> dict:
+        return await self._cache.get(username, partial(fetch_profile, username))
+
+    def cached(self, username: str) -> Optional[CacheEntry]:
+        """The last parsed profile of `username`, however old, without fetching."""
+        return self._cache.peek(username)
+
+    def stats(self) -> dict:
+        return {"profiles": self._cache.stats(), "governor": gfg_governor.stats()}
+
+
+gfg_client = GfgClient()
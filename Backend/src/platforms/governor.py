@@ -0,0 +1,176 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.utils.cache import refreshing_in_background
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+_background: ContextVar[bool] = ContextVar("platform_background", default=False)
+
+
+@contextmanager
+def background_priority():
+    """Upstream calls made inside this block queue behind interactive ones."""
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+def current_priority() -> int:
+    # Cache refreshes serve nobody who is waiting, so they count as background too
+    if _background.get() or refreshing_in_background.get():
+        return BACKGROUND
+    return INTERACTIVE
+
+
+class Throttled(Exception):
+    """Raised instead of queueing when the wait for a token would exceed the caller's budget."""
+
+    def __init__(self, upstream: str, wait: float):
+        super().__init__(f"{upstream} request rate exceeded, next slot in {wait:.1f}s")
+        self.wait = wait
+
+
+class RateGovernor:
+    """
+    Paces calls to one upstream with a token bucket.
+
+    `rate` tokens per second refill a bucket of `burst`. A call takes a token
+    right away when one is free and nobody is queued; otherwise it waits in a
+    priority queue where interactive calls go before background ones. A call
+    whose expected wait exceeds its priority's budget is rejected with
+    Throttled, so callers can fall back to cached data.
+
+    penalize() (on 429s or rate-limit answers) halves the rate and empties
+    the bucket; every success then adds back a tenth of the configured rate.
+    A rate of 0 disables pacing.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_wait: float, background_max_wait: float):
+        self.name = name
+        self.base_rate = rate
+        self.rate = rate
+        self.min_rate = rate / 16
+        self.burst = max(1, burst)
+        self.max_wait = {INTERACTIVE: max_wait, BACKGROUND: background_max_wait}
+        self.tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._queue: List[Tuple[int, int, asyncio.Future, float]] = []
+        self._seq = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        self.granted = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.shed = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.penalties = 0
+        self._waits: Dict[int, Deque[float]] = {INTERACTIVE: deque(maxlen=512), BACKGROUND: deque(maxlen=512)}
+
+    # --- Tokens ---
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _expected_wait(self, priority: int) -> float:
+        ahead = sum(1 for queued, *_ in self._queue if queued <= priority)
+        return max(0.0, (ahead + 1 - self.tokens) / self.rate)
+
+    def _grant(self, priority: int, waited: float):
+        self.tokens -= 1
+        self.granted[priority] += 1
+        self._waits[priority].append(waited)
+
+    async def acquire(self, priority: Optional[int] = None):
+        if self.base_rate <= 0:
+            return
+        if priority is None:
+            priority = current_priority()
+        self._refill()
+        if not self._queue and self.tokens >= 1:
+            self._grant(priority, 0.0)
+            return
+
+        wait = self._expected_wait(priority)
+        if wait > self.max_wait[priority]:
+            self.shed[priority] += 1
+            raise Throttled(self.name, wait)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._seq), future, time.monotonic()))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        while self._queue:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                continue
+            priority, _, future, queued_at = heapq.heappop(self._queue)
+            # Callers that gave up (cancelled) do not use a token
+            if future.done():
+                continue
+            self._grant(priority, time.monotonic() - queued_at)
+            future.set_result(None)
+
+    # --- Feedback ---
+
+    def penalize(self, reason: str):
+        if self.base_rate <= 0:
+            return
+        self._refill()
+        self.penalties += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+        logger.warning(f"{self.name}: {reason}, slowing down to {self.rate:.2f} requests/s")
+
+    def reward(self):
+        if self.rate < self.base_rate:
+            self._refill()
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 10)
+
+    # --- Stats ---
+
+    def stats(self) -> dict:
+        if self.base_rate > 0:
+            self._refill()
+
+        def waits(samples: Deque[float]) -> dict:
+            if not samples:
+                return {"samples": 0}
+            ordered = sorted(samples)
+            return {
+                "samples": len(ordered),
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+                "max_ms": round(ordered[-1] * 1000, 1),
+            }
+
+        return {
+            "rate": round(self.rate, 3),
+            "base_rate": self.base_rate,
+            "burst": self.burst,
+            "tokens": round(self.tokens, 2),
+            "penalties": self.penalties,
+            "queued": {
+                name: sum(1 for queued, _, future, _ in self._queue if queued == priority and not future.done())
+                for priority, name in PRIORITY_NAMES.items()
+            },
+            "granted": {name: self.granted[priority] for priority, name in PRIORITY_NAMES.items()},
+            "shed": {name: self.shed[priority] for priority, name in PRIORITY_NAMES.items()},
+            "queue_wait": {name: waits(self._waits[priority]) for priority, name in PRIORITY_NAMES.items()},
+        }
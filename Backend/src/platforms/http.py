@@ -0,0 +1,37 @@
+import httpx
+
+from src.codeDeck.settings import settings
+from src.utils.shared_client import SharedClient
+
+USER_AGENT = "Mozilla/5.0"
+
+
+def create_platform_client() -> httpx.AsyncClient:
+    """
+    Builds the pooled client used for all Codeforces and GeeksforGeeks
+    traffic, so those requests never block the event loop.
+    """
+    return httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT},
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=settings.PLATFORM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.PLATFORM_MAX_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(settings.PLATFORM_HTTP_TIMEOUT),
+    )
+
+
+_shared = SharedClient(create_platform_client)
+
+
+async def init_platform_client() -> httpx.AsyncClient:
+    return _shared.get()
+
+
+async def close_platform_client():
+    await _shared.close()
+
+
+def get_platform_client() -> httpx.AsyncClient:
+    return _shared.get()
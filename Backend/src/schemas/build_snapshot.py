@@ -0,0 +1,47 @@
+# build_snapshot.py
+"""
+Prebuilds the binary problem snapshot so workers can skip parsing at startup.
+
+Usage (from the Backend directory):
+    python -m src.schemas.build_snapshot [path/to/problems.jsonl] [--check]
+"""
+import argparse
+import logging
+import os
+import sys
+
+from .problem_loader import allow_large_int_strings, build_snapshot
+from .problem_snapshot import SnapshotError, open_snapshot, snapshot_path_for
+
+DEFAULT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "problems.jsonl")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build the problem catalog snapshot.")
+    parser.add_argument("source", nargs="?", default=DEFAULT_SOURCE, help="problems.jsonl to snapshot")
+    parser.add_argument("-o", "--output", help="snapshot path (default: <source>.snap)")
+    parser.add_argument(
+        "--check", action="store_true",
+        help="only verify that an up-to-date snapshot exists; exit 1 otherwise"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    snapshot_path = args.output or snapshot_path_for(args.source)
+
+    if args.check:
+        try:
+            open_snapshot(snapshot_path, args.source)
+        except SnapshotError as e:
+            print(f"Snapshot {snapshot_path} is not usable: {e}", file=sys.stderr)
+            return 1
+        print(f"Snapshot {snapshot_path} is up to date")
+        return 0
+
+    allow_large_int_strings()
+    build_snapshot(args.source, snapshot_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
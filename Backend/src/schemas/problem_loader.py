@@ -1,9 +1,18 @@
 # problem_loader.py
+import hashlib
 import json
 import logging
 import re
 import sys
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from typing import List, Dict, Any, Optional, Set
+
+from .problem_store import ProblemStore, ProblemRecord, CatalogState, DEFAULT_CACHE_SIZE
+from .problem_search import SearchIndex, SearchIndexBuilder
+from .problem_snapshot import (
+    Snapshot, SnapshotError, SnapshotWriter, open_snapshot, snapshot_path_for, source_info
+)
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +21,19 @@ class TestCase(dict):
     input: str
     output: str
 
+    def json_fragment(self) -> bytes:
+        """
+        The case's `"stdin":...` Judge0 payload member as JSON bytes.
+        Expected outputs are graded locally and never sent. Encoded on first
+        use and kept for as long as the decoded problem stays in the store's
+        cache, so resubmissions only reuse the bytes.
+        """
+        fragment = self.__dict__.get("_fragment")
+        if fragment is None:
+            fragment = self._fragment = b'"stdin":' + json.dumps(self['input']).encode()
+        return fragment
+
+
 class Problem(dict):
     """Simple wrapper for problem data."""
     id: int
@@ -20,10 +42,23 @@ class Problem(dict):
     difficulty: str
     public_cases: List[TestCase]
     hidden_cases: List[TestCase]
+    checker: Optional[Dict[str, Any]]  # output comparison rules, see judge.checker
 
-# This is the original dictionary that main.py imports a reference to.
+# This is the original store that main.py imports a reference to.
 # We MUST NOT re-assign this variable. We must modify it in-place.
-problem_db: Dict[int, Problem] = {}
+problem_db: ProblemStore = ProblemStore()
+
+def normalize_output(text: str) -> str:
+    """
+    Canonical form of an expected output, so grading can compare against it
+    as-is: LF line endings, no trailing whitespace on any line and none at
+    either end of the text.
+    """
+    text = text.strip()
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(line.rstrip() for line in text.split("\n"))
+
 
 def parse_examples_from_question(question_text: str) -> List[TestCase]:
     """
@@ -46,7 +81,7 @@ def parse_examples_from_question(question_text: str) -> List[TestCase]:
 
     for inp, outp in matches:
         public_cases.append(
-            TestCase(input=inp.strip(), output=outp.strip())
+            TestCase(input=inp.strip(), output=normalize_output(outp))
         )
         
     return public_cases
@@ -100,7 +135,7 @@ def parse_hidden_case_from_io(io_string: str) -> List[TestCase]:
 
                 if inp_str or outp_str: 
                     parsed_cases.append(
-                        TestCase(input=inp_str.strip(), output=outp_str.strip())
+                        TestCase(input=inp_str.strip(), output=normalize_output(outp_str))
                     )
         
         return parsed_cases
@@ -113,71 +148,371 @@ def parse_hidden_case_from_io(io_string: str) -> List[TestCase]:
     return []
 
 
-def load_problems(file_path: str = "problems.jsonl"):
+def line_checksum(line: bytes) -> int:
+    """64-bit fingerprint of one source line (line ending excluded)."""
+    return int.from_bytes(hashlib.blake2b(line.rstrip(b"\r\n"), digest_size=8).digest(), "little")
+
+
+def extract_title(problem_id: int, question_text: str) -> str:
+    """
+    Uses the first line of the question as the title.
+    """
+    lines = question_text.strip().split('\n')
+    if lines:
+        title = lines[0].strip()
+        # Truncate if it's essentially the whole paragraph
+        if len(title) > 100:
+            title = title[:97] + "..."
+    else:
+        title = f"Problem {problem_id}"
+    return title
+
+
+def build_problem(data: Dict[str, Any]) -> Problem:
+    """
+    Builds a full Problem (examples and hidden cases included) from one
+    decoded JSONL entry.
+    """
+    problem_id = int(data['id'])
+    question_text = data.get('question', '')
+
+    public_cases = parse_examples_from_question(question_text)
+    hidden_cases = parse_hidden_case_from_io(data.get('input_output', '{}'))
+
+    return Problem(
+        id=problem_id,
+        title=extract_title(problem_id, question_text),
+        question=question_text,
+        difficulty=data.get('difficulty', 'Medium'),
+        public_cases=public_cases,
+        hidden_cases=hidden_cases,
+        checker=data.get('checker')
+    )
+
+
+class StaleRecordError(LookupError):
+    """Raised when a record's bytes on disk no longer match its checksum."""
+
+
+class JsonlProblemReader:
+    """
+    Decodes a single problem from its byte range in the source .jsonl file.
+    The file is opened per read so it can be replaced on disk.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def __call__(self, record: ProblemRecord) -> Problem:
+        with open(self.file_path, 'rb') as f:
+            f.seek(record.offset)
+            line = f.read(record.length)
+        if record.checksum and line_checksum(line) != record.checksum:
+            raise StaleRecordError(f"Problem {record.id} changed on disk since it was indexed")
+        return build_problem(json.loads(line))
+
+
+class OverlayProblemReader:
+    """
+    Serves problems added or changed by an incremental reload from their
+    line in the .jsonl file and falls back to the base reader (the snapshot)
+    for everything else. Only the ids are kept, so decoded problems stay
+    within the store's LRU like any other.
+    """
+
+    def __init__(self, base, source: JsonlProblemReader, ids: Set[int]):
+        self.base = base
+        self.source = source
+        self.ids = ids
+
+    def __call__(self, record: ProblemRecord) -> Problem:
+        if record.id in self.ids:
+            return self.source(record)
+        return self.base(record)
+
+
+def index_problems(file_path: str) -> CatalogState:
+    """
+    Scans the .jsonl file once and keeps only the summary fields plus the
+    byte range of every line, and builds the search index over the question
+    text. Examples and hidden cases are not parsed here.
     """
-    Loads problems from a .jsonl file into the in-memory problem_db.
+    records = {}
+    search = SearchIndexBuilder()
+    offset = 0
+
+    with open(file_path, 'rb') as f:
+        for line in f:
+            line_offset = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+
+            data = {}
+            try:
+                data = json.loads(line)
+                problem_id = int(data['id'])
+                question_text = data.get('question', '')
+
+                title = extract_title(problem_id, question_text)
+                records[problem_id] = ProblemRecord(
+                    id=problem_id,
+                    title=title,
+                    difficulty=data.get('difficulty', 'Medium'),
+                    offset=line_offset,
+                    length=len(line),
+                    checksum=line_checksum(line),
+                )
+                search.add(problem_id, title, question_text)
+
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed JSON line: {line[:50]}...")
+            except Exception as e:
+                logger.error(f"Error processing problem id {data.get('id', 'UNKNOWN')}: {e}")
+
+    return CatalogState(records, JsonlProblemReader(file_path), search.build())
+
+
+# --- Snapshot support ---
+
+def problem_to_blob(problem: Problem) -> Dict[str, Any]:
+    """Converts a Problem to plain builtins so it can be marshalled."""
+    blob = dict(problem)
+    blob['public_cases'] = [dict(case) for case in problem['public_cases']]
+    blob['hidden_cases'] = [dict(case) for case in problem['hidden_cases']]
+    return blob
+
+
+def problem_from_blob(blob: Dict[str, Any]) -> Problem:
+    problem = Problem(blob)
+    problem['public_cases'] = [TestCase(case) for case in blob['public_cases']]
+    problem['hidden_cases'] = [TestCase(case) for case in blob['hidden_cases']]
+    return problem
+
+
+class SnapshotProblemReader:
     """
+    Decodes a single pre-parsed problem from the memory-mapped snapshot.
+    No JSON or regex work happens on this path.
+    """
+
+    def __init__(self, snapshot: Snapshot):
+        self.snapshot = snapshot
+
+    def __call__(self, record: ProblemRecord) -> Problem:
+        return problem_from_blob(self.snapshot.read_blob(record.offset, record.length))
+
+
+def build_snapshot(file_path: str, snapshot_path: Optional[str] = None) -> str:
+    """
+    Fully parses the .jsonl file once and writes the parsed catalog as a
+    binary snapshot next to it. Returns the snapshot path.
+    """
+    snapshot_path = snapshot_path or snapshot_path_for(file_path)
+    # Capture size/mtime before reading so a concurrent edit makes the snapshot stale
+    info = source_info(file_path, sha256="")
+    digest = hashlib.sha256()
+    records = []
+    search = SearchIndexBuilder()
+
+    writer = SnapshotWriter(snapshot_path)
+    try:
+        with open(file_path, 'rb') as f:
+            for line in f:
+                digest.update(line)
+                if not line.strip():
+                    continue
+
+                data = {}
+                try:
+                    data = json.loads(line)
+                    problem = build_problem(data)
+                    offset, length = writer.add_blob(problem_to_blob(problem))
+                    records.append((
+                        problem['id'], problem['title'], problem['difficulty'],
+                        offset, length, line_checksum(line)
+                    ))
+                    search.add(problem['id'], problem['title'], problem['question'])
+
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed JSON line: {line[:50]}...")
+                except Exception as e:
+                    logger.error(f"Error processing problem id {data.get('id', 'UNKNOWN')}: {e}")
+
+        info["source_sha256"] = digest.hexdigest()
+        writer.commit({"records": records, "search": search.build().to_blob()}, info)
+    except BaseException:
+        writer.abort()
+        raise
+
+    logger.info(f"Wrote snapshot of {len(records)} problems to {snapshot_path}")
+    return snapshot_path
+
+
+def load_snapshot_state(file_path: str, snapshot_path: Optional[str] = None) -> CatalogState:
+    """
+    Builds a CatalogState from a valid snapshot. Raises SnapshotError if the
+    snapshot is missing, corrupt or stale.
+    """
+    snapshot = open_snapshot(snapshot_path or snapshot_path_for(file_path), file_path)
+    records = {}
+    for problem_id, title, difficulty, offset, length, checksum in snapshot.section("records", []):
+        records[problem_id] = ProblemRecord(problem_id, title, difficulty, offset, length, checksum)
+    search_index = SearchIndex.from_blob(snapshot.section("search"))
+    return CatalogState(records, SnapshotProblemReader(snapshot), search_index)
+
+
+def _load_state(file_path: str, use_snapshot: bool) -> CatalogState:
+    if use_snapshot:
+        snapshot_path = snapshot_path_for(file_path)
+        try:
+            state = load_snapshot_state(file_path, snapshot_path)
+            logger.info(f"Loaded problems from snapshot {snapshot_path}")
+            return state
+        except SnapshotError as e:
+            logger.info(f"Snapshot not usable ({e}), rebuilding from source")
+
+        try:
+            build_snapshot(file_path, snapshot_path)
+            return load_snapshot_state(file_path, snapshot_path)
+        except FileNotFoundError:
+            raise
+        except (OSError, SnapshotError) as e:
+            logger.warning(f"Could not write snapshot {snapshot_path}: {e}")
+
+    return index_problems(file_path)
+
+
+def allow_large_int_strings():
     try:
         sys.set_int_max_str_digits(0)
         logger.info("Set sys.set_int_max_str_digits(0) to handle large integers.")
     except Exception as e:
         logger.warning(f"Could not set int_max_str_digits: {e}")
 
-    global problem_db
+
+def load_problems(
+    file_path: str = "problems.jsonl",
+    cache_size: Optional[int] = DEFAULT_CACHE_SIZE,
+    use_snapshot: bool = True
+):
+    """
+    Loads the problem index from a .jsonl file into the in-memory problem_db.
+    Full problems are decoded lazily on first access.
+
+    When `use_snapshot` is set, a binary snapshot next to the source file is
+    used if it still matches the source, and (re)written otherwise.
+    """
+    allow_large_int_strings()
+
     logger.info(f"Loading problems from {file_path}...")
-    
-    temp_db = {}
-    
+
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        state = _load_state(file_path, use_snapshot)
+
+        # Swap the catalog in-place
+        problem_db.replace(state, cache_size=cache_size)
+
+        logger.info(f"Successfully loaded {len(problem_db)} problems.")
+
+    except FileNotFoundError:
+        logger.error(f"FATAL: Problem file '{file_path}' not found.")
+    except Exception as e:
+        logger.error(f"FATAL: Could not load problems: {e}")
+
+
+# --- Incremental reload ---
+
+_reload_lock = threading.Lock()
+
+
+def reload_problems(file_path: str) -> Dict[str, Any]:
+    """
+    Re-reads the .jsonl file and only parses lines whose checksum is not
+    already in the catalog. New and changed problems are read back from their
+    line in the file (on top of the snapshot, if one is in use), the sorted
+    and search indexes are updated for the diff, and the new state is
+    swapped in atomically.
+
+    Lines are still hashed to find the diff, but JSON/regex parsing (the
+    expensive part) scales with the number of changed lines.
+    """
+    with _reload_lock:
+        started = time.perf_counter()
+        state = problem_db.state
+        if state.reader is None:
+            load_problems(file_path, cache_size=None)
+            return {"full_reload": True, "total": len(problem_db)}
+
+        if isinstance(state.reader, OverlayProblemReader):
+            base, old_overlay = state.reader.base, state.reader.ids
+        else:
+            base, old_overlay = state.reader, set()
+        from_file = isinstance(base, JsonlProblemReader)
+
+        by_checksum = {record.checksum: record for record in state.records.values()}
+        records: Dict[int, ProblemRecord] = {}
+        parsed: Dict[int, Problem] = {}
+        offset = 0
+        moved = 0
+
+        with open(file_path, 'rb') as f:
             for line in f:
+                line_offset = offset
+                offset += len(line)
                 if not line.strip():
                     continue
-                
-                data = {} 
+
+                checksum = line_checksum(line)
+                old = by_checksum.get(checksum)
+                if old is not None:
+                    # Records served from the jsonl file follow their line to its new offset
+                    if (from_file or old.id in old_overlay) and old.offset != line_offset:
+                        old = ProblemRecord(old.id, old.title, old.difficulty, line_offset, len(line), checksum)
+                        moved += 1
+                    records[old.id] = old
+                    parsed.pop(old.id, None)
+                    continue
+
+                data = {}
                 try:
                     data = json.loads(line)
-                    problem_id = int(data['id'])
-                    question_text = data.get('question', '')
-                    
-                    # --- EXTRACT TITLE LOGIC ---
-                    # Use the first line of the question as the title
-                    lines = question_text.strip().split('\n')
-                    if lines:
-                        title = lines[0].strip()
-                        # Truncate if it's essentially the whole paragraph
-                        if len(title) > 100:
-                            title = title[:97] + "..."
-                    else:
-                        title = f"Problem {problem_id}"
-                    # ---------------------------
-
-                    public_cases = parse_examples_from_question(question_text)
-                    hidden_cases = parse_hidden_case_from_io(data.get('input_output', '{}'))
-                    
-                    problem_instance = Problem(
-                        id=problem_id,
-                        title=title, # Added title
-                        question=question_text,
-                        difficulty=data.get('difficulty', 'Medium'),
-                        public_cases=public_cases,
-                        hidden_cases=hidden_cases 
+                    problem = build_problem(data)
+                    records[problem['id']] = ProblemRecord(
+                        problem['id'], problem['title'], problem['difficulty'],
+                        line_offset, len(line), checksum
                     )
-                    
-                    temp_db[problem_id] = problem_instance
-                    
+                    parsed[problem['id']] = problem
+
                 except json.JSONDecodeError:
                     logger.warning(f"Skipping malformed JSON line: {line[:50]}...")
                 except Exception as e:
                     logger.error(f"Error processing problem id {data.get('id', 'UNKNOWN')}: {e}")
 
-        # Update the database in-place
-        problem_db.clear()
-        problem_db.update(temp_db)
-        
-        logger.info(f"Successfully loaded {len(problem_db)} problems.")
-    
-    except FileNotFoundError:
-        logger.error(f"FATAL: Problem file '{file_path}' not found.")
-    except Exception as e:
-        logger.error(f"FATAL: Could not load problems: {e}")
\ No newline at end of file
+        removed = [pid for pid in state.records if pid not in records]
+        changed = [pid for pid in parsed if pid in state.records]
+        added = [pid for pid in parsed if pid not in state.records]
+
+        stats = {
+            "added": len(added),
+            "changed": len(changed),
+            "removed": len(removed),
+            "total": len(records),
+        }
+        if not parsed and not removed and not moved:
+            stats["seconds"] = round(time.perf_counter() - started, 4)
+            return stats
+
+        # Only problems whose base is the snapshot need their ids tracked
+        overlay = set() if from_file else {pid for pid in old_overlay if pid in records} | set(parsed)
+
+        search_index = state.search_index.updated(
+            removed_ids=removed + changed,
+            added=[(pid, p['title'], p['question']) for pid, p in parsed.items()]
+        )
+        reader = OverlayProblemReader(base, JsonlProblemReader(file_path), overlay) if overlay else base
+        problem_db.replace(CatalogState(records, reader, search_index), invalidate=removed + changed)
+
+        stats["seconds"] = round(time.perf_counter() - started, 4)
+        logger.info(f"Reloaded {file_path}: {stats}")
+        return stats
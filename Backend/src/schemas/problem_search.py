@@ -0,0 +1,266 @@
+# problem_search.py
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+TITLE_BOOST = 3
+
+# Type-ahead expands the last query token to at most this many terms
+MAX_PREFIX_EXPANSIONS = 32
+# Postings are stored in decreasing impact order, so ranking only the documents
+# in the head of very common terms keeps queries fast while losing almost no
+# ranking quality. Matching (totals, facets, filters) always uses every posting
+MAX_POSTINGS_SCAN = 2048
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have if in into is it its of on or "
+    "that the their then there these this to was we were will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def term_counts(title: str, text: str) -> Counter:
+    counts = Counter(tokenize(text))
+    for term in tokenize(title):
+        counts[term] += TITLE_BOOST - 1
+    return counts
+
+
+def impact(tf: int, doc_length: int, avg_length: float) -> float:
+    """BM25 term-frequency component of one posting."""
+    norm = K1 * (1 - B + B * doc_length / avg_length) if avg_length else K1
+    return tf * (K1 + 1) / (tf + norm)
+
+
+class SearchIndexBuilder:
+    """
+    Collects term frequencies while the catalog is loaded and produces an
+    immutable SearchIndex.
+    """
+
+    def __init__(self):
+        self._doc_ids: List[int] = []
+        self._doc_lengths: List[int] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+
+    def add(self, problem_id: int, title: str, text: str):
+        counts = term_counts(title, text)
+
+        doc = len(self._doc_ids)
+        self._doc_ids.append(problem_id)
+        self._doc_lengths.append(sum(counts.values()))
+        for term, tf in counts.items():
+            self._postings.setdefault(term, []).append((doc, tf))
+
+    def build(self) -> "SearchIndex":
+        n_docs = len(self._doc_ids)
+        avg_length = (sum(self._doc_lengths) / n_docs) if n_docs else 0.0
+        lengths = self._doc_lengths
+
+        terms = {}
+        for term, postings in self._postings.items():
+            # Precompute the BM25 term-frequency component ("impact") per posting
+            impacts = [(impact(tf, lengths[doc], avg_length), doc) for doc, tf in postings]
+            impacts.sort(reverse=True)
+            terms[term] = (
+                array("I", [doc for _, doc in impacts]).tobytes(),
+                array("f", [impact for impact, _ in impacts]).tobytes(),
+            )
+
+        return SearchIndex(array("q", self._doc_ids).tobytes(), terms, avg_length)
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over problem titles and question text with
+    BM25 ranking and prefix expansion for type-ahead.
+
+    Postings are kept as raw bytes (doc ordinals and impacts) and viewed
+    through memoryview casts, so the index can be persisted in the catalog
+    snapshot and loaded without rebuilding or copying. Documents removed by
+    an incremental update keep their postings but map to problem id -1.
+    """
+    __slots__ = ("_doc_ids", "_terms", "_sorted_terms", "_avg_length")
+
+    def __init__(
+        self,
+        doc_ids: bytes,
+        terms: Dict[str, Tuple[bytes, bytes]],
+        avg_length: float = 0.0,
+        sorted_terms: Optional[List[str]] = None
+    ):
+        self._doc_ids = memoryview(doc_ids).cast("q")
+        self._terms = terms
+        self._sorted_terms = sorted_terms if sorted_terms is not None else sorted(terms)
+        self._avg_length = avg_length
+
+    @property
+    def doc_count(self) -> int:
+        return len(self._doc_ids)
+
+    def to_blob(self) -> Tuple[bytes, Dict[str, Tuple[bytes, bytes]], float]:
+        return (self._doc_ids.tobytes(), self._terms, self._avg_length)
+
+    @classmethod
+    def from_blob(cls, blob) -> "SearchIndex":
+        doc_ids, terms, avg_length = blob
+        return cls(doc_ids, terms, avg_length)
+
+    def updated(
+        self,
+        removed_ids: Iterable[int],
+        added: Iterable[Tuple[int, str, str]]
+    ) -> "SearchIndex":
+        """
+        Returns a new index with `removed_ids` dropped and `added`
+        (problem_id, title, text) documents indexed. Only the postings of
+        terms that occur in added documents are rewritten; this index is
+        left untouched so readers can keep using it until the swap.
+        """
+        doc_ids = array("q", self._doc_ids)
+        removed = set(removed_ids)
+        if removed:
+            for doc, problem_id in enumerate(doc_ids):
+                if problem_id in removed:
+                    doc_ids[doc] = -1
+
+        terms = dict(self._terms)
+        sorted_terms = None
+        for problem_id, title, text in added:
+            counts = term_counts(title, text)
+            doc = len(doc_ids)
+            doc_ids.append(problem_id)
+            length = sum(counts.values())
+
+            for term, tf in counts.items():
+                entry = terms.get(term)
+                if entry is None:
+                    if sorted_terms is None:
+                        sorted_terms = list(self._sorted_terms)
+                    insort(sorted_terms, term)
+                    entry = (b"", b"")
+                terms[term] = _insert_posting(entry, doc, impact(tf, length, self._avg_length))
+
+        return SearchIndex(
+            doc_ids.tobytes(),
+            terms,
+            self._avg_length,
+            sorted_terms if sorted_terms is not None else self._sorted_terms
+        )
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        start = bisect_left(self._sorted_terms, prefix)
+        expanded = []
+        for term in self._sorted_terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            expanded.append(term)
+        return expanded
+
+    def _idf(self, df: int) -> float:
+        n = len(self._doc_ids)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _query_postings(self, query: str, prefix: bool) -> List[Tuple[memoryview, memoryview, float]]:
+        """(doc ordinals, impacts, weighted idf) of every query term in the index."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        query_terms: List[Tuple[str, float]] = [(t, 1.0) for t in tokens[:-1]]
+        last = tokens[-1]
+        if prefix:
+            for term in self.expand_prefix(last):
+                # Exact match on the last token ranks above its completions
+                query_terms.append((term, 1.0 if term == last else 0.8))
+        else:
+            query_terms.append((last, 1.0))
+
+        postings = []
+        for term, weight in query_terms:
+            entry = self._terms.get(term)
+            if entry is None:
+                continue
+            docs = memoryview(entry[0]).cast("I")
+            postings.append((docs, memoryview(entry[1]).cast("f"), self._idf(len(docs)) * weight))
+        return postings
+
+    def score(
+        self,
+        query: str,
+        prefix: bool = True,
+        only: Optional[Set[int]] = None
+    ) -> Tuple[Dict[int, float], Set[int]]:
+        """
+        Returns ({problem_id: score} for the ranking candidates, every
+        matching problem_id). With `prefix`, the last token also matches any
+        term it prefixes.
+
+        Candidates come from the first MAX_POSTINGS_SCAN postings of each
+        term. With `only` (problem ids), those matching documents are scored
+        exactly over the full postings instead.
+        """
+        postings = self._query_postings(query, prefix)
+        doc_ids = self._doc_ids
+
+        matched_docs: Set[int] = set()
+        for docs, _, _ in postings:
+            matched_docs.update(docs)
+        matched = {doc_ids[doc] for doc in matched_docs}
+        matched.discard(-1)
+
+        scores: Dict[int, float] = {}
+        get = scores.get
+        if only is None:
+            for docs, impacts, idf in postings:
+                for i in range(min(len(docs), MAX_POSTINGS_SCAN)):
+                    doc = docs[i]
+                    scores[doc] = get(doc, 0.0) + idf * impacts[i]
+        else:
+            wanted = {doc for doc in matched_docs if doc_ids[doc] in only}
+            for docs, impacts, idf in postings:
+                for i, doc in enumerate(docs):
+                    if doc in wanted:
+                        scores[doc] = get(doc, 0.0) + idf * impacts[i]
+
+        return {doc_ids[doc]: score for doc, score in scores.items() if doc_ids[doc] >= 0}, matched
+
+    def search(self, query: str, limit: int = 20, prefix: bool = True) -> List[Tuple[int, float]]:
+        """Top `limit` (problem_id, score) pairs, best first."""
+        return top_matches(self.score(query, prefix=prefix)[0], limit)
+
+
+def _insert_posting(entry: Tuple[bytes, bytes], doc: int, doc_impact: float) -> Tuple[bytes, bytes]:
+    """Inserts one posting keeping the list in decreasing impact order."""
+    docs, impacts = entry
+    view = memoryview(impacts).cast("f")
+    lo, hi = 0, len(view)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if view[mid] >= doc_impact:
+            lo = mid + 1
+        else:
+            hi = mid
+    new_doc = array("I", [doc]).tobytes()
+    new_impact = array("f", [doc_impact]).tobytes()
+    return (
+        docs[:lo * 4] + new_doc + docs[lo * 4:],
+        impacts[:lo * 4] + new_impact + impacts[lo * 4:],
+    )
+
+
+def top_matches(scores: Dict[int, float], limit: int) -> List[Tuple[int, float]]:
+    # Ties are broken by the lower problem id so results are stable
+    return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
@@ -0,0 +1,195 @@
+# problem_snapshot.py
+"""
+Binary snapshot of a parsed problem catalog.
+
+Layout (all integers little-endian):
+
+    MAGIC | u16 version | blob data ... | section data ... | footer | u32 footer_len | MAGIC
+
+The footer is a marshalled dict describing the source file the snapshot was
+built from (size, mtime, sha256), the CRC32 of everything between the leading
+header and the footer, and the byte ranges of the named sections. Blobs are
+addressed by (offset, length) relative to the start of the data region.
+"""
+import hashlib
+import logging
+import marshal
+import mmap
+import os
+import struct
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CDSNAP"
+SNAPSHOT_VERSION = 5
+SNAPSHOT_SUFFIX = ".snap"
+
+_HEADER = struct.Struct("<6sH")
+_TRAILER = struct.Struct("<I6s")
+_MARSHAL_VERSION = 4
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, stale or corrupt."""
+
+
+def snapshot_path_for(source_path: str) -> str:
+    return source_path + SNAPSHOT_SUFFIX
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_info(path: str, sha256: Optional[str] = None) -> Dict[str, Any]:
+    st = os.stat(path)
+    return {
+        "source_size": st.st_size,
+        "source_mtime_ns": st.st_mtime_ns,
+        "source_sha256": sha256 if sha256 is not None else file_sha256(path),
+    }
+
+
+class SnapshotWriter:
+    """
+    Streams blobs into a temporary file and atomically moves it into place on
+    `commit`, so a crash mid-build never leaves a truncated snapshot behind.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._tmp_path = f"{path}.{os.getpid()}.tmp"
+        self._f = open(self._tmp_path, "wb")
+        self._f.write(_HEADER.pack(MAGIC, SNAPSHOT_VERSION))
+        self._crc = 0
+        self._size = 0
+
+    def _write(self, data: bytes) -> Tuple[int, int]:
+        offset = self._size
+        self._f.write(data)
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        return offset, len(data)
+
+    def add_blob(self, obj: Any) -> Tuple[int, int]:
+        """Writes one marshalled object and returns its (offset, length)."""
+        return self._write(marshal.dumps(obj, _MARSHAL_VERSION))
+
+    def commit(self, sections: Dict[str, Any], info: Dict[str, Any]):
+        try:
+            section_index = {name: self.add_blob(obj) for name, obj in sections.items()}
+            footer = dict(info)
+            footer.update({
+                "version": SNAPSHOT_VERSION,
+                "data_length": self._size,
+                "data_crc32": self._crc,
+                "sections": section_index,
+            })
+            footer_bytes = marshal.dumps(footer, _MARSHAL_VERSION)
+            self._f.write(footer_bytes)
+            self._f.write(_TRAILER.pack(len(footer_bytes), MAGIC))
+            self._f.close()
+            os.replace(self._tmp_path, self.path)
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self):
+        if not self._f.closed:
+            self._f.close()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+
+class Snapshot:
+    """
+    Memory-mapped, read-only view of a snapshot file. Blobs are only
+    unmarshalled when `read_blob` is called.
+    """
+
+    def __init__(self, path: str, verify: bool = True):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError("Snapshot file is empty")
+
+        mm = self._mm
+        if len(mm) < _HEADER.size + _TRAILER.size:
+            raise SnapshotError("Snapshot file is truncated")
+
+        magic, version = _HEADER.unpack_from(mm, 0)
+        footer_len, trailer_magic = _TRAILER.unpack_from(mm, len(mm) - _TRAILER.size)
+        if magic != MAGIC or trailer_magic != MAGIC:
+            raise SnapshotError("Not a problem snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Snapshot version {version} != {SNAPSHOT_VERSION}")
+
+        footer_start = len(mm) - _TRAILER.size - footer_len
+        if footer_start < _HEADER.size:
+            raise SnapshotError("Snapshot footer is corrupt")
+        try:
+            self.footer = marshal.loads(mm[footer_start:footer_start + footer_len])
+        except (EOFError, ValueError, TypeError):
+            raise SnapshotError("Snapshot footer is corrupt")
+
+        self._data_start = _HEADER.size
+        if self._data_start + self.footer["data_length"] != footer_start:
+            raise SnapshotError("Snapshot data length mismatch")
+        if verify and self._data_crc32() != self.footer["data_crc32"]:
+            raise SnapshotError("Snapshot checksum mismatch")
+
+    def _data_crc32(self) -> int:
+        crc = 0
+        start, end = self._data_start, self._data_start + self.footer["data_length"]
+        view = memoryview(self._mm)
+        try:
+            for pos in range(start, end, 1 << 22):
+                crc = zlib.crc32(view[pos:min(pos + (1 << 22), end)], crc)
+        finally:
+            view.release()
+        return crc
+
+    def matches_source(self, source_path: str) -> bool:
+        """
+        Cheap check on size/mtime first; only hashes the source when the
+        mtime changed (e.g. a fresh checkout of identical content).
+        """
+        st = os.stat(source_path)
+        if st.st_size != self.footer["source_size"]:
+            return False
+        if st.st_mtime_ns == self.footer["source_mtime_ns"]:
+            return True
+        return file_sha256(source_path) == self.footer["source_sha256"]
+
+    def read_blob(self, offset: int, length: int) -> Any:
+        start = self._data_start + offset
+        return marshal.loads(self._mm[start:start + length])
+
+    def section(self, name: str, default: Any = None) -> Any:
+        location = self.footer["sections"].get(name)
+        if location is None:
+            return default
+        return self.read_blob(*location)
+
+
+def open_snapshot(snapshot_path: str, source_path: str, verify: bool = True) -> Snapshot:
+    """
+    Opens the snapshot for `source_path`, raising SnapshotError if it is
+    missing, corrupt or was built from a different version of the source.
+    """
+    if not os.path.exists(snapshot_path):
+        raise SnapshotError(f"No snapshot at {snapshot_path}")
+    snapshot = Snapshot(snapshot_path, verify=verify)
+    if not snapshot.matches_source(source_path):
+        raise SnapshotError("Snapshot is stale for the current source file")
+    return snapshot
@@ -0,0 +1,249 @@
+# problem_store.py
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .problem_search import SearchIndex, SearchIndexBuilder, top_matches
+
+DEFAULT_CACHE_SIZE = 256
+
+
+class ProblemRecord:
+    """
+    Compact summary of a problem. Only the fields needed by list views are
+    kept in memory; the full problem is decoded on demand from `offset`/`length`.
+    `checksum` identifies the source line the problem was built from, so
+    anything derived from a problem can tell when it changed.
+    """
+    __slots__ = ("id", "title", "difficulty", "offset", "length", "checksum")
+
+    def __init__(self, id: int, title: str, difficulty: str, offset: int, length: int, checksum: int = 0):
+        self.id = id
+        self.title = title
+        # Difficulties repeat across the whole catalog, share one string per value
+        self.difficulty = sys.intern(difficulty)
+        self.offset = offset
+        self.length = length
+        self.checksum = checksum
+
+
+class CatalogState:
+    """
+    Immutable view of one loaded catalog. The store swaps the whole state in a
+    single assignment so readers never see a half-loaded catalog.
+
+    Sorted id arrays (overall and per difficulty) are built once here so that
+    list endpoints can page with a binary search instead of sorting.
+    """
+    __slots__ = ("records", "reader", "sorted_ids", "ids_by_difficulty", "search_index")
+
+    def __init__(
+        self,
+        records: Dict[int, ProblemRecord],
+        reader: Optional[Callable] = None,
+        search_index: Optional[SearchIndex] = None
+    ):
+        self.records = records
+        self.reader = reader
+        self.search_index = search_index or SearchIndexBuilder().build()
+        self.sorted_ids = array("q", sorted(records))
+
+        grouped: Dict[str, List[int]] = {}
+        for problem_id in self.sorted_ids:
+            grouped.setdefault(records[problem_id].difficulty.lower(), []).append(problem_id)
+        self.ids_by_difficulty = {key: array("q", ids) for key, ids in grouped.items()}
+
+    def page(
+        self,
+        after_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 50,
+        difficulty: Optional[str] = None
+    ) -> List[ProblemRecord]:
+        """
+        Returns up to `limit` records in id order, starting after `after_id`
+        (cursor) and then skipping `skip` entries. O(log n + skip + limit).
+        """
+        if difficulty is not None:
+            ids = self.ids_by_difficulty.get(difficulty.lower())
+            if ids is None:
+                return []
+        else:
+            ids = self.sorted_ids
+
+        start = bisect_right(ids, after_id) if after_id is not None else 0
+        start += max(skip, 0)
+        return [self.records[problem_id] for problem_id in ids[start:start + max(limit, 0)]]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        difficulty: Optional[str] = None,
+        prefix: bool = True
+    ) -> Tuple[List[Tuple[ProblemRecord, float]], int, Dict[str, int]]:
+        """
+        Ranks problems against `query`. Returns the top matches (optionally
+        restricted to one difficulty), the number of matches after that
+        filter, and per-difficulty match counts computed before it.
+        """
+        scores, matched_ids = self.search_index.score(query, prefix=prefix)
+
+        facets: Dict[str, int] = {}
+        matched = set()
+        wanted = difficulty.lower() if difficulty is not None else None
+        for problem_id in matched_ids:
+            record = self.records.get(problem_id)
+            if record is None:
+                continue
+            key = record.difficulty.lower()
+            facets[key] = facets.get(key, 0) + 1
+            if wanted is None or key == wanted:
+                matched.add(problem_id)
+
+        candidates = {pid: score for pid, score in scores.items() if pid in matched}
+        if len(candidates) < min(limit, len(matched)):
+            # Filtered matches outside the ranked postings heads are scored exactly
+            rest = matched.difference(candidates)
+            candidates.update(self.search_index.score(query, prefix=prefix, only=rest)[0])
+
+        results = [(self.records[pid], score) for pid, score in top_matches(candidates, limit)]
+        return results, len(matched), facets
+
+
+class ProblemStore:
+    """
+    Dict-like problem catalog.
+
+    Summary fields live in `ProblemRecord`s, question bodies and test cases are
+    decoded through the state's reader only when a full problem is requested,
+    and the most recently used problems are kept in a bounded LRU.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        self._state = CatalogState({})
+        self._cache: "OrderedDict[int, dict]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    # --- Loading ---
+
+    @property
+    def state(self) -> CatalogState:
+        return self._state
+
+    def replace(
+        self,
+        state: CatalogState,
+        cache_size: Optional[int] = None,
+        invalidate: Optional[Iterable[int]] = None
+    ):
+        """
+        Atomically swaps in a freshly loaded catalog. With `invalidate`, only
+        those ids are dropped from the LRU (incremental reload); otherwise the
+        whole LRU is cleared.
+        """
+        with self._lock:
+            if cache_size is not None:
+                self._cache_size = cache_size
+            self._state = state
+            if invalidate is None:
+                self._cache.clear()
+            else:
+                for problem_id in invalidate:
+                    self._cache.pop(problem_id, None)
+
+    def clear(self):
+        self.replace(CatalogState({}))
+
+    # --- Summary access (no decoding) ---
+
+    def record(self, problem_id: int) -> Optional[ProblemRecord]:
+        return self._state.records.get(problem_id)
+
+    def summaries(self) -> List[ProblemRecord]:
+        return list(self._state.records.values())
+
+    def page(
+        self,
+        after_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 50,
+        difficulty: Optional[str] = None
+    ) -> List[ProblemRecord]:
+        return self._state.page(after_id=after_id, skip=skip, limit=limit, difficulty=difficulty)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        difficulty: Optional[str] = None,
+        prefix: bool = True
+    ) -> Tuple[List[Tuple[ProblemRecord, float]], int, Dict[str, int]]:
+        return self._state.search(query, limit=limit, difficulty=difficulty, prefix=prefix)
+
+    def difficulties(self) -> List[str]:
+        return sorted(self._state.ids_by_difficulty)
+
+    def __len__(self) -> int:
+        return len(self._state.records)
+
+    def __contains__(self, problem_id) -> bool:
+        return problem_id in self._state.records
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._state.records))
+
+    def keys(self) -> List[int]:
+        return list(self._state.records)
+
+    # --- Full problem access ---
+
+    def get(self, problem_id: int, default=None):
+        """
+        Returns the full problem (same shape as `Problem`) or `default`.
+        """
+        _, problem = self.get_with_record(problem_id)
+        return default if problem is None else problem
+
+    def get_with_record(self, problem_id: int) -> Tuple[Optional[ProblemRecord], Optional[dict]]:
+        """
+        Returns the summary record and the full problem, both taken from the
+        same catalog state, or (None, None).
+        """
+        with self._lock:
+            state = self._state
+            record = state.records.get(problem_id)
+            if record is None:
+                return None, None
+            problem = self._cache.get(problem_id)
+            if problem is not None:
+                self._cache.move_to_end(problem_id)
+                return record, problem
+
+        try:
+            problem = state.reader(record)
+        except LookupError:
+            # The source changed under this record; the pending reload will fix it
+            return None, None
+
+        with self._lock:
+            # Only cache if the catalog was not swapped while we were decoding
+            if state is self._state:
+                self._cache[problem_id] = problem
+                self._cache.move_to_end(problem_id)
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return record, problem
+
+    def __getitem__(self, problem_id: int):
+        problem = self.get(problem_id)
+        if problem is None:
+            raise KeyError(problem_id)
+        return problem
+
+    def cache_info(self) -> dict:
+        return {"cached": len(self._cache), "max_size": self._cache_size, "problems": len(self)}
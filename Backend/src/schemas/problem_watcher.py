@@ -0,0 +1,43 @@
+# problem_watcher.py
+import asyncio
+import logging
+import os
+from typing import Optional, Tuple
+
+from .problem_loader import reload_problems
+
+logger = logging.getLogger(__name__)
+
+
+def _fingerprint(file_path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+async def watch_problem_file(file_path: str, interval: float):
+    """
+    Polls the problem file and runs an incremental reload (in a worker
+    thread, so requests keep being served) whenever its size or mtime moves.
+    """
+    last = _fingerprint(file_path)
+    logger.info(f"Watching {file_path} for changes every {interval}s")
+
+    while True:
+        await asyncio.sleep(interval)
+        current = _fingerprint(file_path)
+        if current is None or current == last:
+            continue
+
+        # Wait for the writer to finish before reading a half-written file
+        await asyncio.sleep(min(interval, 1.0))
+        if _fingerprint(file_path) != current:
+            continue
+
+        last = current
+        try:
+            await asyncio.to_thread(reload_problems, file_path)
+        except Exception as e:
+            logger.error(f"Incremental reload of {file_path} failed: {e}")
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+# True inside stale-while-revalidate refreshes, which no caller is waiting on
+refreshing_in_background: ContextVar[bool] = ContextVar("refreshing_in_background", default=False)
+
+
+class CacheEntry(Generic[V]):
+    __slots__ = ("value", "fetched_at")
+
+    def __init__(self, value: V, fetched_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+class AsyncTTLCache(Generic[V]):
+    """
+    Async cache for values loaded from slow upstreams.
+
+    Entries are fresh for `ttl` seconds. For `stale_ttl` seconds after that
+    they are still served while a single background task reloads them
+    (stale-while-revalidate). Concurrent misses for the same key share one
+    load. When a load fails, an entry that is too old to serve normally is
+    returned anyway (stale-if-error) rather than failing the caller; without
+    any entry the error propagates. At most `max_entries` keys are kept (LRU).
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0, max_entries: int = 1024, name: str = "cache"):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max(1, max_entries)
+        self.name = name
+        self._entries: "OrderedDict[Hashable, CacheEntry[V]]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    # --- Entries ---
+
+    def peek(self, key: Hashable) -> Optional[CacheEntry[V]]:
+        """The entry for `key` regardless of its age, without loading."""
+        return self._entries.get(key)
+
+    def set(self, key: Hashable, value: V) -> CacheEntry[V]:
+        entry = CacheEntry(value, time.monotonic())
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    # --- Loading ---
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> CacheEntry[V]:
+        future = self._loading.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            entry = self.set(key, await loader())
+            future.set_result(entry)
+            return entry
+        except BaseException as e:
+            if not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()
+            raise
+        finally:
+            self._loading.pop(key, None)
+
+    def _refresh_in_background(self, key: Hashable, loader: Callable[[], Awaitable[V]]):
+        if key in self._refreshing or key in self._loading:
+            return
+
+        async def refresh():
+            refreshing_in_background.set(True)
+            try:
+                await self._load(key, loader)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"{self.name}: background refresh of {key!r} failed: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    async def get_entry(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> CacheEntry[V]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = entry.age
+            if age < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._refresh_in_background(key, loader)
+                return entry
+
+        self.misses += 1
+        try:
+            return await self._load(key, loader)
+        except Exception as e:
+            self.errors += 1
+            if entry is None:
+                raise
+            logger.warning(f"{self.name}: serving expired {key!r} after load failure: {e}")
+            return entry
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        return (await self.get_entry(key, loader)).value
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "refreshing": len(self._refreshing),
+        }
@@ -0,0 +1,170 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+    return accepted
+
+
+def _etag_matches(if_none_match: str, etags) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # If-None-Match uses weak comparison
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in etags:
+            return True
+    return False
+
+
+class EncodedResponse:
+    """
+    One pre-encoded JSON body plus its lazily built compressed variants.
+    The ETag is derived from the body's content hash.
+    """
+    __slots__ = ("version", "body", "digest", "variants", "_lock")
+
+    def __init__(self, version: Hashable, body: bytes):
+        self.version = version
+        self.body = body
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def etag(self, encoding: str = "identity") -> str:
+        if encoding == "identity":
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{encoding}"'
+
+    def _variant(self, encoding: str) -> bytes:
+        variant = self.variants.get(encoding)
+        if variant is None:
+            with self._lock:
+                variant = self.variants.get(encoding)
+                if variant is None:
+                    if encoding == "br":
+                        variant = brotli.compress(self.body)
+                    else:
+                        variant = gzip.compress(self.body, compresslevel=6, mtime=0)
+                    self.variants[encoding] = variant
+        return variant
+
+    def _pick_encoding(self, request: Request) -> str:
+        if len(self.body) < MIN_COMPRESS_SIZE:
+            return "identity"
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        if brotli is not None and accepted.get("br", 0) > 0:
+            return "br"
+        if accepted.get("gzip", 0) > 0:
+            return "gzip"
+        return "identity"
+
+    def respond(self, request: Request) -> Response:
+        """
+        Serves the cached bytes, or a 304 when the client already has them.
+        """
+        encoding = self._pick_encoding(request)
+        headers = {
+            "ETag": self.etag(encoding),
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            known = {self.etag("identity"), self.etag("gzip"), self.etag("br")}
+            if _etag_matches(if_none_match, known):
+                return Response(status_code=304, headers=headers)
+
+        if encoding == "identity":
+            return Response(content=self.body, media_type="application/json", headers=headers)
+
+        headers["Content-Encoding"] = encoding
+        return Response(content=self._variant(encoding), media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """
+    Byte-bounded LRU of EncodedResponses. Each entry carries the version of
+    the data it was built from; a lookup with a different version misses, so
+    entries are invalidated one key at a time when the source changes.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, EncodedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[EncodedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, version: Hashable, body: bytes) -> EncodedResponse:
+        entry = EncodedResponse(version, body)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+            self._entries[key] = entry
+            # Compressed variants are small relative to the body; account the body only
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+        return entry
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,25 @@
+from typing import Callable, Optional
+
+import httpx
+
+
+class SharedClient:
+    """
+    One long-lived, pooled httpx client per upstream. main.lifespan creates
+    it on startup and closes it on shutdown; `get` also creates it lazily
+    when the app runs without its lifespan (tests, scripts).
+    """
+
+    def __init__(self, factory: Callable[[], httpx.AsyncClient]):
+        self._factory = factory
+        self.client: Optional[httpx.AsyncClient] = None
+
+    def get(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = self._factory()
+        return self.client
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
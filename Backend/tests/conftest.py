@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Tests import the app as `src.*`, like uvicorn run from Backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Required settings; nothing here talks to a real database or Judge0
+for name, value in {
+    "app_MONGO_DB_URL": "mongodb://127.0.0.1:1",
+    "app_MONGO_DB_NAME": "codedeck_test",
+    "app_JWT_SECRET_KEY": "test",
+    "app_JUDGE0_URL": "http://127.0.0.1:1",
+    "app_JUDGE0_API_KEY": "test",
+    "app_JUDGE0_RAPIDAPI_HOST": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+from src.schemas.problem_loader import problem_db  # noqa: E402
+
+
+def _problem_line(problem_id, question, difficulty="Easy"):
+    return json.dumps({"id": problem_id, "question": question, "difficulty": difficulty, "input_output": "{}"})
+
+
+@pytest.fixture
+def write_catalog():
+    """Writes (id, question[, difficulty]) problems to a problems.jsonl path."""
+    def write(path, problems):
+        path.write_text("\n".join(_problem_line(*p) for p in problems) + "\n")
+    return write
+
+
+@pytest.fixture
+def catalog(tmp_path, write_catalog):
+    """A three-problem catalog file; the loaded catalog is restored afterwards."""
+    path = tmp_path / "problems.jsonl"
+    write_catalog(path, [
+        (1, "Sum of two numbers\nAdd them."),
+        (2, "Longest palindrome\nFind it.", "Medium"),
+        (3, "Shortest path\nUse a graph.", "Hard"),
+    ])
+    previous = problem_db.state
+    yield path
+    problem_db.replace(previous)
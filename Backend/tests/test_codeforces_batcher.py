@@ -0,0 +1,76 @@
+import asyncio
+
+from src.platforms import codeforces
+from src.platforms.codeforces import CodeforcesError, UserInfoBatcher
+from src.platforms.governor import Throttled
+
+
+class FakeUserInfo:
+    """user.info over any handle, failing calls that include `bad` or while `down` calls remain."""
+
+    def __init__(self, bad=(), down=0, shed=False):
+        self.bad = set(bad)
+        self.down = down
+        self.shed = shed
+        self.calls = []
+
+    async def __call__(self, method, params, priority=None):
+        handles = params["handles"].split(";")
+        self.calls.append(handles)
+        if self.shed:
+            raise CodeforcesError("codeforces request rate exceeded", 503) from Throttled("codeforces", 9)
+        if self.down:
+            self.down -= 1
+            raise CodeforcesError("Codeforces is unreachable: ReadTimeout()", 503)
+        if self.bad.intersection(handles):
+            raise CodeforcesError("Codeforces API error: handles: Field should contain only Latin letters", 502)
+        return [{"handle": handle} for handle in handles]
+
+
+def lookup(upstream, monkeypatch, handles):
+    monkeypatch.setattr(codeforces, "call_api", upstream)
+
+    async def main():
+        batcher = UserInfoBatcher(window=0.01, max_handles=100)
+        results = await asyncio.gather(*(batcher.load(handle) for handle in handles), return_exceptions=True)
+        return results, batcher
+
+    return asyncio.run(main())
+
+
+def test_a_bad_handle_only_fails_its_own_callers(monkeypatch):
+    upstream = FakeUserInfo(bad={"b@d"})
+    handles = ["alice", "bob", "b@d", "carol", "dave"]
+
+    results, batcher = lookup(upstream, monkeypatch, handles)
+
+    assert [r["handle"] for r in results if isinstance(r, dict)] == ["alice", "bob", "carol", "dave"]
+    assert isinstance(results[2], CodeforcesError) and results[2].status_code == 502
+    assert not batcher._running
+
+
+def test_a_failed_call_is_retried_in_halves_once(monkeypatch):
+    upstream = FakeUserInfo(down=1)
+
+    results, _ = lookup(upstream, monkeypatch, ["alice", "bob", "carol", "dave"])
+
+    assert [r["handle"] for r in results] == ["alice", "bob", "carol", "dave"]
+    assert sorted(len(handles) for handles in upstream.calls) == [2, 2, 4]
+
+
+def test_an_outage_does_not_split_down_to_single_handles(monkeypatch):
+    upstream = FakeUserInfo(down=100)
+
+    results, _ = lookup(upstream, monkeypatch, ["alice", "bob", "carol", "dave"])
+
+    assert all(isinstance(r, CodeforcesError) and r.status_code == 503 for r in results)
+    assert len(upstream.calls) == 3
+
+
+def test_calls_shed_by_the_governor_are_not_retried(monkeypatch):
+    upstream = FakeUserInfo(shed=True)
+
+    results, _ = lookup(upstream, monkeypatch, ["alice", "bob"])
+
+    assert all(isinstance(r, CodeforcesError) for r in results)
+    assert len(upstream.calls) == 1
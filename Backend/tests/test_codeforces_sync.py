@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from src.codeDeck.settings import settings
+from src.platforms import codeforces_sync
+from src.platforms.codeforces import CodeforcesError
+from src.platforms.codeforces_sync import SUBMISSIONS, SYNC_STATE, CodeforcesSync
+
+
+class FakeCollection:
+    """The few collection methods a sync uses, over a dict."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def create_index(self, *args, **kwargs):
+        pass
+
+    async def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query["_id"])
+        if doc is None:
+            doc = self.docs[query["_id"]] = dict(query, **update.get("$setOnInsert", {}))
+        doc.update(update["$set"])
+        for field in update.get("$unset", {}):
+            doc.pop(field, None)
+
+    async def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            self.docs[request._filter["id"]] = request._doc
+
+
+class FakeCodeforces:
+    """
+    user.status over `submissions` (newest first), failing once at
+    `fail_from`. With a `gate`, pages after the first wait until it is set.
+    """
+
+    def __init__(self, submissions, fail_from=None, gate=None):
+        self.submissions = submissions
+        self.fail_from = fail_from
+        self.gate = gate
+        self.calls = []
+
+    async def __call__(self, method, params, priority=None):
+        start = params["from"]
+        self.calls.append(start)
+        if self.gate is not None and start > 1:
+            await self.gate.wait()
+        if start == self.fail_from:
+            self.fail_from = None
+            raise CodeforcesError("Codeforces is unavailable", 503)
+        return self.submissions[start - 1:start - 1 + params["count"]]
+
+
+def history(newest, pending=()):
+    return [
+        {"id": i, "verdict": "TESTING" if i in pending else "OK"}
+        for i in range(newest, 0, -1)
+    ]
+
+
+@pytest.fixture
+def sync(monkeypatch):
+    db = {SUBMISSIONS: FakeCollection(), SYNC_STATE: FakeCollection()}
+    monkeypatch.setattr(CodeforcesSync, "_db", lambda self: db)
+    monkeypatch.setattr(settings, "CODEFORCES_SYNC_PAGE_SIZE", 10)
+    return CodeforcesSync(), db
+
+
+def test_sync_resumes_after_a_failed_page(sync, monkeypatch):
+    syncer, db = sync
+    upstream = FakeCodeforces(history(25, pending={12}), fail_from=21)
+    monkeypatch.setattr(codeforces_sync, "call_api", upstream)
+
+    with pytest.raises(CodeforcesError):
+        asyncio.run(syncer.sync("tourist"))
+
+    # The two pages fetched before the failure are kept, and so is the position
+    assert sorted(db[SUBMISSIONS].docs) == list(range(6, 26))
+    state = db[SYNC_STATE].docs["tourist"]
+    assert "watermark" not in state
+    assert state["resume"] == {"top": 25, "stored": 20, "pending": 12}
+
+    # Two new submissions arrive before the retry
+    upstream.submissions = history(27, pending={12})
+    upstream.calls.clear()
+    result = asyncio.run(syncer.sync("tourist"))
+
+    # One page up to the old top, then a jump past everything already stored
+    assert upstream.calls == [1, 23]
+    assert sorted(db[SUBMISSIONS].docs) == list(range(1, 28))
+    assert result["watermark"] == 11
+    assert "resume" not in db[SYNC_STATE].docs["tourist"]
+
+
+def test_sync_stops_at_the_watermark(sync, monkeypatch):
+    syncer, db = sync
+    upstream = FakeCodeforces(history(25))
+    monkeypatch.setattr(codeforces_sync, "call_api", upstream)
+
+    assert asyncio.run(syncer.sync("tourist"))["watermark"] == 25
+    upstream.submissions = history(28)
+    upstream.calls.clear()
+    result = asyncio.run(syncer.sync("tourist"))
+
+    assert upstream.calls == [1]
+    assert result == {"handle": "tourist", "stored": 3, "watermark": 28}
+
+
+def test_first_view_waits_only_for_the_newest_page(sync, monkeypatch):
+    syncer, db = sync
+
+    async def main():
+        upstream = FakeCodeforces(history(25), gate=asyncio.Event())
+        monkeypatch.setattr(codeforces_sync, "call_api", upstream)
+
+        await syncer.ensure_synced("tourist")
+        first_view = sorted(db[SUBMISSIONS].docs)
+        running = syncer.stats()["running"]
+
+        upstream.gate.set()
+        result = await syncer.sync("tourist")
+        return first_view, running, result
+
+    first_view, running, result = asyncio.run(main())
+    assert first_view == list(range(16, 26))
+    assert running == 1
+    assert sorted(db[SUBMISSIONS].docs) == list(range(1, 26))
+    assert result["watermark"] == 25
@@ -0,0 +1,160 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.codeDeck.settings import settings
+from src.judge import client as judge_client
+from src.judge import resilience
+from src.judge.resilience import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen, HedgeBudget, JudgeResilience, LatencyTracker
+)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class StubJudge0:
+    """Answers requests with the given status codes in turn; the last one repeats."""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.method)
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return httpx.Response(status, json={"token": "abc"})
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(base_url="http://judge0", transport=httpx.MockTransport(self))
+
+
+@pytest.fixture
+def fresh_resilience(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE0_RETRY_BACKOFF", 0)
+    instance = JudgeResilience()
+    monkeypatch.setattr(judge_client, "judge_resilience", instance)
+    return instance
+
+
+def test_latency_p95_needs_enough_samples():
+    tracker = LatencyTracker(min_samples=20)
+    for i in range(19):
+        tracker.record("GET /x", i / 100)
+    assert tracker.p95("GET /x") is None
+
+    for i in range(19, 100):
+        tracker.record("GET /x", i / 100)
+    assert tracker.p95("GET /x") == 0.95
+
+
+def test_hedge_budget_caps_hedges_at_its_ratio():
+    budget = HedgeBudget(ratio=0.5, burst=2)
+    assert [budget.spend() for _ in range(3)] == [True, True, False]
+    # Every call earns half a hedge
+    for _ in range(2):
+        budget.earn()
+    assert budget.spend()
+    assert not budget.spend()
+
+
+def test_breaker_opens_rejects_and_probes_after_cooldown(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience, "time", clock)
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=10)
+
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+
+    clock.now += 10
+    breaker.before_call()  # the probe
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()  # only one probe at a time
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock.now += 10
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.opened == 2
+
+
+def test_slow_call_is_hedged_after_p95_and_the_faster_answer_wins(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGE0_HEDGE_ENABLED", True)
+    guard = JudgeResilience()
+    for _ in range(guard.latency.min_samples):
+        guard.latency.record("GET /submissions/batch", 0.01)
+    sent = []
+
+    async def send():
+        sent.append(len(sent))
+        if len(sent) == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200)
+
+    response = run(guard.request("GET", "/submissions/batch?tokens=a", send, hedge=True, retries=0))
+
+    assert response.status_code == 200
+    assert len(sent) == 2
+    assert (guard.hedges, guard.hedge_wins) == (1, 1)
+
+
+def test_get_polls_are_retried(fresh_resilience):
+    judge0 = StubJudge0(503, 503, 200)
+
+    async def main():
+        async with judge0.client() as client:
+            return await judge_client.call_judge0_api("/submissions/abc", client=client)
+
+    assert run(main()) == {"token": "abc"}
+    assert judge0.requests == ["GET", "GET", "GET"]
+    assert fresh_resilience.retries == 2
+
+
+def test_submission_posts_are_sent_once(fresh_resilience):
+    judge0 = StubJudge0(503, 201)
+
+    async def main():
+        async with judge0.client() as client:
+            return await judge_client.call_judge0_api(
+                "/submissions?wait=true", method="POST", content=b"{}", client=client
+            )
+
+    with pytest.raises(HTTPException) as failed:
+        run(main())
+    assert failed.value.status_code == 503
+    assert judge0.requests == ["POST"]
+    assert fresh_resilience.retries == 0
+
+
+def test_open_breaker_fails_fast_without_calling_judge0(fresh_resilience):
+    judge0 = StubJudge0(200)
+    for _ in range(fresh_resilience.breaker.failure_threshold):
+        fresh_resilience.breaker.record_failure()
+
+    async def main():
+        async with judge0.client() as client:
+            return await judge_client.call_judge0_api("/languages", client=client)
+
+    with pytest.raises(HTTPException) as failed:
+        run(main())
+    assert failed.value.status_code == 503
+    assert "Retry-After" in failed.value.headers
+    assert judge0.requests == []
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from src.judge.scheduler import JudgeScheduler, SchedulerFull
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def job(scheduler, owner, log, hold, weight=1, fail=False):
+    async with scheduler.slot(owner, weight):
+        log.append(owner)
+        await hold.wait()
+        if fail:
+            raise RuntimeError("judge crashed")
+
+
+def test_owners_are_served_round_robin():
+    async def main():
+        scheduler = JudgeScheduler(max_in_flight=1, max_queue_depth=100)
+        log, hold = [], asyncio.Event()
+        # Occupy the only slot so everything below has to queue
+        tasks = [asyncio.create_task(job(scheduler, "first", log, hold))]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(job(scheduler, "heavy", log, hold)) for _ in range(4)]
+        tasks += [asyncio.create_task(job(scheduler, "light", log, hold)) for _ in range(2)]
+        await asyncio.sleep(0)
+        hold.set()
+        await asyncio.gather(*tasks)
+        return log
+
+    assert run(main()) == ["first", "heavy", "light", "heavy", "light", "heavy", "heavy"]
+
+
+def test_failing_job_releases_its_slot_for_the_next_owner():
+    async def main():
+        scheduler = JudgeScheduler(max_in_flight=2, max_queue_depth=100)
+        log, hold = [], asyncio.Event()
+        failing = asyncio.create_task(job(scheduler, "a", log, hold, weight=2, fail=True))
+        waiting = asyncio.create_task(job(scheduler, "b", log, hold, weight=2))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["in_flight"] == 2 and scheduler.stats()["queue_depth"] == 2
+
+        hold.set()
+        with pytest.raises(RuntimeError):
+            await failing
+        await waiting
+        return scheduler.stats(), log
+
+    stats, log = run(main())
+    assert log == ["a", "b"]
+    assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+
+
+def test_cancelled_jobs_do_not_leak_capacity():
+    async def main():
+        scheduler = JudgeScheduler(max_in_flight=1, max_queue_depth=100)
+        log, hold = [], asyncio.Event()
+        running = asyncio.create_task(job(scheduler, "a", log, hold))
+        queued = asyncio.create_task(job(scheduler, "b", log, hold))
+        await asyncio.sleep(0)
+
+        queued.cancel()   # gave up while waiting
+        running.cancel()  # cancelled while holding the slot
+        await asyncio.gather(running, queued, return_exceptions=True)
+        assert scheduler.stats()["in_flight"] == 0 and scheduler.stats()["queue_depth"] == 0
+
+        hold.set()
+        await job(scheduler, "c", log, hold)
+        return log
+
+    assert run(main()) == ["a", "c"]
+
+
+def test_oversized_job_still_runs_alone():
+    async def main():
+        scheduler = JudgeScheduler(max_in_flight=2, max_queue_depth=100)
+        log, hold = [], asyncio.Event()
+        hold.set()
+        await job(scheduler, "big", log, hold, weight=50)
+        return log
+
+    assert run(main()) == ["big"]
+
+
+def test_full_queue_rejects_with_retry_after():
+    async def main():
+        scheduler = JudgeScheduler(max_in_flight=1, max_queue_depth=3)
+        log, hold = [], asyncio.Event()
+        tasks = [asyncio.create_task(job(scheduler, "a", log, hold)) for _ in range(4)]
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerFull) as excinfo:
+            scheduler.admit(1)
+        hold.set()
+        await asyncio.gather(*tasks)
+        scheduler.admit(1)  # drained queue admits again
+        return excinfo.value.retry_after, scheduler.stats()
+
+    retry_after, stats = run(main())
+    assert retry_after >= 1
+    assert stats["rejected"] == 1
@@ -0,0 +1,59 @@
+import asyncio
+import os
+
+from src.judge.local_engine import LocalEngine
+
+PYTHON = 71
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_evicted_artifact_is_kept_until_its_run_releases_it():
+    async def main():
+        engine = LocalEngine(max_artifacts=1, allow_unsandboxed=True)
+        try:
+            first = await engine.prepare(PYTHON, "print(1)")
+            second = await engine.prepare(PYTHON, "print(2)")
+            kept = first.evicted, os.path.isdir(first.path)
+            engine.release(first)
+            removed = not os.path.isdir(first.path)
+            engine.release(second)
+            return kept, removed, os.path.isdir(second.path)
+        finally:
+            engine.shutdown()
+
+    kept, removed, current = run(main())
+    assert kept == (True, True)
+    assert removed
+    assert current
+
+
+def test_engine_refuses_to_run_without_a_sandbox():
+    async def main():
+        engine = LocalEngine()
+        try:
+            return engine.enabled, await engine.run({"language_id": PYTHON, "source_code": "print(1)"})
+        finally:
+            engine.shutdown()
+
+    enabled, result = run(main())
+    assert not enabled
+    assert result["status"]["id"] == 13
+    assert "stdout" not in result
+
+
+def test_sandbox_prefix_wraps_the_program():
+    async def main():
+        # `env` stands in for a sandbox tool: it sets a variable, then runs the program
+        engine = LocalEngine(sandbox="env SANDBOX_DIR={workdir}")
+        try:
+            source = "import os\nprint(os.environ['SANDBOX_DIR'] == os.getcwd())"
+            return await engine.run({"language_id": PYTHON, "source_code": source})
+        finally:
+            engine.shutdown()
+
+    result = run(main())
+    assert result["status"]["id"] == 3
+    assert result["stdout"].strip() == "True"
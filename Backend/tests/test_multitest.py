@@ -0,0 +1,49 @@
+import asyncio
+import base64
+
+from src.judge import backends, multitest
+from src.judge.backends import multi_test_backend
+
+
+def case(payload):
+    return {"language_id": 54, "source_code": "", "stdin": payload, "expected_output": payload, "cpu_time_limit": 2}
+
+
+def record(index, out):
+    encoded = base64.b64encode(out.encode()).decode()
+    return f"{multitest.CASE_MARKER} {index} 0 1000\n{encoded}\n\n"
+
+
+def submission(stdout, status_id=3):
+    return {"token": "multi", "status": {"id": status_id}, "stdout": stdout}
+
+
+def test_cases_cut_off_from_the_output_are_left_to_rerun():
+    # The second record lost its last lines to Judge0's output limit
+    stdout = record(0, "a") + record(1, "b").split("\n")[0]
+    graded = multitest.grade(submission(stdout), [case("a"), case("b"), case("c")])
+
+    assert graded[0]["status"]["id"] == 3
+    assert graded[0]["stdout"] == "a"
+    assert graded[1:] == [None, None]
+
+
+def test_unreported_cases_rerun_and_a_stuck_case_runs_alone(monkeypatch):
+    payloads = [case("a"), case("b"), case("c")]
+    multi_runs, single_runs = [], []
+
+    async def fake_run_one(payload, client, owner, on_result=None, index=0, weight=1):
+        if payload.get("language_id") != multitest.MULTI_FILE_LANGUAGE_ID:
+            single_runs.append(index)
+            return {"token": "single", "status": {"id": 3}, "stdout": payload["stdin"]}
+        multi_runs.append(weight)
+        # The second run reports nothing at all; the others only their first case
+        return submission("" if len(multi_runs) == 2 else record(0, "x"))
+
+    monkeypatch.setattr(backends, "run_one", fake_run_one)
+    monkeypatch.setattr(multitest, "build_payload", lambda batch: {"language_id": multitest.MULTI_FILE_LANGUAGE_ID})
+    results = asyncio.run(multi_test_backend._run_cases(payloads, None, "user", None, 0))
+
+    assert multi_runs == [3, 2, 1]
+    assert single_runs == [1]
+    assert [result["token"] for result in results] == ["multi", "single", "multi"]
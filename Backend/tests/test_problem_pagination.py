@@ -0,0 +1,61 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.codingPlatform import router
+from src.schemas.problem_loader import problem_db
+from src.schemas.problem_store import CatalogState, ProblemRecord
+
+
+@pytest.fixture
+def client():
+    difficulties = ["Easy", "Medium", "Hard"]
+    records = {i: ProblemRecord(i, f"Problem {i}", difficulties[i % 3], 0, 0) for i in range(1, 8)}
+    previous = problem_db.state
+    problem_db.replace(CatalogState(records))
+    app = FastAPI()
+    app.include_router(router)
+    yield TestClient(app)
+    problem_db.replace(previous)
+
+
+def ids(resp):
+    return [p["id"] for p in resp.json()]
+
+
+def test_full_page_sets_cursor_header(client):
+    resp = client.get("/problems", params={"limit": 3})
+    assert resp.status_code == 200
+    assert ids(resp) == [1, 2, 3]
+    assert resp.headers["X-Next-After-Id"] == "3"
+
+
+def test_cursor_walks_to_last_page(client):
+    resp = client.get("/problems", params={"limit": 3, "after_id": 3})
+    assert ids(resp) == [4, 5, 6]
+    resp = client.get("/problems", params={"limit": 3, "after_id": resp.headers["X-Next-After-Id"]})
+    assert ids(resp) == [7]
+    assert "X-Next-After-Id" not in resp.headers
+
+
+def test_past_the_end_is_empty_without_cursor(client):
+    resp = client.get("/problems", params={"limit": 3, "after_id": 7})
+    assert resp.status_code == 200
+    assert ids(resp) == []
+    assert "X-Next-After-Id" not in resp.headers
+
+
+def test_difficulty_filter_pages_within_difficulty(client):
+    resp = client.get("/problems", params={"limit": 2, "difficulty": "easy"})
+    assert ids(resp) == [3, 6]
+    assert resp.headers["X-Next-After-Id"] == "6"
+
+
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": -1}, {"skip": -1}])
+def test_invalid_paging_is_rejected(client, params):
+    assert client.get("/problems", params=params).status_code == 422
+
+
+def test_limit_zero_on_store_returns_nothing():
+    state = CatalogState({1: ProblemRecord(1, "A", "Easy", 0, 0)})
+    assert state.page(limit=0) == []
@@ -0,0 +1,83 @@
+import pytest
+
+from src.schemas.problem_loader import load_problems, problem_db, reload_problems
+
+
+def search_ids(query):
+    return sorted(record.id for record, _ in problem_db.search(query, prefix=False)[0])
+
+
+@pytest.mark.parametrize("use_snapshot", [False, True])
+def test_reload_applies_adds_changes_and_tombstones(catalog, use_snapshot, write_catalog):
+    load_problems(str(catalog), use_snapshot=use_snapshot)
+    assert problem_db[3]["title"] == "Shortest path"  # now in the LRU
+    assert search_ids("palindrome") == [2]
+
+    write_catalog(catalog, [
+        (4, "Binary search\nHalve it."),
+        (1, "Sum of two numbers\nAdd them."),
+        (3, "Cheapest path\nUse a graph.", "Hard"),
+    ])
+    stats = reload_problems(str(catalog))
+
+    assert (stats["added"], stats["changed"], stats["removed"], stats["total"]) == (1, 1, 1, 3)
+    assert sorted(problem_db.keys()) == [1, 3, 4]
+    assert problem_db.get(2) is None
+    assert problem_db[3]["title"] == "Cheapest path"
+    assert problem_db[1]["title"] == "Sum of two numbers"
+    assert problem_db[4]["difficulty"] == "Easy"
+
+    # Removed and replaced documents are tombstoned in the search index
+    assert search_ids("palindrome") == []
+    assert search_ids("shortest") == []
+    assert search_ids("cheapest") == [3]
+    assert search_ids("path") == [3]
+    assert search_ids("binary") == [4]
+
+
+def test_reload_without_changes_is_a_no_op(catalog):
+    load_problems(str(catalog), use_snapshot=False)
+    state = problem_db.state
+    stats = reload_problems(str(catalog))
+    assert (stats["added"], stats["changed"], stats["removed"]) == (0, 0, 0)
+    assert problem_db.state is state
+
+
+def test_reload_follows_moved_lines(catalog, write_catalog):
+    load_problems(str(catalog), use_snapshot=False)
+    write_catalog(catalog, [
+        (3, "Shortest path\nUse a graph.", "Hard"),
+        (2, "Longest palindrome\nFind it.", "Medium"),
+        (1, "Sum of two numbers\nAdd them."),
+    ])
+    stats = reload_problems(str(catalog))
+    assert (stats["added"], stats["changed"], stats["removed"]) == (0, 0, 0)
+    assert problem_db[1]["title"] == "Sum of two numbers"
+    assert problem_db[3]["title"] == "Shortest path"
+
+
+def test_snapshot_reloads_keep_only_ids_of_changed_problems(catalog, write_catalog):
+    load_problems(str(catalog), use_snapshot=True)
+    for title in ("Cheapest path", "Fastest path"):
+        write_catalog(catalog, [
+            (1, "Sum of two numbers\nAdd them."),
+            (3, f"{title}\nUse a graph.", "Hard"),
+            (4, "Binary search\nHalve it."),
+        ])
+        reload_problems(str(catalog))
+
+    # Changed problems are read back from the file, not held by the reader
+    assert problem_db.state.reader.ids == {3, 4}
+    assert problem_db[3]["title"] == "Fastest path"
+
+    # A later edit moves their lines; they follow them
+    write_catalog(catalog, [
+        (2, "Longest palindrome\nFind it.", "Medium"),
+        (4, "Binary search\nHalve it."),
+        (3, "Fastest path\nUse a graph.", "Hard"),
+    ])
+    stats = reload_problems(str(catalog))
+    assert (stats["added"], stats["removed"]) == (1, 1)
+    assert problem_db.state.reader.ids == {2, 3, 4}
+    assert problem_db[4]["title"] == "Binary search"
+    assert problem_db[3]["title"] == "Fastest path"
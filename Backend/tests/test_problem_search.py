@@ -0,0 +1,68 @@
+import pytest
+
+from src.schemas import problem_search
+from src.schemas.problem_search import SearchIndexBuilder
+from src.schemas.problem_store import CatalogState, ProblemRecord
+
+
+def build_state(problems):
+    builder = SearchIndexBuilder()
+    records = {}
+    for problem_id, (title, text, difficulty) in problems.items():
+        builder.add(problem_id, title, text)
+        records[problem_id] = ProblemRecord(problem_id, title, difficulty, 0, 0)
+    return CatalogState(records, search_index=builder.build())
+
+
+@pytest.fixture
+def state(monkeypatch):
+    # Rank from only the 4 best postings per term so the cap is exercised
+    monkeypatch.setattr(problem_search, "MAX_POSTINGS_SCAN", 4)
+    problems = {}
+    for i in range(1, 11):
+        # Short statements have the highest impact and head the postings
+        problems[i] = (f"Graph {i}", "graph", "Easy")
+    for i in range(11, 14):
+        problems[i] = (f"Paths {i}", "graph " + "filler words here " * 20, "Hard")
+    problems[20] = ("Strings", "palindrome substrings", "Medium")
+    return build_state(problems)
+
+
+def test_totals_and_facets_count_every_posting(state):
+    results, total, facets = state.search("graph", limit=3)
+    assert total == 13
+    assert facets == {"easy": 10, "hard": 3}
+    assert len(results) == 3
+
+
+def test_filter_finds_matches_past_the_ranked_head(state):
+    results, total, facets = state.search("graph", limit=5, difficulty="hard")
+    assert total == 3
+    assert sorted(record.id for record, _ in results) == [11, 12, 13]
+    assert facets["hard"] == 3
+    assert all(score > 0 for _, score in results)
+
+
+def test_head_ranks_best_matches_first(state):
+    results, _, _ = state.search("graph", limit=2)
+    assert all(record.difficulty == "Easy" for record, _ in results)
+
+
+def test_score_returns_full_match_set(state):
+    candidates, matched = state.search_index.score("graph")
+    assert len(candidates) == 4
+    assert matched == set(range(1, 14))
+
+
+def test_removed_documents_do_not_match(state):
+    index = state.search_index.updated([1, 11], [])
+    _, matched = index.score("graph")
+    assert 1 not in matched and 11 not in matched
+    assert len(matched) == 11
+
+
+def test_prefix_and_no_match(state):
+    _, total, _ = state.search("palin", limit=5)
+    assert total == 1
+    assert state.search("palin", limit=5, prefix=False)[1] == 0
+    assert state.search("", limit=5) == ([], 0, {})
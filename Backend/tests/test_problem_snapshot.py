@@ -0,0 +1,40 @@
+import pytest
+
+from src.schemas.problem_loader import build_snapshot, load_problems, load_snapshot_state, problem_db
+from src.schemas.problem_snapshot import SnapshotError, open_snapshot, snapshot_path_for
+
+
+def test_snapshot_round_trip(catalog):
+    build_snapshot(str(catalog))
+    state = load_snapshot_state(str(catalog))
+    assert sorted(state.records) == [1, 2, 3]
+    assert state.reader(state.records[2])["title"] == "Longest palindrome"
+
+
+def test_snapshot_with_corrupt_data_is_rejected(catalog):
+    snapshot_path = build_snapshot(str(catalog))
+    data = bytearray(open(snapshot_path, "rb").read())
+    data[20] ^= 0xFF  # inside the blob region, after the header
+    open(snapshot_path, "wb").write(bytes(data))
+
+    with pytest.raises(SnapshotError, match="checksum"):
+        open_snapshot(snapshot_path, str(catalog))
+
+
+def test_corrupt_snapshot_is_rebuilt_on_load(catalog):
+    snapshot_path = build_snapshot(str(catalog))
+    data = bytearray(open(snapshot_path, "rb").read())
+    data[20] ^= 0xFF
+    open(snapshot_path, "wb").write(bytes(data))
+
+    load_problems(str(catalog), use_snapshot=True)
+    assert len(problem_db) == 3
+    assert problem_db[3]["title"] == "Shortest path"
+    open_snapshot(snapshot_path, str(catalog))  # rewritten and valid again
+
+
+def test_snapshot_is_stale_after_source_edit(catalog, write_catalog):
+    build_snapshot(str(catalog))
+    write_catalog(catalog, [(1, "Something else entirely\nNew.")])
+    with pytest.raises(SnapshotError, match="stale"):
+        open_snapshot(snapshot_path_for(str(catalog)), str(catalog))
@@ -0,0 +1,43 @@
+import asyncio
+
+from src.api.profile import Source, resolve
+from src.platforms.governor import Throttled
+
+
+def source(fetch, sections=None, cached=None):
+    return Source(
+        "example",
+        lambda: 1.0,
+        fetch,
+        lambda handle: cached,
+        sections or {"example.info": lambda handle, raw: {"name": raw["name"]}},
+    )
+
+
+def resolve_all(src):
+    return asyncio.run(resolve(src, "alice", 1.0, set(src.sections)))
+
+
+def test_unexpected_errors_mark_the_source_missing():
+    async def fetch(handle):
+        raise Throttled("example", 3)
+
+    outcome, data = resolve_all(source(fetch))["example.info"]
+
+    assert outcome["status"] == "missing"
+    assert data is None
+
+
+def test_a_broken_section_does_not_fail_its_siblings():
+    async def fetch(handle):
+        return {"name": "Alice"}
+
+    resolved = resolve_all(source(fetch, {
+        "example.info": lambda handle, raw: {"name": raw["name"]},
+        "example.stats": lambda handle, raw: raw["stats"],
+    }))
+
+    assert resolved["example.info"][0]["status"] == "ok"
+    assert resolved["example.info"][1] == {"name": "Alice"}
+    assert resolved["example.stats"][0]["status"] == "missing"
+    assert resolved["example.stats"][1] is None
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from src.platforms.governor import BACKGROUND, INTERACTIVE, RateGovernor, Throttled, background_priority
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class FakeClock:
+    """Stands in for the governor's `time`: tokens only refill when the test advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_interactive_calls_overtake_queued_background_ones(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr("src.platforms.governor.time", clock)
+
+    async def main():
+        governor = RateGovernor("test", rate=100, burst=1, max_wait=5, background_max_wait=5)
+        await governor.acquire(INTERACTIVE)  # empties the bucket
+        order = []
+
+        async def call(name, priority):
+            await governor.acquire(priority)
+            order.append(name)
+
+        tasks = [asyncio.create_task(call("background-1", BACKGROUND))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("background-2", BACKGROUND)))
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("interactive", INTERACTIVE)))
+        await asyncio.sleep(0)
+        assert order == []
+
+        # Each step refills the bucket to its single token; the dispatcher polls the clock
+        for granted in range(1, 4):
+            clock.now += 1
+            while len(order) < granted:
+                await asyncio.sleep(0.01)
+        await asyncio.gather(*tasks)
+        return order, governor.stats()
+
+    order, stats = run(main())
+    assert order == ["interactive", "background-1", "background-2"]
+    assert stats["granted"] == {"interactive": 2, "background": 2}
+
+
+def test_priority_follows_background_context():
+    async def main():
+        governor = RateGovernor("test", rate=50, burst=2, max_wait=5, background_max_wait=5)
+        await governor.acquire()
+        with background_priority():
+            await governor.acquire()
+        return governor.stats()["granted"]
+
+    assert run(main()) == {"interactive": 1, "background": 1}
+
+
+def test_calls_over_their_wait_budget_are_shed():
+    async def main():
+        governor = RateGovernor("test", rate=1, burst=1, max_wait=5, background_max_wait=0.1)
+        await governor.acquire(INTERACTIVE)
+        with pytest.raises(Throttled) as shed:
+            await governor.acquire(BACKGROUND)
+        return shed.value.wait, governor.stats()
+
+    wait, stats = run(main())
+    assert wait > 0.1
+    assert stats["shed"] == {"interactive": 0, "background": 1}
+
+
+def test_penalize_halves_the_rate_and_rewards_restore_it():
+    governor = RateGovernor("test", rate=4, burst=5, max_wait=5, background_max_wait=5)
+    governor.penalize("429 Too Many Requests")
+    assert governor.rate == 2
+    assert governor.tokens <= 0
+    for _ in range(20):
+        governor.reward()
+    assert governor.rate == 4
@@ -0,0 +1,66 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.judge.backends import ExecutionBackend
+from src.judge.submission import judge_cases
+
+ACCEPTED = {"id": 3, "description": "Accepted"}
+
+
+class EchoBackend(ExecutionBackend):
+    """Reports every case as Accepted with its stdin as stdout, keeping each raw result."""
+    name = "echo"
+
+    def __init__(self, wrong=()):
+        self.wrong = set(wrong)
+        self.stored = []
+
+    def plan_jobs(self, payloads, client=None, owner=None, on_result=None, offset=0):
+        async def job(index, payload):
+            out = "wrong" if payload["stdin"] in self.wrong else payload["stdin"]
+            result = {"token": f"t{index}", "status": dict(ACCEPTED), "stdout": out}
+            self.stored.append(result)
+            on_result(index, result)
+            return [result]
+
+        return [(i, lambda i=i, p=p: job(offset + i, p)) for i, p in enumerate(payloads)]
+
+
+def make_request():
+    return SimpleNamespace(source_code="x", language_id=71, cpu_time_limit=1, memory_limit=1000)
+
+
+def cases(*values):
+    return [{"input": value, "output": value} for value in values]
+
+
+def judge(mode, on_result=None):
+    async def main():
+        return await judge_cases(
+            make_request(), cases("1"), cases("2", "3", "4"),
+            mode=mode, on_result=on_result
+        )
+    return asyncio.run(main())
+
+
+def test_graded_results_leave_the_stored_results_untouched(monkeypatch):
+    backend = EchoBackend(wrong={"3"})
+    monkeypatch.setattr("src.judge.submission.backend_for", lambda language_id: backend)
+    seen = {}
+
+    results = judge("full", on_result=lambda index, result: seen.setdefault(index, result))
+
+    assert [r["status"]["id"] for r in results] == [3, 3, 4, 3]
+    assert seen[2]["status"]["id"] == 4
+    assert all(r["status"]["id"] == 3 for r in backend.stored)
+
+
+def test_fail_fast_stops_on_a_graded_wrong_answer(monkeypatch):
+    backend = EchoBackend(wrong={"2"})
+    monkeypatch.setattr("src.judge.submission.backend_for", lambda language_id: backend)
+
+    results = judge("fail_fast")
+
+    # The first hidden case fails, so the judged results end after its wave
+    assert [r["status"]["id"] for r in results][:2] == [3, 4]
+    assert all(r["status"]["id"] == 3 for r in backend.stored)
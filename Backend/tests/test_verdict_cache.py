@@ -0,0 +1,111 @@
+import asyncio
+
+from src.judge.verdict_cache import VerdictCache, cacheable_results, normalize_source
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_identical_concurrent_submissions_share_one_judge_run():
+    async def main():
+        cache = VerdictCache(max_bytes=1 << 20)
+        calls = 0
+        release = asyncio.Event()
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"passed": 3, "total": 3}, True
+
+        tasks = [asyncio.create_task(cache.get_or_compute("key", 1, compute)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+        again = await cache.get_or_compute("key", 1, compute)
+        return calls, results, again, cache.stats()
+
+    calls, results, again, stats = run(main())
+    assert calls == 1
+    assert sorted(source for _, source in results) == ["coalesced"] * 4 + ["judge"]
+    assert all(verdict == {"passed": 3, "total": 3} for verdict, _ in results)
+    assert again == ({"passed": 3, "total": 3}, "memory")
+    assert (stats["misses"], stats["coalesced"], stats["hits"], stats["in_flight"]) == (1, 4, 1, 0)
+
+
+def test_failed_run_reaches_waiters_and_is_not_cached():
+    async def main():
+        cache = VerdictCache(max_bytes=1 << 20)
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise RuntimeError("judge down")
+
+        tasks = [asyncio.create_task(cache.get_or_compute("key", 1, failing)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        async def working():
+            return {"passed": 1, "total": 1}, True
+
+        return outcomes, await cache.get_or_compute("key", 1, working)
+
+    outcomes, retried = run(main())
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert retried == ({"passed": 1, "total": 1}, "judge")
+
+
+def test_uncacheable_verdicts_are_judged_again():
+    async def main():
+        cache = VerdictCache(max_bytes=1 << 20)
+
+        async def internal_error():
+            return {"passed": 0, "total": 1}, False
+
+        first = await cache.get_or_compute("key", 1, internal_error)
+        second = await cache.get_or_compute("key", 1, internal_error)
+        return first[1], second[1]
+
+    assert run(main()) == ("judge", "judge")
+
+
+def test_callers_get_copies_of_the_cached_verdict():
+    async def main():
+        cache = VerdictCache(max_bytes=1 << 20)
+
+        async def compute():
+            return {"passed": 1, "total": 1}, True
+
+        verdict, _ = await cache.get_or_compute("key", 1, compute)
+        verdict["passed"] = 0
+        return await cache.get_or_compute("key", 1, compute)
+
+    assert run(main()) == ({"passed": 1, "total": 1}, "memory")
+
+
+def test_memory_tier_evicts_least_recently_used_by_size():
+    async def main():
+        cache = VerdictCache(max_bytes=120)
+
+        async def compute():
+            return {"message": "x" * 20}, True
+
+        for key in ("a", "b", "c"):
+            await cache.get_or_compute(key, 1, compute)
+        await cache.get_or_compute("a", 1, compute)  # touch a
+        await cache.get_or_compute("d", 1, compute)
+        return [key for key in "abcd" if cache._get_local(key) is not None], cache.stats()["bytes"]
+
+    kept, size = run(main())
+    assert kept == ["a", "c", "d"]
+    assert size <= 120
+
+
+def test_cacheable_results_and_source_normalization():
+    assert cacheable_results([{"status": {"id": 3}}, {"status": {"id": 4}}])
+    assert not cacheable_results([{"status": {"id": 13}}])
+    assert normalize_source("a  \r\nb\t\n\n\n") == normalize_source("a\nb")
+    assert normalize_source("  a") != normalize_source("a")